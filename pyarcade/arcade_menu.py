@@ -2,11 +2,10 @@ import json
 import logging
 import math
 import os
-import random
-import string
 
 import pygame
 
+from .common.rain import MatrixRain
 from .common.theme import (
     ACCENT_COLOR,
     BG_COLOR,
@@ -25,13 +24,10 @@ class MainMenuState(State):
         self.index = 0
         self.font = None
         self.title_font = None
-        self.rain_font = None
         self.normal_color = ACCENT_COLOR
         self.highlight_color = PRIMARY_COLOR
         self.bg_color = BG_COLOR
-        self.rain_glyphs = []
-        self.rain_chars = string.ascii_letters + string.digits
-        self.rain_surfaces = {}
+        self.rain: MatrixRain | None = None
         self.phase = "game"
         self.selected_game = None
         self.option_surfaces = []
@@ -51,7 +47,6 @@ class MainMenuState(State):
         self.game_options = {}
         self.font = get_font(32)
         self.title_font = get_font(48, bold=True)
-        self.rain_font = get_font(20)
         base_dir = os.path.join(os.path.dirname(__file__), "games")
         entries = []
         for name in os.listdir(base_dir):
@@ -79,17 +74,10 @@ class MainMenuState(State):
         self.phase = "game"
         self.selected_game = None
 
-        self._build_surfaces()
-
         width, height = self.screen.get_size()
         max_glyphs = 100 if width >= 800 else 50
-        self.rain_glyphs = []
-        for _ in range(max_glyphs):
-            x = random.randrange(0, width)
-            y = random.randrange(-height, 0)
-            speed = random.uniform(50, 150)
-            char = random.choice(self.rain_chars)
-            self.rain_glyphs.append([x, y, speed, char])
+        self.rain = MatrixRain((width, height), max_glyphs, color=self.normal_color)
+        self._build_surfaces()
 
     def _build_surfaces(self):
         width, height = self.screen.get_size()
@@ -102,10 +90,8 @@ class MainMenuState(State):
         ).convert_alpha()
         for y in range(0, height, 2):
             pygame.draw.line(self.scanlines, (0, 0, 0, 40), (0, y), (width, y))
-        self.rain_surfaces = {
-            ch: self.rain_font.render(ch, True, self.normal_color).convert_alpha()
-            for ch in self.rain_chars
-        }
+        if (self.rain.width, self.rain.height) != (width, height):
+            self.rain.resize((width, height))
         self.option_surfaces = []
         self.option_positions = []
         y_start = height // 3
@@ -244,22 +230,13 @@ class MainMenuState(State):
                     self.phase = "game"
 
     def update(self, dt):
-        width, height = self.screen.get_size()
-        for g in self.rain_glyphs:
-            g[1] += g[2] * dt
-            if g[1] > height:
-                g[0] = random.randrange(0, width)
-                g[1] = random.randrange(-height, 0)
-                g[2] = random.uniform(50, 150)
-                g[3] = random.choice(self.rain_chars)
+        self.rain.update(dt)
 
     def draw(self):
         if self.background.get_size() != self.screen.get_size():
             self._build_surfaces()
         self.background.fill(self.bg_color)
-        for x, y, _, char in self.rain_glyphs:
-            glyph = self.rain_surfaces[char]
-            self.background.blit(glyph, (x, y))
+        self.rain.draw(self.background)
         self.screen.blit(self.background, (0, 0))
 
         self.menu_surface.fill((0, 0, 0, 0))
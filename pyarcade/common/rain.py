@@ -0,0 +1,109 @@
+"""Falling-glyph "Matrix rain" background shared by the menu and games."""
+
+from __future__ import annotations
+
+import random
+import string
+from itertools import repeat
+
+import pygame
+
+from .theme import ACCENT_COLOR, get_font
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is optional
+    np = None
+
+RAIN_CHARS = string.ascii_letters + string.digits
+
+
+class MatrixRain:
+    """A field of glyphs falling down the screen and wrapping to the top.
+
+    Positions, speeds and glyph indices are stored as NumPy arrays and
+    advanced in a single vectorised step; without NumPy the same state is
+    kept in plain lists.  New glyphs are drawn from one ``random.Random`` in
+    index order either way, so a seed gives the same rain with or without
+    NumPy.  Drawing is one ``Surface.blits`` call that copies each glyph out
+    of a pre-rendered atlas.
+    """
+
+    def __init__(
+        self,
+        size: tuple[int, int],
+        count: int,
+        *,
+        font_size: int = 20,
+        color: tuple[int, int, int] = ACCENT_COLOR,
+        chars: str = RAIN_CHARS,
+        speed: tuple[float, float] = (50.0, 150.0),
+        seed: int | None = None,
+    ):
+        self.count = count
+        self.speed_range = speed
+        self.rng = random.Random(seed)
+        self._build_atlas(font_size, color, chars)
+        self.resize(size)
+
+    def _build_atlas(self, font_size: int, color, chars: str) -> None:
+        font = get_font(font_size)
+        glyphs = [font.render(ch, True, color) for ch in chars]
+        width = sum(g.get_width() for g in glyphs)
+        height = max(g.get_height() for g in glyphs)
+        atlas = pygame.Surface((max(width, 1), max(height, 1)), pygame.SRCALPHA)
+        self.areas: list[pygame.Rect] = []
+        x = 0
+        for glyph in glyphs:
+            atlas.blit(glyph, (x, 0))
+            self.areas.append(pygame.Rect(x, 0, glyph.get_width(), height))
+            x += glyph.get_width()
+        if pygame.display.get_surface():
+            atlas = atlas.convert_alpha()
+        self.atlas = atlas
+
+    def resize(self, size: tuple[int, int]) -> None:
+        """Scatter every glyph above a screen of *size*."""
+        self.width, self.height = size
+        n = self.count
+        self.x = [0] * n
+        self.y = [0.0] * n
+        self.speed = [0.0] * n
+        self.glyph = [0] * n
+        for i in range(n):
+            self._respawn(i)
+        if np:
+            self.x = np.array(self.x, dtype=np.int64)
+            self.y = np.array(self.y, dtype=float)
+            self.speed = np.array(self.speed, dtype=float)
+            self.glyph = np.array(self.glyph, dtype=np.int64)
+
+    def _respawn(self, i: int) -> None:
+        rng = self.rng
+        self.x[i] = rng.randrange(0, max(self.width, 1))
+        self.y[i] = float(rng.randrange(-self.height, 0))
+        self.speed[i] = rng.uniform(*self.speed_range)
+        self.glyph[i] = rng.randrange(len(self.areas))
+
+    def update(self, dt: float) -> None:
+        """Advance all glyphs by *dt* seconds."""
+        if np:
+            self.y += self.speed * dt
+            # only a few glyphs land per frame, so respawn them one by one
+            for i in np.flatnonzero(self.y > self.height).tolist():
+                self._respawn(i)
+            return
+        for i in range(self.count):
+            self.y[i] += self.speed[i] * dt
+            if self.y[i] > self.height:
+                self._respawn(i)
+
+    def draw(self, surface: pygame.surface.Surface) -> None:
+        """Blit every glyph onto *surface*."""
+        if np:
+            xs, ys, glyphs = self.x.tolist(), self.y.tolist(), self.glyph.tolist()
+        else:
+            xs, ys, glyphs = self.x, self.y, self.glyph
+        positions = zip(xs, ys, strict=True)
+        areas = map(self.areas.__getitem__, glyphs)
+        surface.blits(zip(repeat(self.atlas), positions, areas), doreturn=False)
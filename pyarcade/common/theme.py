@@ -1,20 +1,90 @@
+from collections import OrderedDict
+
 import pygame
 
-from ..ui.layout import scale
+from ..ui.layout import get_scale, on_scale_change, scale
 
 # Matrix-style color palette
 BG_COLOR = (0, 0, 0)
 PRIMARY_COLOR = (0, 255, 0)
 ACCENT_COLOR = (0, 155, 0)
 
+# Maximum number of rendered text surfaces kept by :func:`render_text`.
+TEXT_CACHE_SIZE = 256
+
+_fonts: dict[tuple[int, bool, float], pygame.font.Font] = {}
+_text_cache: OrderedDict[
+    tuple[str, int, tuple[int, ...], bool], pygame.surface.Surface
+] = OrderedDict()
+_stats = {"font_hits": 0, "font_misses": 0, "text_hits": 0, "text_misses": 0}
+_quit_hook_registered = False
+
+
+def clear_caches(*_) -> None:
+    """Drop all cached fonts and rendered text.
+
+    Called automatically when the layout scale changes and when pygame shuts
+    down, since font objects do not survive ``pygame.quit()``.
+    """
+    global _quit_hook_registered
+    _fonts.clear()
+    _text_cache.clear()
+    _quit_hook_registered = False
+
+
+def cache_info() -> dict[str, int]:
+    """Return hit/miss counters and current sizes of the font and text caches."""
+    return {**_stats, "fonts": len(_fonts), "texts": len(_text_cache)}
+
+
+on_scale_change(clear_caches)
+
 
 def get_font(size: int, bold: bool = False) -> pygame.font.Font:
     """Return a Courier font at the scaled *size*.
 
     All arcade games use the same monospace font to maintain the
-    terminal-style aesthetic.
+    terminal-style aesthetic.  Fonts are looked up once per size, weight and
+    layout scale since ``SysFont`` searches the system fonts on every call.
+    """
+    global _quit_hook_registered
+    key = (size, bold, get_scale())
+    font = _fonts.get(key)
+    if font is not None:
+        _stats["font_hits"] += 1
+        return font
+    _stats["font_misses"] += 1
+    if not _quit_hook_registered:
+        pygame.register_quit(clear_caches)
+        _quit_hook_registered = True
+    font = pygame.font.SysFont("Courier", scale(size), bold=bold)
+    _fonts[key] = font
+    return font
+
+
+def render_text(
+    text: str,
+    size: int,
+    color: tuple[int, int, int] = PRIMARY_COLOR,
+    *,
+    bold: bool = False,
+) -> pygame.surface.Surface:
+    """Return *text* rendered with the shared font, reusing recent results.
+
+    The returned surface is shared between callers and must not be modified.
     """
-    return pygame.font.SysFont("Courier", scale(size), bold=bold)
+    key = (text, size, tuple(color), bold)
+    surf = _text_cache.get(key)
+    if surf is not None:
+        _stats["text_hits"] += 1
+        _text_cache.move_to_end(key)
+        return surf
+    _stats["text_misses"] += 1
+    surf = get_font(size, bold=bold).render(text, True, color)
+    _text_cache[key] = surf
+    if len(_text_cache) > TEXT_CACHE_SIZE:
+        _text_cache.popitem(last=False)
+    return surf
 
 
 def draw_text(
@@ -49,8 +119,7 @@ def draw_text(
 
     Returns the rectangle of the rendered text.
     """
-    font = get_font(size, bold=bold)
-    text_surf = font.render(text, True, color)
+    text_surf = render_text(text, size, color, bold=bold)
     rect = text_surf.get_rect()
     if center:
         rect.center = pos
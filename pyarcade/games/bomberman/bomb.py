@@ -2,73 +2,138 @@
 
 from __future__ import annotations
 
-from typing import List, Optional, Tuple
-
 import pygame
 
-from .level import TILE_SIZE, Level, BRICK
-from .explosion import Explosion
+from .explosion import BLAST_DURATION, Explosion
+from .level import BRICK, TILE_SIZE, Level
+from .occupancy import OccupancyGrid
+
+DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+
+class Blast:
+    """Everything one chain of detonations affected.
+
+    ``tiles`` maps each tile to how long its explosion lasts, with overlaps
+    merged and tiles in the order they were first reached.
+    """
+
+    __slots__ = ("tiles", "destroyed", "triggered")
+
+    def __init__(self) -> None:
+        self.tiles: dict[tuple[int, int], float] = {}
+        self.destroyed: list[tuple[int, int]] = []
+        self.triggered: list[Bomb] = []
 
 
 class Bomb:
+    __slots__ = ("x", "y", "timer", "radius", "owner", "image")
+
     def __init__(self, x: int, y: int, fuse_ms: int, radius: int, *, owner=None):
         self.x = x
         self.y = y
         self.timer = fuse_ms / 1000.0
         self.radius = radius
         self.owner = owner
-        self.image: Optional[pygame.surface.Surface] = None
+        self.image: pygame.surface.Surface | None = None
 
     def update(self, dt: float) -> bool:
         self.timer -= dt
         return self.timer <= 0
 
-    def explode(
+    def retire(self, bombs: list[Bomb], occupancy: OccupancyGrid | None = None) -> None:
+        """Take the bomb out of play and return it to its owner's supply."""
+        if self in bombs:
+            bombs.remove(self)
+        if occupancy is not None:
+            occupancy.bombs.remove(self)
+        if self.owner is not None:
+            self.owner.active_bombs = max(0, self.owner.active_bombs - 1)
+
+    def detonate(
         self,
         level: Level,
-        bombs: Optional[List["Bomb"]] = None,
-    ) -> Tuple[List[Explosion], List[Tuple[int, int]]]:
-        """Create explosion tiles and return destroyed bricks.
+        bombs: list[Bomb] | None = None,
+        occupancy: OccupancyGrid | None = None,
+        duration: float = BLAST_DURATION,
+    ) -> Blast:
+        """Resolve this bomb's blast and every chain reaction it sets off.
 
-        Parameters
-        ----------
-        level:
-            The level on which the bomb resides. Used for collision checks and
-            destroying bricks.
-        bombs:
-            Optional list of active bombs. If provided, any bombs caught in the
-            blast will immediately detonate, enabling chain reactions. Triggered
-            bombs are removed from ``bombs`` and their resulting explosion tiles
-            and destroyed bricks are merged into the return values.
+        Bombs caught in a blast are taken from a work stack rather than by
+        recursion.  Each bomb's catch is set off in its order in ``bombs``,
+        depth first, as the recursive chain did, so bricks cleared by one
+        bomb open the way for the next exactly as before.  Triggered bombs
+        are retired from ``bombs`` (and ``occupancy``); the caller retires
+        this bomb itself.  Bombs are found through ``occupancy.bombs`` when
+        given, otherwise through a position index built once for the whole
+        chain.
         """
 
+        blast = Blast()
+        if not bombs:
+            bomb_at = None
+        elif occupancy is not None:
+            bomb_at = occupancy.bombs.at
+        else:
+            index: dict[tuple[int, int], list[Bomb]] = {}
+            for bomb in bombs:
+                index.setdefault((bomb.x, bomb.y), []).append(bomb)
+
+            def bomb_at(x: int, y: int) -> list[Bomb]:
+                return index.get((x, y), [])
+
+        spent = {self}
+        stack = [self]
+        while stack:
+            bomb = stack.pop()
+            if bomb is not self:
+                if bomb in spent:
+                    continue  # already set off earlier in this chain
+                spent.add(bomb)
+                bomb.retire(bombs, occupancy)
+                blast.triggered.append(bomb)
+            hit = bomb._blast_tiles(level, blast.destroyed)
+            for tile in hit:
+                blast.tiles.setdefault(tile, duration)
+            if bomb_at is not None:
+                caught = [b for x, y in hit for b in bomb_at(x, y) if b not in spent]
+                caught.sort(key=bombs.index, reverse=True)
+                stack.extend(caught)
+        return blast
+
+    def _blast_tiles(
+        self, level: Level, destroyed: list[tuple[int, int]]
+    ) -> list[tuple[int, int]]:
+        """Return the tiles this bomb's blast reaches, clearing bricks it hits."""
+
         tiles = [(self.x, self.y)]
-        destroyed: List[Tuple[int, int]] = []
-        dirs = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-        for dx, dy in dirs:
+        for dx, dy in DIRECTIONS:
             for i in range(1, self.radius + 1):
                 nx, ny = self.x + dx * i, self.y + dy * i
                 if level.is_blocked(nx, ny):
-                    if level.grid[ny][nx] == BRICK:
+                    if level.tile(nx, ny) == BRICK:
                         level.destroy(nx, ny)
                         tiles.append((nx, ny))
                         destroyed.append((nx, ny))
                     break
                 tiles.append((nx, ny))
+        return tiles
 
-        explosions = [Explosion(x, y) for x, y in tiles]
+    def explode(
+        self,
+        level: Level,
+        bombs: list[Bomb] | None = None,
+        occupancy: OccupancyGrid | None = None,
+    ) -> tuple[list[Explosion], list[tuple[int, int]]]:
+        """Create explosion tiles and return destroyed bricks.
 
-        if bombs:
-            triggered = [
-                b for b in list(bombs) if (b.x, b.y) in tiles and b is not self
-            ]
-            for other in triggered:
-                bombs.remove(other)
-                exps, dest = other.explode(level, bombs)
-                explosions.extend(exps)
-                destroyed.extend(dest)
+        Thin wrapper over :meth:`detonate` that builds one :class:`Explosion`
+        per affected tile.
+        """
 
-        return explosions, destroyed
+        blast = self.detonate(level, bombs, occupancy)
+        explosions = [Explosion(x, y, life) for (x, y), life in blast.tiles.items()]
+        return explosions, blast.destroyed
 
     def draw(
         self, surface: pygame.surface.Surface, image: pygame.surface.Surface
@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+import logging
 import random
+from collections.abc import Iterator
 from pathlib import Path
 
 import pygame
@@ -13,11 +15,17 @@ from ...state import State
 from ...utils.persistence import load_json
 from ...utils.resources import save_path
 from .bomb import Bomb
+from .bot import BotController
+from .camera import Camera
+from .danger import DangerMap
 from .enemy import Enemy
-from .explosion import Explosion
-from .level import TILE_SIZE, Level
-from .player import Controls, Player
+from .explosion import ExplosionPool
+from .flowfield import FlowField
+from .level import MAX_SPAWNS, TILE_SIZE, Level
+from .occupancy import OccupancyGrid
+from .player import BOMB, INPUT_BITS, Controls, Player
 from .powerups import PowerUp
+from .replay import Replay, ReplayWriter, new_replay_path
 
 BASE_PATH = Path(__file__).resolve().parent
 CONFIG_PATH = BASE_PATH / "config.json"
@@ -29,17 +37,57 @@ DEFAULT_CONFIG = {
     "base_blast_radius": 2,
     "max_bombs_per_player": 1,
     "max_blast_radius": 5,
-    "max_enemy_count": 9,
+    "max_enemy_count": 120,
     "min_fuse_ms": 500,
     "max_fuse_ms": 5000,
     "max_bomb_limit": 9,
     "powerup_chance": 0.2,
     "time_limit": 0,
+    "bot_slots": [],
+    "party_players": 0,
+    "seed": None,
+    "record_replays": False,
 }
+# Keys of the local players, by slot; party players past these are bots.
+CONTROL_SETS = (
+    Controls(
+        up=pygame.K_UP,
+        down=pygame.K_DOWN,
+        left=pygame.K_LEFT,
+        right=pygame.K_RIGHT,
+        bomb=pygame.K_SPACE,
+    ),
+    Controls(
+        up=pygame.K_w,
+        down=pygame.K_s,
+        left=pygame.K_a,
+        right=pygame.K_d,
+        bomb=pygame.K_LSHIFT,
+    ),
+)
+# Fallback colour of each player slot when its sprite is missing.
+PLAYER_COLORS = (
+    (0, 200, 0),
+    (0, 200, 80),
+    (120, 255, 120),
+    (0, 140, 60),
+    (80, 200, 160),
+    (160, 220, 0),
+    (0, 255, 180),
+    (40, 120, 0),
+)
+# Party sizes offered on the settings screen; 0 turns party mode off.
+PARTY_SIZES = (0, 3, 4, 5, 6, 7, 8)
 
 
 class BombermanGame(State):
     fps_cap = 60
+    # The match is simulated in fixed steps so a seed plus the recorded
+    # per-tick input reproduces it exactly.
+    sim_hz = 60
+    # write a replay of every match to ``REPLAY_DIR``; set from the
+    # ``record_replays`` config option, so headless runs record nothing
+    record_replays = False
 
     def __init__(self, *, players: int = 1, **kwargs):
         super().__init__(**kwargs)
@@ -49,7 +97,7 @@ class BombermanGame(State):
     def startup(self, screen, num_players: int = 1, **opts):
         super().startup(screen, num_players, **opts)
         cfg = load_json(CONFIG_PATH, DEFAULT_CONFIG)
-        max_enemy = cfg.get("max_enemy_count", 9)
+        max_enemy = cfg.get("max_enemy_count", 120)
         cfg["enemy_count"] = max(0, min(cfg.get("enemy_count", 3), max_enemy))
         cfg["max_enemy_count"] = max_enemy
         min_fuse = cfg.get("min_fuse_ms", 500)
@@ -68,6 +116,7 @@ class BombermanGame(State):
         )
         cfg["max_blast_radius"] = max_radius
         self.config = cfg
+        self.record_replays = bool(cfg.get("record_replays", False))
         self.settings = load_json(
             SETTINGS_PATH,
             {
@@ -85,6 +134,7 @@ class BombermanGame(State):
         # settings screen options
         self.settings_options = [
             "Mode",
+            "Party",
             "Map Size",
             "Enemy Count",
             "Bomb Fuse",
@@ -98,11 +148,14 @@ class BombermanGame(State):
             ("Small", (13, 11)),
             ("Medium", (15, 13)),
             ("Large", (17, 15)),
+            ("Huge", (45, 35)),
+            ("Arena", (101, 101)),
         ]
         self.map_size_index = 1
-        self.enemy_count = (
-            0 if self.players == 2 else self.config.get("enemy_count", 3)
-        )
+        self.party_players = self.config.get("party_players", 0)
+        if self.party_players not in PARTY_SIZES:
+            self.party_players = 0
+        self.enemy_count = 0 if self.players == 2 else self.config.get("enemy_count", 3)
         self.fuse_ms = self.config.get("fuse_ms", 2000)
         self.max_bombs = self.config.get("max_bombs_per_player", 1)
         self.audio_on = True
@@ -110,17 +163,31 @@ class BombermanGame(State):
         self.state = "settings"
         self.winner = 0
         self.level: Level | None = None
+        self.occupancy: OccupancyGrid | None = None
+        self.danger: DangerMap | None = None
+        self.flow: FlowField | None = None
+        # players driven by code, picked by index (0 = P1) from "bot_slots"
+        self.bots: dict[Player, BotController] = {}
         self.active_players: list[Player] = []
         self.p1: Player | None = None
         self.p2: Player | None = None
+        # players in the match: the local players, or the party size
+        self.match_size = self.players
+        self.camera: Camera | None = None
         self.enemies: list[Enemy] = []
         self.bombs: list[Bomb] = []
-        self.explosions: list[Explosion] = []
+        # the occupancy grid's explosion pool while a match is running
+        self.explosions: ExplosionPool | None = None
         self.powerups: list[PowerUp] = []
         self.game_timer = 0.0
         self.time_limit = self.config.get("time_limit", 0)
         self.time_left = float(self.time_limit)
         self.end_timer = 0.0
+        self.seed = 0
+        self.rng = random.Random()
+        self.recorder: ReplayWriter | None = None
+        # bomb keys pressed since the last tick, as an input mask
+        self._bomb_presses = 0
 
     # ------------------------------------------------------------------ utils
     def _load_assets(self) -> dict[str, pygame.surface.Surface]:
@@ -146,8 +213,10 @@ class BombermanGame(State):
         assets = {
             "wall": load_image("wall", (0, 40, 0)),
             "brick": load_image("brick", (0, 80, 0)),
-            "player1": load_image("player1", (0, 200, 0)),
-            "player2": load_image("player2", (0, 200, 80)),
+            **{
+                f"player{slot + 1}": load_image(f"player{slot + 1}", color)
+                for slot, color in enumerate(PLAYER_COLORS)
+            },
             "enemy": load_image("enemy", (200, 0, 0)),
             "bomb": load_image("bomb", (0, 0, 0)),
             "blast": load_image("blast", (200, 200, 0)),
@@ -162,82 +231,151 @@ class BombermanGame(State):
                 (TILE_SIZE // 2, TILE_SIZE // 2),
                 TILE_SIZE // 2,
             )
-        if placeholders.get("player1"):
-            pygame.draw.rect(
-                assets["player1"], (0, 0, 0), assets["player1"].get_rect(), 2
-            )
-        if placeholders.get("player2"):
-            pygame.draw.rect(
-                assets["player2"], (0, 0, 0), assets["player2"].get_rect(), 2
-            )
+        for slot in range(len(PLAYER_COLORS)):
+            name = f"player{slot + 1}"
+            if placeholders.get(name):
+                pygame.draw.rect(assets[name], (0, 0, 0), assets[name].get_rect(), 2)
         if placeholders.get("enemy"):
             pygame.draw.rect(assets["enemy"], (0, 0, 0), assets["enemy"].get_rect(), 2)
 
         return assets
 
-    def _start_game(self, players: int | None = None) -> None:
-        """Initialise a new round."""
+    def _start_game(self, players: int | None = None, seed: int | None = None) -> None:
+        """Initialise a new round.
+
+        Every random choice in the match comes from ``self.rng``, seeded with
+        *seed*, the ``seed`` setting or a fresh random value.  With the
+        ``party_players`` setting the match is a free-for-all of that many
+        players, the local ones first and bots in the remaining slots.
+        """
 
         if players in (1, 2):
             self.players = players
         players = self.players
         self.num_players = self.players
-        width, height = self.config.get("map_size", [15, 13])
-        self.level = Level.generate_random(width, height)
+        if seed is None:
+            seed = self.config.get("seed")
+        if seed is None:
+            seed = random.getrandbits(63)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self._bomb_presses = 0
+        self._start_recording()
+        party = self.config.get("party_players", 0)
+        self.match_size = max(players, min(party, MAX_SPAWNS))
+        self._new_level()
         self.active_players = []
         self.bombs = []
-        self.explosions = []
         self.powerups = []
-        p1_controls = Controls(
-            up=pygame.K_UP,
-            down=pygame.K_DOWN,
-            left=pygame.K_LEFT,
-            right=pygame.K_RIGHT,
-            bomb=pygame.K_SPACE,
-        )
-        self.p1 = Player(1, 1, p1_controls, self.assets["player1"])
-        self.p1.radius = self.config.get("base_blast_radius", 2)
-        self.p1.max_bombs = self.config.get("max_bombs_per_player", 1)
-        self.active_players.append(self.p1)
-        if players == 2:
-            p2_controls = Controls(
-                up=pygame.K_w,
-                down=pygame.K_s,
-                left=pygame.K_a,
-                right=pygame.K_d,
-                bomb=pygame.K_LSHIFT,
-            )
-            self.p2 = Player(
-                self.level.width - 2,
-                self.level.height - 2,
-                p2_controls,
-                self.assets["player2"],
-            )
-            self.p2.radius = self.config.get("base_blast_radius", 2)
-            self.p2.max_bombs = self.config.get("max_bombs_per_player", 1)
-            self.active_players.append(self.p2)
-            self.enemies = []
-        else:
-            self.p2 = None
-            self.enemies = self._spawn_enemies()
+        spawns = self.level.spawn_points()
+        for slot in range(self.match_size):
+            x, y = spawns[slot]
+            controls = CONTROL_SETS[slot] if slot < players else None
+            player = Player(x, y, controls, self.assets[f"player{slot + 1}"], slot=slot)
+            player.radius = self.config.get("base_blast_radius", 2)
+            player.max_bombs = self.config.get("max_bombs_per_player", 1)
+            self.active_players.append(player)
+            self.occupancy.players.add(player)
+        self.p1 = self.active_players[0]
+        self.p2 = self.active_players[1] if self.match_size > 1 else None
+        self.enemies = self._spawn_enemies() if self.match_size == 1 else []
+        slots = self.config.get("bot_slots", [])
+        self.bots = {
+            player: BotController(player, self.rng)
+            for player in self.active_players
+            if player.slot in slots or player.controls is None
+        }
+        self.camera.center_on(self._camera_targets())
         self.game_timer = 0.0
-        self.time_limit = 0 if players == 2 else self.config.get("time_limit", 0)
+        self.time_limit = 0 if self.match_size > 1 else self.config.get("time_limit", 0)
         if self.time_limit > 0:
             self.time_left = float(self.time_limit)
         self.state = "play"
 
+    def _start_recording(self) -> None:
+        """Start a replay of the new match, ending the previous one."""
+
+        self._stop_recording()
+        if not self.record_replays:
+            return
+        path = None
+        try:
+            path = new_replay_path(self.seed)
+            self.recorder = ReplayWriter(
+                path, self.seed, self.players, self.sim_hz, self.config
+            )
+        except (OSError, TypeError, ValueError):
+            logging.exception("Could not start Bomberman replay %s", path)
+            return
+        logging.info("Bomberman match seed %d, replay %s", self.seed, path)
+
+    def _new_level(self) -> None:
+        """Generate the next map and the state and view that go with it."""
+
+        width, height = self.config.get("map_size", [15, 13])
+        self.level = Level.generate_random(
+            width, height, self.rng.getrandbits(63), spawns=max(2, self.match_size)
+        )
+        self.occupancy = OccupancyGrid(self.level.width, self.level.height)
+        self.danger = DangerMap(self.level)
+        self.flow = FlowField(self.level, danger=self.danger)
+        self.explosions = self.occupancy.explosions
+        self.camera = Camera(
+            self.screen.get_size(), (self.level.width, self.level.height)
+        )
+
+    def _camera_targets(self) -> Iterator[tuple[int, int]]:
+        """Tiles the camera keeps in view: local players, else everyone left."""
+
+        humans = [p for p in self.active_players if p not in self.bots]
+        for player in humans or self.active_players:
+            yield player.x, player.y
+
+    def _stop_recording(self) -> None:
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
+
+    def run_replay(self, replay: Replay) -> int:
+        """Re-simulate a recorded match without drawing it.
+
+        Runs until the recorded input ends or the match does and returns the
+        number of play ticks simulated.  Errors are not caught, so a crash
+        recorded in the replay happens again here.
+        """
+
+        self.record_replays = False
+        self.config = dict(replay.config)
+        self.enemy_speed = self.config.get("enemy_speed", 0.5)
+        self._start_game(replay.players, seed=replay.seed)
+        dt = 1.0 / replay.sim_hz
+        ticks = 0
+        for mask in replay.inputs():
+            while self.state in ("cleared", "defeat") and not self.done:
+                self._count_down(dt)
+            if self.state != "play":
+                break
+            self._step(mask, dt)
+            ticks += 1
+        return ticks
+
     def _spawn_enemies(self) -> list[Enemy]:
+        """Place enemies on distinct open tiles, as many as there is room for."""
+
+        level = self.level
+        taken = {(p.x, p.y) for p in self.active_players}
+        free = [
+            (x, y)
+            for y in range(1, level.height - 1)
+            for x in range(1, level.width - 1)
+            if not level.is_blocked(x, y) and (x, y) not in taken
+        ]
+        count = min(self.config.get("enemy_count", 0), len(free))
         enemies: list[Enemy] = []
-        for _ in range(self.config.get("enemy_count", 0)):
-            while True:
-                x = random.randint(1, self.level.width - 2)
-                y = random.randint(1, self.level.height - 2)
-                if self.level.is_blocked(x, y):
-                    continue
-                if (x, y) in [(p.x, p.y) for p in self.active_players]:
-                    continue
-                enemies.append(Enemy(x, y, self.assets["enemy"], self.enemy_speed))
-                break
+        for x, y in self.rng.sample(free, count):
+            enemy = Enemy(x, y, self.assets["enemy"], self.enemy_speed, self.rng)
+            enemies.append(enemy)
+            self.occupancy.enemies.add(enemy)
         return enemies
 
     def _spawn_powerups(self, tiles: list[tuple[int, int]]) -> None:
@@ -245,43 +383,61 @@ class BombermanGame(State):
 
         chance = self.config.get("powerup_chance", 0.0)
         for x, y in tiles:
-            if random.random() < chance:
-                self.powerups.append(PowerUp(x, y, "radius", self.assets["powerup"]))
+            if self.rng.random() < chance:
+                powerup = PowerUp(x, y, "radius", self.assets["powerup"])
+                self.powerups.append(powerup)
+                self.occupancy.powerups.add(powerup)
+
+    def _detonate(self, bomb: Bomb) -> None:
+        """Explode *bomb* and whatever chain it sets off."""
+
+        occupancy = self.occupancy
+        bomb.retire(self.bombs, occupancy)
+        blast = bomb.detonate(self.level, self.bombs, occupancy)
+        for (x, y), lifetime in blast.tiles.items():
+            self.explosions.add(x, y, lifetime)
+        self._spawn_powerups(blast.destroyed)
 
     def _check_deaths(self) -> None:
         """Remove players caught in explosions."""
 
-        tiles = {(e.x, e.y) for e in self.explosions}
-        for player in list(self.active_players):
-            if (player.x, player.y) in tiles:
-                self.active_players.remove(player)
+        players = self.active_players
+        kept = 0
+        for player in players:
+            if self.explosions.occupied(player.x, player.y):
+                self.occupancy.players.remove(player)
+            else:
+                players[kept] = player
+                kept += 1
+        del players[kept:]
 
     def _collect_powerups(self) -> None:
         """Check for player collisions with power-ups."""
 
         max_radius = self.config.get("max_blast_radius", 5)
-        for powerup in list(self.powerups):
-            for player in self.active_players:
-                if player.x == powerup.x and player.y == powerup.y:
-                    if powerup.kind == "radius":
-                        player.radius = min(player.radius + 1, max_radius)
-                    self.powerups.remove(powerup)
-                    break
+        for player in self.active_players:
+            found = self.occupancy.powerups.at(player.x, player.y)
+            if not found:
+                continue
+            for powerup in list(found):
+                if powerup.kind == "radius":
+                    player.radius = min(player.radius + 1, max_radius)
+                self.powerups.remove(powerup)
+                self.occupancy.powerups.remove(powerup)
 
     def _next_level(self) -> None:
         """Regenerate level and respawn enemies for single-player progression."""
 
-        width, height = self.config.get("map_size", [15, 13])
-        self.level = Level.generate_random(width, height)
+        self._new_level()
         self.bombs.clear()
-        self.explosions.clear()
         self.powerups.clear()
-        for i, player in enumerate(self.active_players):
-            if i == 0:
-                player.x, player.y = 1, 1
-            else:
-                player.x, player.y = self.level.width - 2, self.level.height - 2
+        spawns = self.level.spawn_points()
+        for player in self.active_players:
+            player.x, player.y = spawns[player.slot]
+            player.active_bombs = 0
+            self.occupancy.players.add(player)
         self.enemies = self._spawn_enemies()
+        self.camera.center_on(self._camera_targets())
         self.state = "play"
         self.game_timer = 0.0
         if self.time_limit > 0:
@@ -291,10 +447,12 @@ class BombermanGame(State):
         if option == "Mode":
             label = "1P" if self.players == 1 else "2P"
             return f"{label} (launcher)"
+        if option == "Party":
+            return f"{self.party_players} players" if self.party_players else "Off"
         if option == "Map Size":
             return self.map_sizes[self.map_size_index][0]
         if option == "Enemy Count":
-            return str(self.enemy_count) if self.players == 1 else "N/A"
+            return str(self.enemy_count) if self._solo() else "N/A"
         if option == "Bomb Fuse":
             return f"{self.fuse_ms} ms"
         if option == "Max Bombs":
@@ -307,10 +465,13 @@ class BombermanGame(State):
         option = self.settings_options[self.settings_index]
         if option == "Mode":
             return
+        elif option == "Party":
+            index = PARTY_SIZES.index(self.party_players) + delta
+            self.party_players = PARTY_SIZES[index % len(PARTY_SIZES)]
         elif option == "Map Size":
             self.map_size_index = (self.map_size_index + delta) % len(self.map_sizes)
-        elif option == "Enemy Count" and self.players == 1:
-            limit = self.config.get("max_enemy_count", 9)
+        elif option == "Enemy Count" and self._solo():
+            limit = self.config.get("max_enemy_count", 120)
             self.enemy_count = max(0, min(limit, self.enemy_count + delta))
         elif option == "Bomb Fuse":
             min_fuse = self.config.get("min_fuse_ms", 500)
@@ -322,9 +483,14 @@ class BombermanGame(State):
         elif option == "Audio" and delta != 0:
             self.audio_on = not self.audio_on
 
+    def _solo(self) -> bool:
+        """Whether the chosen settings make a one-player match with enemies."""
+        return self.players == 1 and not self.party_players
+
     def _apply_settings(self) -> None:
         self.config["map_size"] = list(self.map_sizes[self.map_size_index][1])
-        self.config["enemy_count"] = self.enemy_count if self.players == 1 else 0
+        self.config["party_players"] = self.party_players
+        self.config["enemy_count"] = self.enemy_count if self._solo() else 0
         self.config["fuse_ms"] = self.fuse_ms
         self.config["max_bombs_per_player"] = self.max_bombs
         pygame.mixer.music.set_volume(self.prev_volume if self.audio_on else 0)
@@ -362,8 +528,8 @@ class BombermanGame(State):
                     self.state = "pause"
                     self.pause_menu.index = 0
                 for player in self.active_players:
-                    if event.key == player.controls.bomb:
-                        player.drop_bomb(self.bombs, self.config.get("fuse_ms", 2000))
+                    if player not in self.bots and event.key == player.controls.bomb:
+                        self._bomb_presses |= BOMB << (INPUT_BITS * player.slot)
         elif self.state == "pause":
             choice = self.pause_menu.handle_keyboard(event)
             if choice == "Resume":
@@ -394,15 +560,36 @@ class BombermanGame(State):
         if self.state in ("pause", "settings", "victory"):
             return
         if self.state in ("cleared", "defeat"):
-            self.end_timer -= dt
-            if self.end_timer <= 0:
-                if self.state == "cleared":
-                    self._next_level()
-                else:
-                    self.done = True
-                    self.next = "menu"
+            self._count_down(dt)
             return
-        # play state
+        # play state: everything the tick depends on besides the match RNG
+        # is in its input mask, which is recorded before it is simulated
+        keys = pygame.key.get_pressed()
+        mask = self._bomb_presses
+        self._bomb_presses = 0
+        for player in self.active_players:
+            if player not in self.bots:
+                mask |= player.read_input(keys) << (INPUT_BITS * player.slot)
+        if self.recorder is not None:
+            self.recorder.add(mask)
+            if self.recorder.ticks % self.sim_hz == 0:
+                self.recorder.flush()
+        self._step(mask, dt)
+        if self.state == "play":
+            self.camera.follow(self._camera_targets(), dt)
+
+    def _count_down(self, dt: float) -> None:
+        """Advance the pause after a level is cleared or lost."""
+        self.end_timer -= dt
+        if self.end_timer <= 0:
+            if self.state == "cleared":
+                self._next_level()
+            else:
+                self.done = True
+                self.next = "menu"
+
+    def _step(self, mask: int, dt: float) -> None:
+        """Simulate one tick of play with the players' input *mask*."""
         if self.time_limit > 0:
             self.time_left -= dt
             if self.time_left <= 0:
@@ -411,28 +598,52 @@ class BombermanGame(State):
                 return
         else:
             self.game_timer += dt
-        keys = pygame.key.get_pressed()
+        occupancy = self.occupancy
+        self.danger.update(self.bombs)
+        fuse_ms = self.config.get("fuse_ms", 2000)
         for player in self.active_players:
-            player.handle_input(keys, self.level, self.bombs)
-        for enemy in list(self.enemies):
-            if not enemy.update(dt, self.level, self.bombs, self.explosions):
-                self.enemies.remove(enemy)
-        for bomb in list(self.bombs):
-            if bomb not in self.bombs:
-                # bomb may have been removed via chain reaction
+            bot = self.bots.get(player)
+            if bot is None:
+                bits = mask >> (INPUT_BITS * player.slot)
+                if bits & BOMB:
+                    player.drop_bomb(self.bombs, fuse_ms, occupancy)
+                player.handle_input(bits, self.level, occupancy)
                 continue
+            dx, dy, drop = bot.update(
+                dt, self.level, occupancy, self.danger, fuse_ms / 1000
+            )
+            if drop:
+                player.drop_bomb(self.bombs, fuse_ms, occupancy)
+            player.move(dx, dy, self.level, occupancy)
+        if self.enemies:
+            self.flow.update(occupancy, self.active_players, self.bombs)
+        # lists are compacted in place rather than copied for iteration
+        enemies = self.enemies
+        kept = 0
+        for enemy in enemies:
+            if enemy.update(dt, self.level, occupancy, self.flow):
+                enemies[kept] = enemy
+                kept += 1
+            else:
+                occupancy.enemies.remove(enemy)
+        del enemies[kept:]
+        bombs = self.bombs
+        due = False
+        for bomb in bombs:
             if bomb.update(dt):
-                explosions, destroyed = bomb.explode(self.level, self.bombs)
-                self.explosions.extend(explosions)
-                self._spawn_powerups(destroyed)
-                if bomb in self.bombs:
-                    self.bombs.remove(bomb)
-        for expl in list(self.explosions):
-            if expl.update(dt):
-                self.explosions.remove(expl)
+                due = True
+        while due:
+            due = False
+            for bomb in bombs:
+                if bomb.timer <= 0:
+                    # the chain may retire other bombs, so rescan afterwards
+                    self._detonate(bomb)
+                    due = True
+                    break
+        self.explosions.update(dt)
         self._check_deaths()
         self._collect_powerups()
-        if self.players == 1:
+        if self.match_size == 1:
             if not self.active_players:
                 self.state = "defeat"
                 self.end_timer = 2.0
@@ -441,7 +652,7 @@ class BombermanGame(State):
                 self.end_timer = 2.0
         else:
             if len(self.active_players) == 1:
-                self.winner = 1 if self.active_players[0] is self.p1 else 2
+                self.winner = self.active_players[0].slot + 1
                 self.state = "victory"
                 self.victory_menu.index = 0
             elif len(self.active_players) == 0:
@@ -450,7 +661,7 @@ class BombermanGame(State):
                 self.victory_menu.index = 0
 
     # ------------------------------------------------------------------ draw
-    def draw(self) -> None:
+    def draw(self, alpha: float = 1.0) -> None:
         if self.state == "settings":
             self.screen.fill((0, 0, 0))
             rect = self.screen.get_rect().inflate(-200, -200)
@@ -480,21 +691,15 @@ class BombermanGame(State):
                 )
             return
 
-        self.level.draw(self.screen, self.assets)
-        for powerup in self.powerups:
-            powerup.draw(self.screen)
-        for bomb in self.bombs:
-            bomb.draw(self.screen, self.assets["bomb"])
-        for expl in self.explosions:
-            expl.draw(self.screen, self.assets["blast"])
-        for enemy in self.enemies:
-            enemy.draw(self.screen)
-        for player in self.active_players:
-            player.draw(self.screen)
+        self._draw_world()
         # HUD
-        mode_text = f"{'1P' if self.players == 1 else '2P'} Mode"
+        if self.match_size > 2:
+            left = len(self.active_players)
+            mode_text = f"Party: {left}/{self.match_size} left"
+        else:
+            mode_text = f"{'1P' if self.players == 1 else '2P'} Mode"
         draw_text(self.screen, mode_text, (10, 10), 24, PRIMARY_COLOR)
-        if self.players == 1:
+        if self.match_size == 1:
             draw_text(
                 self.screen,
                 f"Enemies: {len(self.enemies)}",
@@ -551,13 +756,58 @@ class BombermanGame(State):
             self.victory_menu.draw(self.overlay)
             self.screen.blit(self.overlay, (0, 0))
 
+    def _draw_world(self) -> None:
+        """Draw the tiles in the camera's window and everything on them.
+
+        Entities are looked up in the occupancy layers by tile index, so the
+        cost follows the size of the window, not of the map or the number of
+        entities on it.  Entities fill their tile, so drawing tile by tile in
+        layer order looks the same as drawing each layer in turn.
+        """
+
+        screen, level, occupancy = self.screen, self.level, self.occupancy
+        left, top = self.camera.offset
+        level.draw(screen, self.assets, (left, top))
+        x0, y0, x1, y1 = self.camera.tile_window()
+        stride = level.stride
+        powerups = occupancy.powerups.tiles
+        bombs = occupancy.bombs.tiles
+        blasts = occupancy.explosions.counts
+        enemies = occupancy.enemies.tiles
+        players = occupancy.players.tiles
+        bomb_image, blast_image = self.assets["bomb"], self.assets["blast"]
+        sprites = []
+        for ty in range(y0, y1):
+            row = ty * stride
+            sy = ty * TILE_SIZE - top
+            for tx in range(x0, x1):
+                index = row + tx
+                pos = (tx * TILE_SIZE - left, sy)
+                for powerup in powerups.get(index, ()):
+                    sprites.append((powerup.image, pos))
+                if index in bombs:
+                    sprites.append((bomb_image, pos))
+                if blasts[index]:
+                    sprites.append((blast_image, pos))
+                for enemy in enemies.get(index, ()):
+                    sprites.append((enemy.image, pos))
+                for player in players.get(index, ()):
+                    sprites.append((player.image, pos))
+        screen.blits(sprites, False)
+
     def cleanup(self) -> None:
+        self._stop_recording()
         pygame.mixer.music.set_volume(self.prev_volume)
         self.level = None
+        self.occupancy = None
+        self.danger = None
+        self.flow = None
+        self.bots.clear()
         self.active_players.clear()
         self.enemies.clear()
         self.bombs.clear()
-        self.explosions.clear()
+        self.explosions = None
+        self.camera = None
         self.powerups.clear()
         self.state = "settings"
 
@@ -567,10 +817,16 @@ def run() -> None:
     pygame.init()
     config = load_json(CONFIG_PATH, DEFAULT_CONFIG)
     width, height = config.get("map_size", [15, 13])
-    screen = pygame.display.set_mode((width * TILE_SIZE, height * TILE_SIZE))
+    # large maps scroll inside a window no bigger than the default one
+    screen = pygame.display.set_mode(
+        (min(width * TILE_SIZE, 800), min(height * TILE_SIZE, 600))
+    )
     game = BombermanGame()
     game.startup(screen)
+    from ...main import draw_state, step_state
+
     clock = pygame.time.Clock()
+    accumulator = 0.0
     running = True
     while running and not game.done and not game.quit:
         dt = clock.tick(game.fps_cap) / 1000.0
@@ -579,9 +835,10 @@ def run() -> None:
                 running = False
             else:
                 game.get_event(event)
-        game.update(dt)
-        game.draw()
+        accumulator, alpha = step_state(game, dt, accumulator)
+        draw_state(game, alpha)
         pygame.display.flip()
+    game._stop_recording()
     pygame.quit()
 
 
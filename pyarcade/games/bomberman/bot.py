@@ -0,0 +1,157 @@
+"""Scripted players for Bomberman."""
+
+from __future__ import annotations
+
+import math
+import random
+from collections import deque
+from collections.abc import Collection
+
+from .danger import DangerMap
+from .level import BRICK, EMPTY, Level
+from .occupancy import OccupancyGrid
+from .player import Player
+
+DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+
+class BotController:
+    """Drives a :class:`~.player.Player` from code instead of the keyboard.
+
+    The game calls :meth:`update` every tick; once every ``step_time``
+    seconds it asks :meth:`think` for a move ``(dx, dy)`` and whether to
+    drop a bomb.  Subclasses override :meth:`think`.  The default keeps out
+    of predicted blasts using the :class:`~.danger.DangerMap`, bombs enemies,
+    opponents and bricks it can reach with a way out, and otherwise wanders.
+    """
+
+    step_time = 0.15
+    # how far the bot looks for cover, in steps
+    search_depth = 8
+
+    def __init__(self, player: Player, rng: random.Random | None = None):
+        self.player = player
+        self.rng = rng or random.Random()
+        self.timer = 0.0
+        self.heading = (0, 0)
+
+    def update(
+        self,
+        dt: float,
+        level: Level,
+        occupancy: OccupancyGrid,
+        danger: DangerMap,
+        fuse: float,
+    ) -> tuple[int, int, bool]:
+        """Return this tick's ``(dx, dy, drop_bomb)``."""
+        self.timer -= dt
+        if self.timer > 0:
+            return 0, 0, False
+        self.timer = self.step_time
+        return self.think(level, occupancy, danger, fuse)
+
+    # ------------------------------------------------------------- helpers
+    def _open(self, x: int, y: int, level: Level, occupancy: OccupancyGrid) -> bool:
+        return not (
+            level.is_blocked(x, y)
+            or occupancy.bombs.occupied(x, y)
+            or occupancy.explosions.occupied(x, y)
+        )
+
+    def blast_tiles(self, level: Level) -> set[tuple[int, int]]:
+        """Tiles a bomb dropped where the player stands would cover."""
+        x, y = self.player.x, self.player.y
+        tiles = {(x, y)}
+        for dx, dy in DIRECTIONS:
+            for i in range(1, self.player.radius + 1):
+                nx, ny = x + dx * i, y + dy * i
+                if level.is_blocked(nx, ny):
+                    break
+                tiles.add((nx, ny))
+        return tiles
+
+    def escape(
+        self,
+        level: Level,
+        occupancy: OccupancyGrid,
+        danger: DangerMap,
+        fuse: float = math.inf,
+        extra: Collection[tuple[int, int]] = (),
+    ) -> tuple[int, int] | None:
+        """Return the first step toward the nearest safe tile.
+
+        Tiles in *extra* count as exploding after *fuse* seconds.  A route
+        only passes tiles the bot reaches before they blow up.  Returns
+        ``(0, 0)`` when already safe and ``None`` when there is no way out.
+        """
+        start = (self.player.x, self.player.y)
+        seen = {start: (0, 0)}
+        queue = deque([(start, 0)])
+        while queue:
+            (x, y), steps = queue.popleft()
+            blast = danger.time_until(x, y)
+            if (x, y) in extra:
+                blast = min(blast, fuse)
+            if blast == math.inf:
+                return seen[(x, y)]
+            if steps >= self.search_depth:
+                continue
+            for dx, dy in DIRECTIONS:
+                nxt = (x + dx, y + dy)
+                if nxt in seen or not self._open(*nxt, level, occupancy):
+                    continue
+                arrive = (steps + 1) * self.step_time
+                blast = danger.time_until(*nxt)
+                if nxt in extra:
+                    blast = min(blast, fuse)
+                if arrive >= blast:
+                    continue
+                seen[nxt] = seen[(x, y)] if steps else (dx, dy)
+                queue.append((nxt, steps + 1))
+        return None
+
+    def _worth_bombing(self, level: Level, occupancy: OccupancyGrid) -> bool:
+        player = self.player
+        for dx, dy in DIRECTIONS:
+            for i in range(1, player.radius + 1):
+                nx, ny = player.x + dx * i, player.y + dy * i
+                tile = level.tile(nx, ny)
+                if tile != EMPTY:
+                    if tile == BRICK and i == 1 and self.rng.random() < 0.3:
+                        return True
+                    break
+                if occupancy.enemies.occupied(nx, ny):
+                    return True
+                if any(p is not player for p in occupancy.players.at(nx, ny)):
+                    return True
+        return False
+
+    # ------------------------------------------------------------- policy
+    def think(
+        self,
+        level: Level,
+        occupancy: OccupancyGrid,
+        danger: DangerMap,
+        fuse: float,
+    ) -> tuple[int, int, bool]:
+        player = self.player
+        if danger.is_threatened(player.x, player.y):
+            dx, dy = self.escape(level, occupancy, danger) or (0, 0)
+            return dx, dy, False
+        if player.active_bombs < player.max_bombs and self._worth_bombing(
+            level, occupancy
+        ):
+            step = self.escape(level, occupancy, danger, fuse, self.blast_tiles(level))
+            if step is not None and step != (0, 0):
+                return 0, 0, True
+        options = [
+            (dx, dy)
+            for dx, dy in DIRECTIONS
+            if self._open(player.x + dx, player.y + dy, level, occupancy)
+            and not danger.is_threatened(player.x + dx, player.y + dy)
+        ]
+        if not options:
+            return 0, 0, False
+        if self.heading not in options or self.rng.random() < 0.2:
+            self.heading = self.rng.choice(options)
+        return self.heading[0], self.heading[1], False
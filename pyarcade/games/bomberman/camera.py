@@ -0,0 +1,79 @@
+"""Scrolling view over a Bomberman level."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+from .level import TILE_SIZE
+
+# How quickly the camera catches up with its target, per second.
+FOLLOW_RATE = 8.0
+
+
+class Camera:
+    """The screen-sized window of the level that is drawn.
+
+    ``x`` and ``y`` are the pixel coordinates of the level shown at the
+    top-left corner of the screen.  The camera never scrolls past the edges
+    of the level, and a level smaller than the screen stays at the origin,
+    so small maps look exactly as they did without one.
+
+    :meth:`tile_window` turns the position into a range of tile columns and
+    rows with integer arithmetic; drawing visits only those tiles, whatever
+    the size of the level.
+    """
+
+    __slots__ = ("width", "height", "columns", "rows", "x", "y")
+
+    def __init__(self, view: tuple[int, int], tiles: tuple[int, int]):
+        self.width, self.height = view
+        self.columns, self.rows = tiles
+        self.x = 0.0
+        self.y = 0.0
+
+    def _clamp(self, x: float, y: float) -> tuple[float, float]:
+        right = self.columns * TILE_SIZE - self.width
+        bottom = self.rows * TILE_SIZE - self.height
+        return max(0.0, min(x, right)), max(0.0, min(y, bottom))
+
+    def _target(self, tiles: Iterable[tuple[int, int]]) -> tuple[float, float] | None:
+        """Top-left corner that centres the middle of *tiles* on screen."""
+        count = sx = sy = 0
+        for tx, ty in tiles:
+            sx += tx
+            sy += ty
+            count += 1
+        if not count:
+            return None
+        x = (sx / count + 0.5) * TILE_SIZE - self.width / 2
+        y = (sy / count + 0.5) * TILE_SIZE - self.height / 2
+        return self._clamp(x, y)
+
+    def center_on(self, tiles: Iterable[tuple[int, int]]) -> None:
+        """Jump straight to the middle of *tiles*."""
+        target = self._target(tiles)
+        if target is not None:
+            self.x, self.y = target
+
+    def follow(self, tiles: Iterable[tuple[int, int]], dt: float) -> None:
+        """Ease toward the middle of *tiles* over *dt* seconds."""
+        target = self._target(tiles)
+        if target is None:
+            return
+        step = min(1.0, dt * FOLLOW_RATE)
+        self.x += (target[0] - self.x) * step
+        self.y += (target[1] - self.y) * step
+
+    @property
+    def offset(self) -> tuple[int, int]:
+        """Whole-pixel position of the view, as used for drawing."""
+        return int(self.x), int(self.y)
+
+    def tile_window(self) -> tuple[int, int, int, int]:
+        """Return ``(x0, y0, x1, y1)``, the half-open range of visible tiles."""
+        left, top = self.offset
+        x0 = left // TILE_SIZE
+        y0 = top // TILE_SIZE
+        x1 = min(self.columns, -(-(left + self.width) // TILE_SIZE))
+        y1 = min(self.rows, -(-(top + self.height) // TILE_SIZE))
+        return x0, y0, x1, y1
@@ -0,0 +1,123 @@
+"""Predicted blast timing for every Bomberman tile."""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Sequence
+
+from .bomb import Bomb
+from .level import BRICK, EMPTY, Level
+
+
+class DangerMap:
+    """When each tile will next be caught in an explosion.
+
+    Every tile a pending blast will cover points at the bomb whose fuse sets
+    that blast off: the bomb itself or, through chain reactions, whichever
+    bomb reaching it burns down first.  All fuses run at the same rate, so
+    the pointer stays right as bombs tick and the time left is read straight
+    from that bomb's timer; nothing needs updating between placements.
+
+    :meth:`update` propagates only the blasts of newly placed bombs.  When a
+    bomb detonates or a brick is destroyed the map is rebuilt from the
+    remaining bombs, which only touches tiles in their reach.
+    """
+
+    def __init__(self, level: Level):
+        self.level = level
+        size = level.width * level.height
+        self.offsets = (-1, 1, -level.stride, level.stride)
+        self.trigger: list[Bomb | None] = [None] * size
+        self.threatened = bytearray(size)
+        # indices of threatened tiles, in the order they were first reached
+        self.threat: list[int] = []
+        self.revision = 0
+        self._reach: dict[Bomb, list[int]] = {}
+        self._fuse: dict[Bomb, Bomb] = {}
+        self._bombs_at: dict[int, list[Bomb]] = {}
+        self._level_revision = level.revision
+
+    # ------------------------------------------------------------ building
+    def update(self, bombs: Sequence[Bomb]) -> None:
+        """Bring the map in line with *bombs*."""
+
+        reach = self._reach
+        if self.level.revision != self._level_revision:
+            self.rebuild(bombs)
+            return
+        known = 0
+        for bomb in bombs:
+            if bomb in reach:
+                known += 1
+        if known != len(reach):
+            self.rebuild(bombs)
+        elif known != len(bombs):
+            for bomb in bombs:
+                if bomb not in reach:
+                    self._add(bomb)
+            self.revision += 1
+
+    def rebuild(self, bombs: Sequence[Bomb]) -> None:
+        for index in self.threat:
+            self.trigger[index] = None
+            self.threatened[index] = 0
+        self.threat = []
+        self._reach.clear()
+        self._fuse.clear()
+        self._bombs_at.clear()
+        self._level_revision = self.level.revision
+        for bomb in bombs:
+            self._add(bomb)
+        self.revision += 1
+
+    def _add(self, bomb: Bomb) -> None:
+        cells, stride = self.level.cells, self.level.stride
+        origin = bomb.y * stride + bomb.x
+        tiles = [origin]
+        for offset in self.offsets:
+            index = origin
+            for _ in range(bomb.radius):
+                index += offset
+                if cells[index] != EMPTY:
+                    if cells[index] == BRICK:
+                        tiles.append(index)
+                    break
+                tiles.append(index)
+        self._reach[bomb] = tiles
+        self._bombs_at.setdefault(origin, []).append(bomb)
+        lit = self.trigger[origin]
+        self._spread(bomb, bomb if lit is None or bomb.timer < lit.timer else lit)
+
+    def _spread(self, bomb: Bomb, fuse: Bomb) -> None:
+        """Set off *bomb* by *fuse* and pass the earlier time down the chain."""
+
+        trigger, threatened, fuses = self.trigger, self.threatened, self._fuse
+        stack = [bomb]
+        while stack:
+            current = stack.pop()
+            known = fuses.get(current)
+            if known is not None and known.timer <= fuse.timer:
+                continue
+            fuses[current] = fuse
+            for index in self._reach[current]:
+                lit = trigger[index]
+                if lit is None:
+                    threatened[index] = 1
+                    self.threat.append(index)
+                elif lit.timer <= fuse.timer:
+                    continue
+                trigger[index] = fuse
+                stack.extend(self._bombs_at.get(index, ()))
+
+    # ------------------------------------------------------------- queries
+    def time_until(self, x: int, y: int) -> float:
+        """Seconds until ``(x, y)`` explodes, or ``math.inf`` if it is safe."""
+        lit = self.trigger[y * self.level.stride + x]
+        return math.inf if lit is None else max(lit.timer, 0.0)
+
+    def is_threatened(self, x: int, y: int) -> bool:
+        return bool(self.threatened[y * self.level.stride + x])
+
+    def detonation_time(self, bomb: Bomb) -> float:
+        """Seconds until *bomb* goes off, counting chain reactions."""
+        return max(self._fuse[bomb].timer, 0.0)
@@ -5,15 +5,33 @@ from __future__ import annotations
 import random
 import pygame
 
+from .flowfield import FlowField
 from .level import TILE_SIZE, Level
-from .bomb import Bomb
-from .explosion import Explosion
+from .occupancy import OccupancyGrid
 
 
 class Enemy:
+    __slots__ = (
+        "rng",
+        "x",
+        "y",
+        "image",
+        "speed",
+        "move_timer",
+        "change_timer",
+        "dir",
+        "headings",
+    )
+
     def __init__(
-        self, x: int, y: int, image: pygame.surface.Surface, speed: float = 0.5
+        self,
+        x: int,
+        y: int,
+        image: pygame.surface.Surface,
+        speed: float = 0.5,
+        rng: random.Random | None = None,
     ):
+        self.rng = rng or random.Random()
         self.x = x
         self.y = y
         self.image = image
@@ -21,16 +39,43 @@ class Enemy:
         self.move_timer = 0.0
         self.change_timer = 0.0
         self.dir = (0, 0)
+        # shuffled in place whenever the enemy picks a new heading
+        self.headings = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+
+    def _steer(self, flow: FlowField) -> tuple[int, int] | None:
+        """Return a step out of a blast or toward a player in reach, if any."""
+        step = flow.flee(self.x, self.y)
+        if step is None:
+            step = flow.toward(self.x, self.y)
+        return step
 
-    def _choose_direction(self, level: Level, bombs: list[Bomb]) -> None:
-        dirs = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-        random.shuffle(dirs)
-        for dx, dy in dirs:
-            nx, ny = self.x + dx, self.y + dy
-            blocked = level.is_blocked(nx, ny) or any(
-                b.x == nx and b.y == ny for b in bombs
-            )
-            if not blocked:
+    def _blocked(
+        self,
+        x: int,
+        y: int,
+        level: Level,
+        occupancy: OccupancyGrid,
+        flow: FlowField | None,
+    ) -> bool:
+        if level.is_blocked(x, y) or occupancy.bombs.occupied(x, y):
+            return True
+        if flow is None:
+            return False
+        # never step onto a tile that blows up sooner than this one, or
+        # before the enemy would have time to move on again
+        danger = flow.danger
+        ahead = danger.time_until(x, y)
+        return ahead < danger.time_until(self.x, self.y) and ahead < self.speed * 2
+
+    def _choose_direction(
+        self,
+        level: Level,
+        occupancy: OccupancyGrid,
+        flow: FlowField | None = None,
+    ) -> None:
+        self.rng.shuffle(self.headings)
+        for dx, dy in self.headings:
+            if not self._blocked(self.x + dx, self.y + dy, level, occupancy, flow):
                 self.dir = (dx, dy)
                 return
         self.dir = (0, 0)
@@ -39,28 +84,34 @@ class Enemy:
         self,
         dt: float,
         level: Level,
-        bombs: list[Bomb],
-        explosions: list[Explosion],
+        occupancy: OccupancyGrid,
+        flow: FlowField | None = None,
     ) -> bool:
-        if any(e.x == self.x and e.y == self.y for e in explosions):
+        """Move one step when due; return False once caught in an explosion.
+
+        With a *flow* field the enemy flees predicted blasts and hunts nearby
+        players, falling back to random wandering.
+        """
+        if occupancy.explosions.occupied(self.x, self.y):
             return False
         self.move_timer -= dt
         self.change_timer -= dt
         if self.move_timer <= 0:
+            step = self._steer(flow) if flow is not None else None
+            if step is not None:
+                self.dir = step
             nx, ny = self.x + self.dir[0], self.y + self.dir[1]
-            if (
-                self.dir == (0, 0)
-                or level.is_blocked(nx, ny)
-                or any(b.x == nx and b.y == ny for b in bombs)
-            ):
+            if self.dir == (0, 0) or self._blocked(nx, ny, level, occupancy, flow):
                 self.dir = (0, 0)
             else:
+                old_x, old_y = self.x, self.y
                 self.x, self.y = nx, ny
+                occupancy.enemies.move(self, old_x, old_y)
             self.move_timer = self.speed
         if self.dir == (0, 0) or self.change_timer <= 0:
-            self._choose_direction(level, bombs)
+            self._choose_direction(level, occupancy, flow)
             self.change_timer = self.speed * 4
-        if any(e.x == self.x and e.y == self.y for e in explosions):
+        if occupancy.explosions.occupied(self.x, self.y):
             return False
         return True
 
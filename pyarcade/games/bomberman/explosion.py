@@ -2,13 +2,20 @@
 
 from __future__ import annotations
 
+from array import array
+
 import pygame
 
 from .level import TILE_SIZE
 
+# Seconds an explosion tile stays lethal.
+BLAST_DURATION = 0.3
+
 
 class Explosion:
-    def __init__(self, x: int, y: int, duration: float = 0.3):
+    __slots__ = ("x", "y", "timer")
+
+    def __init__(self, x: int, y: int, duration: float = BLAST_DURATION):
         self.x = x
         self.y = y
         self.timer = duration
@@ -21,3 +28,75 @@ class Explosion:
         self, surface: pygame.surface.Surface, image: pygame.surface.Surface
     ) -> None:
         surface.blit(image, (self.x * TILE_SIZE, self.y * TILE_SIZE))
+
+
+class ExplosionPool:
+    """Live explosion tiles kept in parallel arrays.
+
+    Tiles are appended at the end and removed by moving the last one into
+    the freed slot, so once the arrays have grown to the busiest moment of a
+    match, adding, ageing and removing explosions allocates nothing.
+    ``counts`` holds how many explosions cover each tile, which makes
+    :meth:`occupied` a single index; the pool stands in for an occupancy
+    layer.
+    """
+
+    __slots__ = ("width", "xs", "ys", "timers", "size", "counts")
+
+    def __init__(self, width: int, height: int, capacity: int = 64):
+        self.width = width
+        self.xs = array("i", bytes(4 * capacity))
+        self.ys = array("i", bytes(4 * capacity))
+        self.timers = array("d", bytes(8 * capacity))
+        self.size = 0
+        self.counts = array("H", bytes(2 * width * height))
+
+    def __len__(self) -> int:
+        return self.size
+
+    def add(self, x: int, y: int, duration: float = BLAST_DURATION) -> None:
+        i = self.size
+        if i == len(self.xs):
+            self.xs.extend(self.xs)
+            self.ys.extend(self.ys)
+            self.timers.extend(self.timers)
+        self.xs[i] = x
+        self.ys[i] = y
+        self.timers[i] = duration
+        self.size = i + 1
+        self.counts[y * self.width + x] += 1
+
+    def update(self, dt: float) -> None:
+        """Age every explosion by *dt* and drop those that burned out."""
+        timers = self.timers
+        for i in range(self.size - 1, -1, -1):
+            timers[i] -= dt
+            if timers[i] <= 0:
+                self._remove(i)
+
+    def _remove(self, i: int) -> None:
+        xs, ys = self.xs, self.ys
+        self.counts[ys[i] * self.width + xs[i]] -= 1
+        last = self.size - 1
+        xs[i] = xs[last]
+        ys[i] = ys[last]
+        self.timers[i] = self.timers[last]
+        self.size = last
+
+    def occupied(self, x: int, y: int) -> bool:
+        return self.counts[y * self.width + x] > 0
+
+    def clear(self) -> None:
+        xs, ys, counts, width = self.xs, self.ys, self.counts, self.width
+        for i in range(self.size):
+            counts[ys[i] * width + xs[i]] = 0
+        self.size = 0
+
+    def draw(
+        self, surface: pygame.surface.Surface, image: pygame.surface.Surface
+    ) -> None:
+        xs, ys = self.xs, self.ys
+        surface.blits(
+            [(image, (xs[i] * TILE_SIZE, ys[i] * TILE_SIZE)) for i in range(self.size)],
+            False,
+        )
@@ -0,0 +1,212 @@
+"""Shared distance maps that steer every Bomberman enemy."""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable, Sequence
+
+from .danger import DangerMap
+from .level import EMPTY, Level
+from .occupancy import OccupancyGrid
+
+UNREACHABLE = 0xFFFF
+# How many steps out from each player ``to_players`` is searched.
+CHASE_REACH = 8
+DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+
+class FlowField:
+    """Breadth-first distance maps over a level, shared by all enemies.
+
+    ``to_players`` holds the number of steps from each tile within *reach*
+    of a player to the nearest one, and ``to_safety`` the steps from each
+    tile the :class:`~.danger.DangerMap` marks as threatened to the nearest
+    tile that is not.  :meth:`update` rebuilds a map only when its inputs
+    changed (bricks, bombs or player positions), so the cost of a search is
+    shared by every enemy and most ticks do no searching at all;
+    :meth:`toward` and :meth:`flee` then read four neighbours.
+
+    Maps are flat arrays indexed like ``Level.cells``.  The level border is
+    always wall, so neighbours of any reachable tile are in range.
+    """
+
+    def __init__(
+        self,
+        level: Level,
+        reach: int = CHASE_REACH,
+        danger: DangerMap | None = None,
+    ):
+        self.level = level
+        self.reach = reach
+        self.danger = danger if danger is not None else DangerMap(level)
+        size = level.width * level.height
+        self.offsets = (-1, 1, -level.stride, level.stride)
+        self._far = array("H", [UNREACHABLE]) * size
+        self.to_players = array("H", self._far)
+        self.to_safety = array("H", bytes(2 * size))
+        self.threatened = self.danger.threatened
+        self.blocked = bytearray(level.cells)
+        self._threat_list: list[int] = []
+        self._level_key: int | None = None
+        self._bombs_key: int | None = None
+        self._danger_key: int | None = None
+        # tile index of every player the last search started from
+        self._sources: list[int] = []
+
+    # ------------------------------------------------------------ building
+    def update(
+        self,
+        occupancy: OccupancyGrid,
+        players: Iterable,
+        bombs: Sequence,
+    ) -> None:
+        """Bring the maps up to date with the level, *bombs* and *players*."""
+
+        level = self.level
+        self.danger.update(bombs)
+        changed = (
+            level.revision != self._level_key
+            or occupancy.bombs.revision != self._bombs_key
+        )
+        if changed:
+            self._level_key = level.revision
+            self._bombs_key = occupancy.bombs.revision
+            self._build_blocked(bombs)
+        if changed or self.danger.revision != self._danger_key:
+            self._danger_key = self.danger.revision
+            self._build_safety()
+            changed = True
+        # compare player tiles in place so a quiet tick allocates nothing
+        sources, stride = self._sources, level.stride
+        count = 0
+        for player in players:
+            index = player.y * stride + player.x
+            if count == len(sources):
+                sources.append(index)
+                changed = True
+            elif sources[count] != index:
+                sources[count] = index
+                changed = True
+            count += 1
+        if count != len(sources):
+            del sources[count:]
+            changed = True
+        if changed:
+            self._search(self.to_players, sources, self.threatened, self.reach)
+
+    def _build_blocked(self, bombs: Sequence) -> None:
+        blocked = self.blocked
+        blocked[:] = self.level.cells
+        stride = self.level.stride
+        for bomb in bombs:
+            blocked[bomb.y * stride + bomb.x] = 1
+
+    def _build_safety(self) -> None:
+        """Work out how far each threatened tile is from cover.
+
+        Only threatened tiles are searched: every other tile is already safe,
+        so the search starts from the open tiles bordering the threat.  Bricks
+        in a blast are threatened too but never entered, so beyond resetting
+        them they cost nothing.
+        """
+
+        threatened, safety = self.threatened, self.to_safety
+        for index in self._threat_list:
+            safety[index] = 0
+        threat = self._threat_list = list(self.danger.threat)
+        for index in threat:
+            safety[index] = UNREACHABLE
+
+        blocked = self.blocked
+        frontier = []
+        for index in threat:
+            if blocked[index]:
+                continue
+            for offset in self.offsets:
+                j = index + offset
+                if not blocked[j] and not threatened[j]:
+                    frontier.append(j)
+        step = 0
+        while frontier:
+            step += 1
+            following = []
+            for index in frontier:
+                for offset in self.offsets:
+                    j = index + offset
+                    if safety[j] == UNREACHABLE and threatened[j] and not blocked[j]:
+                        safety[j] = step
+                        following.append(j)
+            frontier = following
+        # a bomb's own tile is blocked for the search but must lead out too;
+        # threatened bricks are skipped, nothing stands on them
+        cells = self.level.cells
+        for index in threat:
+            if (
+                safety[index] == UNREACHABLE
+                and blocked[index]
+                and cells[index] == EMPTY
+            ):
+                best = UNREACHABLE
+                for offset in self.offsets:
+                    j = index + offset
+                    if safety[j] < best and not blocked[j]:
+                        best = safety[j]
+                if best < UNREACHABLE:
+                    safety[index] = best + 1
+
+    def _search(
+        self, dist: array, sources: list[int], avoid: bytearray, limit: int
+    ) -> None:
+        """Fill *dist* with steps from the nearest of *sources*, up to *limit*.
+
+        The search does not expand into tiles set in *avoid*, so routes lead
+        around bomb blasts rather than through them.  Bounding it keeps the
+        cost independent of the map size.
+        """
+
+        dist[:] = self._far
+        blocked = self.blocked
+        frontier = []
+        for index in sources:
+            if dist[index]:
+                dist[index] = 0
+                frontier.append(index)
+        step = 0
+        while frontier and step < limit:
+            step += 1
+            following = []
+            for index in frontier:
+                for offset in self.offsets:
+                    j = index + offset
+                    if dist[j] == UNREACHABLE and not blocked[j] and not avoid[j]:
+                        dist[j] = step
+                        following.append(j)
+            frontier = following
+
+    # ------------------------------------------------------------- queries
+    def _downhill(self, dist: array, x: int, y: int) -> tuple[int, int] | None:
+        index = y * self.level.stride + x
+        best, step = dist[index], None
+        blocked = self.blocked
+        for (dx, dy), offset in zip(DIRECTIONS, self.offsets, strict=True):
+            j = index + offset
+            if dist[j] < best and not blocked[j]:
+                best, step = dist[j], (dx, dy)
+        return step
+
+    def distance_to_player(self, x: int, y: int) -> int:
+        """Steps from ``(x, y)`` to a player within reach, or ``UNREACHABLE``."""
+        return self.to_players[y * self.level.stride + x]
+
+    def is_threatened(self, x: int, y: int) -> bool:
+        return self.danger.is_threatened(x, y)
+
+    def toward(self, x: int, y: int) -> tuple[int, int] | None:
+        """Return the step from ``(x, y)`` toward the nearest player."""
+        return self._downhill(self.to_players, x, y)
+
+    def flee(self, x: int, y: int) -> tuple[int, int] | None:
+        """Return the step from ``(x, y)`` out of a blast, if it is in one."""
+        if not self.threatened[y * self.level.stride + x]:
+            return None
+        return self._downhill(self.to_safety, x, y)
@@ -10,48 +10,108 @@ TILE_SIZE = 32
 # Tile constants
 EMPTY, WALL, BRICK = 0, 1, 2
 
+# Chance that an open tile starts as a brick.
+BRICK_DENSITY = 0.7
+# Most players a level has start tiles for.
+MAX_SPAWNS = 8
 
-class Level:
-    """Represents a grid of walls and bricks."""
 
-    def __init__(self, size: tuple[int, int]):
+class Level:
+    """Represents a grid of walls and bricks.
+
+    Tiles are stored row-major in a single ``bytearray``; tile ``(x, y)``
+    lives at ``cells[y * stride + x]``.
+    """
+
+    def __init__(
+        self,
+        size: tuple[int, int],
+        rng: random.Random | None = None,
+        *,
+        corridor: bool = False,
+        spawns: int = 2,
+    ):
         self.width, self.height = size
-        self.grid: list[list[int]] = [
-            [EMPTY for _ in range(self.width)] for _ in range(self.height)
-        ]
-        self.rects = [
-            [
-                (x * TILE_SIZE, y * TILE_SIZE, TILE_SIZE, TILE_SIZE)
-                for x in range(self.width)
-            ]
-            for y in range(self.height)
+        self.stride = self.width
+        self.spawns = max(1, min(spawns, MAX_SPAWNS))
+        self.cells = bytearray(self.width * self.height)
+        # pre-rendered map, kept current by redrawing tiles in ``dirty``
+        self.background: pygame.surface.Surface | None = None
+        self._background_assets: dict[str, pygame.surface.Surface] | None = None
+        self.dirty: set[int] = set()
+        # bumped whenever a tile changes, so caches can tell they are stale
+        self.revision = 0
+        self.generate(rng, corridor=corridor)
+
+    def spawn_points(self) -> list[tuple[int, int]]:
+        """Return the start tile of each player, top-left first.
+
+        The first two are opposite corners; further players get the other
+        corners and then the middle of each edge.  Middle coordinates are
+        rounded to odd numbers so they never land on a pillar.
+        """
+        right, bottom = self.width - 2, self.height - 2
+        mid_x, mid_y = self.width // 2 | 1, self.height // 2 | 1
+        points = [
+            (1, 1),
+            (right, bottom),
+            (right, 1),
+            (1, bottom),
+            (mid_x, 1),
+            (mid_x, bottom),
+            (1, mid_y),
+            (right, mid_y),
         ]
-        self.generate()
-
-    def generate(self) -> None:
-        """Generate random walls and bricks."""
-        for y in range(self.height):
-            for x in range(self.width):
-                if x == 0 or y == 0 or x == self.width - 1 or y == self.height - 1:
-                    self.grid[y][x] = WALL
-                elif x % 2 == 0 and y % 2 == 0:
-                    self.grid[y][x] = WALL
-                else:
-                    # leave spawn areas empty
-                    if (x, y) in {
-                        (1, 1),
-                        (1, 2),
-                        (2, 1),
-                        (self.width - 2, self.height - 2),
-                        (self.width - 3, self.height - 2),
-                        (self.width - 2, self.height - 3),
-                    }:
-                        continue
-                    if random.random() < 0.7:
-                        self.grid[y][x] = BRICK
+        return points[: self.spawns]
+
+    def generate(
+        self,
+        rng: random.Random | None = None,
+        *,
+        density: float = BRICK_DENSITY,
+        corridor: bool = False,
+    ) -> None:
+        """Generate walls, pillars and randomly placed bricks.
+
+        Whole rows and columns are written with slice assignment, and bricks
+        come from one ``randbytes`` call mapped through a threshold table, so
+        even very large arenas generate in a few milliseconds.  With
+        *corridor* a path is carved along the top row and down the right-hand
+        side so enemies can roam without destroying bricks.
+        """
+        rng = rng or random.Random()
+        self.background = None
+        self.revision += 1
+        w, h, cells = self.width, self.height, self.cells
+        threshold = int(density * 256)
+        table = bytes(BRICK if i < threshold else EMPTY for i in range(256))
+        cells[:] = rng.randbytes(w * h).translate(table)
+
+        wall_row = bytes([WALL]) * w
+        cells[:w] = wall_row
+        cells[(h - 1) * w :] = wall_row
+        cells[::w] = bytes([WALL]) * h
+        cells[w - 1 :: w] = bytes([WALL]) * h
+        # pillars on every even interior column of every even interior row
+        pillars = bytes([WALL]) * len(range(2, w - 1, 2))
+        for y in range(2, h - 1, 2):
+            cells[y * w + 2 : y * w + w - 1 : 2] = pillars
+
+        # leave spawn areas empty
+        for sx, sy in self.spawn_points():
+            for dx, dy in ((0, 0), (1, 0), (-1, 0), (0, 1), (0, -1)):
+                x, y = sx + dx, sy + dy
+                if 0 < x < w - 1 and 0 < y < h - 1 and cells[y * w + x] == BRICK:
+                    cells[y * w + x] = EMPTY
+
+        if corridor and w > 2 and h > 2:
+            cells[w + 1 : 2 * w - 1] = bytes(w - 2)
+            cells[w + w - 2 : (h - 1) * w : w] = bytes(h - 2)
 
     @classmethod
-    def generate_random(cls, width: int, height: int, seed: int | None = None) -> Level:
+    def generate_random(
+        cls, width: int, height: int, seed: int | None = None, *, spawns: int = 2
+    ) -> Level:
         """Create a new level with deterministic randomness.
 
         Parameters
@@ -61,73 +121,98 @@ class Level:
         seed:
             Optional seed to make generation deterministic. If ``None`` a
             random seed is used.
+        spawns:
+            Number of players to clear start tiles for.
 
         The resulting map always leaves player spawn tiles empty and carves a
         simple corridor ensuring there is at least one valid path for enemies
         to roam without needing to destroy bricks.
         """
 
-        rng = random.Random(seed)
-        level = cls((width, height))
-        grid: list[list[int]] = [[EMPTY for _ in range(width)] for _ in range(height)]
-        for y in range(height):
-            for x in range(width):
-                if x == 0 or y == 0 or x == width - 1 or y == height - 1:
-                    grid[y][x] = WALL
-                elif x % 2 == 0 and y % 2 == 0:
-                    grid[y][x] = WALL
-                else:
-                    if (x, y) in {
-                        (1, 1),
-                        (1, 2),
-                        (2, 1),
-                        (width - 2, height - 2),
-                        (width - 3, height - 2),
-                        (width - 2, height - 3),
-                    }:
-                        continue
-                    if rng.random() < 0.7:
-                        grid[y][x] = BRICK
-        # carve a guaranteed path from top-left to bottom-right
-        for x in range(1, width - 1):
-            grid[1][x] = EMPTY
-        for y in range(1, height - 1):
-            grid[y][width - 2] = EMPTY
-        level.grid = grid
-        return level
+        return cls((width, height), random.Random(seed), corridor=True, spawns=spawns)
+
+    def tile(self, x: int, y: int) -> int:
+        """Return the tile at ``(x, y)``; coordinates must be in range."""
+        return self.cells[y * self.stride + x]
+
+    def in_bounds(self, x: int, y: int) -> bool:
+        return 0 <= x < self.width and 0 <= y < self.height
 
     def is_blocked(self, x: int, y: int) -> bool:
         if x < 0 or y < 0 or x >= self.width or y >= self.height:
             return True
-        return self.grid[y][x] in (WALL, BRICK)
+        return self.cells[y * self.stride + x] != EMPTY
 
     def destroy(self, x: int, y: int) -> bool:
         """Remove a brick tile and return True if destroyed."""
 
-        if self.grid[y][x] == BRICK:
-            self.grid[y][x] = EMPTY
+        index = y * self.stride + x
+        if self.cells[index] == BRICK:
+            self.cells[index] = EMPTY
+            self.dirty.add(index)
+            self.revision += 1
             return True
         return False
 
-    def draw(
-        self, surface: pygame.surface.Surface, assets: dict[str, pygame.surface.Surface]
+    def _draw_tile(
+        self,
+        surface: pygame.surface.Surface,
+        x: int,
+        y: int,
+        wall: pygame.surface.Surface | None,
+        brick: pygame.surface.Surface | None,
     ) -> None:
+        tile = self.cells[y * self.stride + x]
+        rect = (x * TILE_SIZE, y * TILE_SIZE, TILE_SIZE, TILE_SIZE)
+        if tile == WALL:
+            if wall:
+                surface.blit(wall, rect[:2])
+            else:
+                pygame.draw.rect(surface, (0, 40, 0), rect)
+        elif tile == BRICK:
+            if brick:
+                surface.blit(brick, rect[:2])
+            else:
+                pygame.draw.rect(surface, (0, 80, 0), rect)
+        else:
+            pygame.draw.rect(surface, (0, 0, 0), rect)
+        pygame.draw.rect(surface, (0, 40, 0), rect, 1)
+
+    def render(
+        self, assets: dict[str, pygame.surface.Surface]
+    ) -> pygame.surface.Surface:
+        """Return the cached background, redrawing only dirty tiles.
+
+        The whole map is drawn the first time (or when *assets* changes);
+        after that only tiles marked by :meth:`destroy` are redrawn.
+        """
+
         wall = assets.get("wall")
         brick = assets.get("brick")
-        for y in range(self.height):
-            for x in range(self.width):
-                tile = self.grid[y][x]
-                rect = self.rects[y][x]
-                if tile == WALL:
-                    if wall:
-                        surface.blit(wall, rect[:2])
-                    else:
-                        pygame.draw.rect(surface, (0, 40, 0), rect)
-                elif tile == BRICK:
-                    if brick:
-                        surface.blit(brick, rect[:2])
-                    else:
-                        pygame.draw.rect(surface, (0, 80, 0), rect)
-                else:
-                    pygame.draw.rect(surface, (0, 0, 0), rect)
-                pygame.draw.rect(surface, (0, 40, 0), rect, 1)
+        if self.background is None or assets is not self._background_assets:
+            size = (self.width * TILE_SIZE, self.height * TILE_SIZE)
+            self.background = pygame.Surface(size)
+            if pygame.display.get_surface():
+                self.background = self.background.convert()
+            self._background_assets = assets
+            self.dirty.clear()
+            for y in range(self.height):
+                for x in range(self.width):
+                    self._draw_tile(self.background, x, y, wall, brick)
+        elif self.dirty:
+            for index in self.dirty:
+                y, x = divmod(index, self.stride)
+                self._draw_tile(self.background, x, y, wall, brick)
+            self.dirty.clear()
+        return self.background
+
+    def draw(
+        self,
+        surface: pygame.surface.Surface,
+        assets: dict[str, pygame.surface.Surface],
+        offset: tuple[int, int] = (0, 0),
+    ) -> None:
+        """Blit the part of the map that starts *offset* pixels in."""
+        x, y = offset
+        area = (x, y, surface.get_width(), surface.get_height())
+        surface.blit(self.render(assets), (0, 0), area)
@@ -0,0 +1,98 @@
+"""Per-tile occupancy layers for Bomberman entities."""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import Any
+
+from .explosion import ExplosionPool
+
+# shared result for empty tiles, so lookups never allocate
+_NOBODY: tuple[Any, ...] = ()
+
+
+class TileLayer:
+    """Entities of one kind indexed by the tile they stand on.
+
+    Entities must expose integer ``x`` and ``y`` attributes.  The layer has
+    to be told about every spawn, move and removal; in exchange
+    :meth:`occupied` and :meth:`at` are dictionary lookups.  ``revision``
+    changes on every update so dependent caches can tell they are stale.
+    """
+
+    def __init__(self, width: int):
+        self.width = width
+        self.tiles: dict[int, list[Any]] = {}
+        self.revision = 0
+        # emptied tile lists, reused so moving entities allocates nothing
+        self._spare: list[list[Any]] = []
+
+    def _key(self, x: int, y: int) -> int:
+        return y * self.width + x
+
+    def add(self, entity: Any) -> None:
+        self.revision += 1
+        key = self._key(entity.x, entity.y)
+        entities = self.tiles.get(key)
+        if entities is None:
+            entities = self.tiles[key] = self._spare.pop() if self._spare else []
+        entities.append(entity)
+
+    def remove(self, entity: Any, x: int | None = None, y: int | None = None) -> None:
+        """Remove *entity* from its tile, or from ``(x, y)`` if given."""
+        if x is None or y is None:
+            x, y = entity.x, entity.y
+        key = self._key(x, y)
+        entities = self.tiles.get(key)
+        if entities is None or entity not in entities:
+            return
+        entities.remove(entity)
+        self.revision += 1
+        if not entities:
+            del self.tiles[key]
+            self._spare.append(entities)
+
+    def move(self, entity: Any, old_x: int, old_y: int) -> None:
+        """Re-index *entity* after it moved from ``(old_x, old_y)``."""
+        if old_x != entity.x or old_y != entity.y:
+            self.remove(entity, old_x, old_y)
+            self.add(entity)
+
+    def occupied(self, x: int, y: int) -> bool:
+        return self._key(x, y) in self.tiles
+
+    def at(self, x: int, y: int) -> Sequence[Any]:
+        """Return the entities on ``(x, y)``; the result must not be modified."""
+        return self.tiles.get(self._key(x, y), _NOBODY)
+
+    def clear(self) -> None:
+        self.tiles.clear()
+        self.revision += 1
+
+
+class OccupancyGrid:
+    """Occupancy layers for everything that can stand on a level tile.
+
+    Explosions are not separate objects; ``explosions`` is the
+    :class:`~.explosion.ExplosionPool` holding them, which answers
+    :meth:`~.explosion.ExplosionPool.occupied` like the other layers.
+    """
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.bombs = TileLayer(width)
+        self.explosions = ExplosionPool(width, height)
+        self.enemies = TileLayer(width)
+        self.powerups = TileLayer(width)
+        self.players = TileLayer(width)
+
+    def clear(self) -> None:
+        for layer in (
+            self.bombs,
+            self.explosions,
+            self.enemies,
+            self.powerups,
+            self.players,
+        ):
+            layer.clear()
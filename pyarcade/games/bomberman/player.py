@@ -7,6 +7,12 @@ import pygame
 
 from .level import TILE_SIZE, Level
 from .bomb import Bomb
+from .occupancy import OccupancyGrid
+
+# Bits of one player's input in a tick's input mask; player ``slot`` n
+# uses the bits shifted left by ``n * INPUT_BITS``.
+UP, DOWN, LEFT, RIGHT, BOMB = 1, 2, 4, 8, 16
+INPUT_BITS = 5
 
 
 @dataclass
@@ -19,47 +25,84 @@ class Controls:
 
 
 class Player:
+    __slots__ = (
+        "x",
+        "y",
+        "controls",
+        "slot",
+        "image",
+        "max_bombs",
+        "active_bombs",
+        "radius",
+    )
+
     def __init__(
-        self, x: int, y: int, controls: Controls, image: pygame.surface.Surface
+        self,
+        x: int,
+        y: int,
+        controls: Controls | None,
+        image: pygame.surface.Surface,
+        *,
+        slot: int = 0,
     ):
         self.x = x
         self.y = y
+        # ``None`` for players only ever driven by a bot
         self.controls = controls
+        self.slot = slot
         self.image = image
         self.max_bombs = 1
+        self.active_bombs = 0
         self.radius = 2
 
     @property
     def rect(self) -> pygame.rect.Rect:
         return pygame.Rect(self.x * TILE_SIZE, self.y * TILE_SIZE, TILE_SIZE, TILE_SIZE)
 
-    def handle_input(
-        self,
-        keys: pygame.key.ScancodeWrapper,
-        level: Level,
-        bombs: list[Bomb],
-    ) -> None:
+    def read_input(self, keys: pygame.key.ScancodeWrapper) -> int:
+        """Return the movement bits for the keys held in *keys*."""
+        controls = self.controls
+        return (
+            (UP if keys[controls.up] else 0)
+            | (DOWN if keys[controls.down] else 0)
+            | (LEFT if keys[controls.left] else 0)
+            | (RIGHT if keys[controls.right] else 0)
+        )
+
+    def handle_input(self, bits: int, level: Level, occupancy: OccupancyGrid) -> None:
+        """Move according to this player's input *bits* for the tick."""
         dx = dy = 0
-        if keys[self.controls.left]:
+        if bits & LEFT:
             dx = -1
-        elif keys[self.controls.right]:
+        elif bits & RIGHT:
             dx = 1
-        elif keys[self.controls.up]:
+        elif bits & UP:
             dy = -1
-        elif keys[self.controls.down]:
+        elif bits & DOWN:
             dy = 1
+        self.move(dx, dy, level, occupancy)
+
+    def move(self, dx: int, dy: int, level: Level, occupancy: OccupancyGrid) -> None:
+        """Step by ``(dx, dy)`` unless a wall, brick or bomb is in the way."""
         if dx or dy:
             nx, ny = self.x + dx, self.y + dy
-            blocked = any(b.x == nx and b.y == ny for b in bombs)
+            blocked = occupancy.bombs.occupied(nx, ny)
             if not level.is_blocked(nx, ny) and not blocked:
+                old_x, old_y = self.x, self.y
                 self.x, self.y = nx, ny
+                occupancy.players.move(self, old_x, old_y)
 
-    def drop_bomb(self, bombs: list[Bomb], fuse_ms: int) -> None:
-        if sum(1 for b in bombs if b.owner is self) >= self.max_bombs:
+    def drop_bomb(
+        self, bombs: list[Bomb], fuse_ms: int, occupancy: OccupancyGrid
+    ) -> None:
+        if self.active_bombs >= self.max_bombs:
             return
-        if any(b.x == self.x and b.y == self.y for b in bombs):
+        if occupancy.bombs.occupied(self.x, self.y):
             return
-        bombs.append(Bomb(self.x, self.y, fuse_ms, self.radius, owner=self))
+        bomb = Bomb(self.x, self.y, fuse_ms, self.radius, owner=self)
+        bombs.append(bomb)
+        occupancy.bombs.add(bomb)
+        self.active_bombs += 1
 
     def draw(self, surface: pygame.surface.Surface) -> None:
         surface.blit(self.image, (self.x * TILE_SIZE, self.y * TILE_SIZE))
@@ -8,6 +8,8 @@ from .level import TILE_SIZE
 
 
 class PowerUp:
+    __slots__ = ("x", "y", "kind", "image")
+
     def __init__(self, x: int, y: int, kind: str, image: pygame.surface.Surface):
         self.x = x
         self.y = y
@@ -0,0 +1,168 @@
+"""Compact per-tick input recordings of Bomberman matches.
+
+A match is fully determined by its seed, settings and the controls held on
+every simulation tick, so that is all a replay stores: a small header, the
+settings as JSON and the input bitmasks run-length encoded as ``(mask,
+ticks)`` pairs of native uint32.  Held keys change rarely, so a minute of
+play usually fits in a few kilobytes.
+
+Replays can be re-simulated without a window::
+
+    python -m pyarcade.games.bomberman.replay path/to/match.bmr
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import os
+import struct
+import time
+from array import array
+from collections.abc import Iterator
+from pathlib import Path
+
+from ...utils.resources import save_path
+
+MAGIC = b"BMR1"
+# magic, seed, player count, simulation rate, settings length
+HEADER = struct.Struct("=4sQBHI")
+MAX_RUN = 0xFFFFFFFF
+REPLAY_DIR = save_path("bomberman_replays")
+# recordings kept on disk; the oldest are removed first
+KEEP_REPLAYS = 20
+
+
+class ReplayWriter:
+    """Append a match's tick inputs to a replay file as they happen.
+
+    Runs are written out when the input changes and on every :meth:`flush`,
+    so a crash loses at most the ticks since the last flush; closing the
+    writer (which the game does in ``cleanup``) writes everything.
+    """
+
+    def __init__(self, path, seed: int, players: int, sim_hz: int, config: dict):
+        self.path = Path(path)
+        settings = json.dumps(config, sort_keys=True).encode("utf-8")
+        try:
+            header = HEADER.pack(MAGIC, seed, players, sim_hz, len(settings))
+        except struct.error as exc:
+            raise ValueError(f"cannot record a match with seed {seed!r}") from exc
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.file = open(self.path, "wb")
+        self.file.write(header)
+        self.file.write(settings)
+        self.mask = 0
+        self.run = 0
+        self.ticks = 0
+
+    def add(self, mask: int) -> None:
+        """Record the input *mask* for one tick."""
+        if mask != self.mask or self.run == MAX_RUN:
+            self._write_run()
+            self.mask = mask
+        self.run += 1
+        self.ticks += 1
+
+    def _write_run(self) -> None:
+        if self.run:
+            array("I", (self.mask, self.run)).tofile(self.file)
+            self.run = 0
+
+    def flush(self) -> None:
+        self._write_run()
+        self.file.flush()
+
+    def close(self) -> None:
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+
+class Replay:
+    """A recorded match read back from disk."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        data = self.path.read_bytes()
+        try:
+            magic, self.seed, self.players, self.sim_hz, size = HEADER.unpack_from(data)
+            if magic != MAGIC or not self.sim_hz:
+                raise ValueError
+            start = HEADER.size + size
+            self.config = json.loads(data[HEADER.size : start].decode("utf-8"))
+            self.runs = array("I")
+            body = data[start:]
+            self.runs.frombytes(body[: len(body) // 8 * 8])
+        except (ValueError, struct.error) as exc:
+            raise ValueError(f"{path} is not a Bomberman replay") from exc
+
+    @property
+    def ticks(self) -> int:
+        return sum(self.runs[1::2])
+
+    def inputs(self) -> Iterator[int]:
+        """Yield the input mask of every recorded tick in order."""
+        runs = self.runs
+        for i in range(0, len(runs), 2):
+            mask = runs[i]
+            for _ in range(runs[i + 1]):
+                yield mask
+
+
+def new_replay_path(seed: int, directory=None) -> Path:
+    """Reserve a fresh file for a match, pruning old recordings.
+
+    The file is created empty so that matches started in the same second
+    with the same seed get numbered names instead of overwriting each other.
+    """
+    directory = Path(directory or REPLAY_DIR)
+    if directory.is_dir():
+        old = sorted(directory.glob("*.bmr"), key=lambda p: p.stat().st_mtime)
+        for path in old[: max(0, len(old) - KEEP_REPLAYS + 1)]:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+    directory.mkdir(parents=True, exist_ok=True)
+    stem = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{seed}"
+    for n in itertools.count():
+        path = directory / (f"{stem}-{n}.bmr" if n else f"{stem}.bmr")
+        try:
+            with open(path, "xb"):
+                return path
+        except FileExistsError:
+            continue
+
+
+def main(argv=None) -> int:
+    """Re-simulate replays headlessly and report how each one ends."""
+    import argparse
+
+    import pygame
+
+    from ... import headless
+    from .bomberman import BombermanGame
+
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("replays", nargs="+", help="replay files to simulate")
+    args = parser.parse_args(argv)
+    headless.init_headless()
+    for path in args.replays:
+        replay = Replay(path)
+        game = BombermanGame(players=replay.players)
+        game.startup(pygame.display.get_surface())
+        start = time.perf_counter()
+        ticks = game.run_replay(replay)
+        elapsed = time.perf_counter() - start
+        speed = ticks / replay.sim_hz / elapsed if elapsed else float("inf")
+        print(
+            f"{path}: seed {replay.seed}, {ticks} ticks in {elapsed:.2f}s "
+            f"({speed:.0f}x real time), ended in state {game.state!r}"
+        )
+        game.cleanup()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
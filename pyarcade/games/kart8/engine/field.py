@@ -0,0 +1,163 @@
+"""A pack of AI karts simulated together with NumPy.
+
+Where :class:`~.physics.Ghost` is one Python object, a :class:`KartField`
+keeps the position, speed and temperament of every opponent in parallel
+arrays and advances all of them in a handful of vector operations per tick.
+"""
+
+from __future__ import annotations
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is optional
+    np = None
+
+from .items import BOOST, OIL, SHELL
+from .physics import CURVE_PUSH, MAX_SPEED
+
+HAS_NUMPY = np is not None
+
+MIN_OPPONENTS = 1
+MAX_OPPONENTS = 32
+
+COLORS = (
+    (255, 0, 0),
+    (255, 128, 0),
+    (255, 0, 255),
+    (0, 200, 200),
+    (160, 80, 255),
+    (255, 255, 255),
+    (120, 255, 120),
+    (200, 160, 60),
+)
+
+# same tuning as Car and Ghost
+BASE_SPEED = 100.0
+RUBBER_BAND = 0.3
+FRICTION = 40.0
+ITEM_REACH = 5.0
+
+
+class KartField:
+    """Opponent karts stored as arrays and stepped in one update.
+
+    Each tick every kart aims for a speed set by its difficulty plus a
+    rubber band toward the player, is pushed toward the outside of curves,
+    steers back to its racing line and reacts to items on the track.
+    ``draw_z``/``draw_x`` hold the positions to render after
+    :meth:`interpolate`.
+    """
+
+    def __init__(self, track, count, difficulty=1.0, seed=None):
+        if np is None:
+            raise RuntimeError("KartField requires NumPy")
+        count = max(MIN_OPPONENTS, min(int(count), MAX_OPPONENTS))
+        self.track = track
+        self.count = count
+        self.rng = np.random.default_rng(seed)
+        index = np.arange(count)
+        # staggered grid ahead of the player, two karts per row
+        self.z = (index // 2 + 1) * 6.0 % track.total_length
+        self.lane = np.where(index % 2, 1.0, -1.0) * self.rng.uniform(0.3, 1.2, count)
+        self.x = self.lane.copy()
+        self.speed = np.zeros(count)
+        self.bonus = np.zeros(count)
+        self.oil = np.zeros(count)
+        self.laps = np.zeros(count, dtype=np.int64)
+        self.temperament = self.rng.uniform(0.85, 1.15, count)
+        self.difficulty = np.empty(count)
+        self.set_difficulty(difficulty)
+        self.colors = [COLORS[i % len(COLORS)] for i in range(count)]
+        self.prev_z = self.z.copy()
+        self.prev_x = self.x.copy()
+        self.draw_z = self.z
+        self.draw_x = self.x
+        track.compile()
+        self._cumulative = np.asarray(track.cumulative)
+        self._curvatures = np.asarray(track.curvatures)
+
+    def set_difficulty(self, difficulty):
+        self.difficulty[:] = difficulty * self.temperament
+
+    def curvature_at(self, z):
+        """Vectorised :meth:`Track.curvature_at` for an array of positions."""
+        index = np.searchsorted(self._cumulative, z, side="left")
+        return self._curvatures[np.minimum(index, len(self._curvatures) - 1)]
+
+    def update(self, dt, target_z, items=None):
+        """Advance every kart by *dt* seconds, rubber-banding to *target_z*."""
+        length = self.track.total_length
+        self.prev_z = self.z.copy()
+        self.prev_x = self.x.copy()
+        # signed gap to the player, in [-length / 2, length / 2)
+        gap = (target_z - self.z + length / 2) % length - length / 2
+        diff = self.difficulty
+        target = BASE_SPEED * diff + gap * RUBBER_BAND * diff
+        target = np.where(self.oil > 0, target * 0.6, target)
+        self.speed = np.clip(target + self.bonus, 0.0, MAX_SPEED * 1.2)
+        self.bonus -= np.sign(self.bonus) * np.minimum(
+            np.abs(self.bonus), FRICTION * dt
+        )
+        self.oil = np.maximum(self.oil - dt, 0.0)
+
+        ratio = self.speed / MAX_SPEED
+        self.x -= self.curvature_at(self.z) * CURVE_PUSH * dt * ratio
+        self.x += (self.lane - self.x) * min(1.0, 2.0 * dt)
+        np.clip(self.x, -3.0, 3.0, out=self.x)
+
+        z = self.z + self.speed * dt
+        self.laps += (z >= length).astype(np.int64)
+        self.z = z % length
+        if items is not None and len(items):
+            self.hit_items(items)
+
+    def hit_items(self, items):
+        """Apply boosts, oil and shells within reach of any kart.
+
+        Live items are sorted by z (with a second copy one lap on, so reaches
+        across the finish line stay contiguous) and each kart's reach becomes
+        a ``searchsorted`` range; only the resulting kart/item pairs are
+        tested.  Indexing the item arrays copies, so they stay free to grow.
+        """
+        length = self.track.total_length
+        live = np.flatnonzero(np.frombuffer(items.active, dtype=np.bool_))
+        if not len(live):
+            return
+        item_z = np.frombuffer(items.z)[live]
+        order = np.argsort(item_z, kind="stable")
+        slots = np.concatenate((live[order], live[order]))
+        zs = np.concatenate((item_z[order], item_z[order] + length))
+        lo = np.searchsorted(zs, self.z, side="left")
+        counts = np.searchsorted(zs, self.z + ITEM_REACH, side="left") - lo
+        total = int(counts.sum())
+        if not total:
+            return
+        starts = np.repeat(lo - (np.cumsum(counts) - counts), counts)
+        kart = np.repeat(np.arange(self.count), counts)
+        slot = slots[starts + np.arange(total)]
+        close = np.abs(self.x[kart] - np.frombuffer(items.x)[slot]) < 0.6
+        kart, slot = kart[close], slot[close]
+        kinds = np.frombuffer(items.kind, dtype=np.uint8)[slot]
+
+        boosted = kart[kinds == BOOST]
+        self.bonus[boosted] = np.maximum(self.bonus[boosted], 80.0)
+        self.oil[kart[kinds == OIL]] = 2.0
+        struck = np.unique(kart[kinds == SHELL])
+        self.bonus[struck] -= self.speed[struck] * 0.5
+        for hit in np.unique(slot[kinds == SHELL]).tolist():
+            items.deactivate(hit)
+
+    def interpolate(self, alpha):
+        """Set ``draw_z``/``draw_x`` *alpha* of the way through the last step."""
+        if alpha >= 1.0:
+            self.draw_z, self.draw_x = self.z, self.x
+            return
+        length = self.track.total_length
+        dz = (self.z - self.prev_z + length / 2) % length - length / 2
+        self.draw_z = (self.prev_z + dz * alpha) % length
+        self.draw_x = self.prev_x + (self.x - self.prev_x) * alpha
+
+    def place(self, laps, z):
+        """Return the race position (1-based) of a kart at *laps*/*z*."""
+        ahead = (self.laps > laps) | ((self.laps == laps) & (self.z > z))
+        return int(np.count_nonzero(ahead)) + 1
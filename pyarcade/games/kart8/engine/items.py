@@ -0,0 +1,146 @@
+"""Track items stored in flat arrays and bucketed by distance along the track.
+
+Each item occupies a slot: its type code, position and speed live in
+parallel arrays and an ``active`` flag marks whether it can still be hit.
+Slots are grouped into fixed-length z buckets so collision checks and
+rendering only look at the buckets around a kart instead of every item.
+"""
+
+from __future__ import annotations
+
+from array import array
+
+ITEM_TYPES = ("boost", "oil", "shell")
+BOOST, OIL, SHELL = range(len(ITEM_TYPES))
+
+# Length of track covered by one bucket.
+BUCKET_LENGTH = 10.0
+
+
+class ItemIndex:
+    """Slot-based item records with a z-bucket index.
+
+    ``track`` supplies ``total_length``; the buckets are rebuilt whenever it
+    changes, so items may be added before the track is complete.
+    """
+
+    def __init__(self, track, bucket_length: float = BUCKET_LENGTH):
+        self.track = track
+        self.bucket_length = bucket_length
+        self.clear()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def clear(self) -> None:
+        """Remove every item."""
+        self.kind = array("B")
+        self.z = array("d")
+        self.x = array("d")
+        self.speed = array("d")
+        self.active = bytearray()
+        self.moving: list[int] = []  # slots with a non-zero speed
+        self.buckets: list[list[int]] = []
+        self.slot_bucket = array("i")
+        self.count = 0  # active items
+        self._length = None
+        self._step = self.bucket_length
+
+    def add(self, kind: str, z: float, x: float, speed: float = 0.0) -> int:
+        """Store a new active item and return its slot."""
+        slot = len(self.kind)
+        if self._length is not None:
+            z %= self._length
+        self.kind.append(ITEM_TYPES.index(kind))
+        self.z.append(z)
+        self.x.append(x)
+        self.speed.append(speed)
+        self.active.append(1)
+        self.slot_bucket.append(-1)
+        self.count += 1
+        if speed:
+            self.moving.append(slot)
+        if self._length is not None:
+            self._insert(slot)
+        return slot
+
+    def deactivate(self, slot: int) -> None:
+        """Mark *slot* as collected; it stays allocated but is skipped."""
+        if self.active[slot]:
+            self.active[slot] = 0
+            self.count -= 1
+
+    def _bucket_of(self, z: float) -> int:
+        return int(z / self._step) % len(self.buckets)
+
+    def _insert(self, slot: int) -> None:
+        bucket = self._bucket_of(self.z[slot])
+        self.buckets[bucket].append(slot)
+        self.slot_bucket[slot] = bucket
+
+    def _ensure_index(self) -> bool:
+        length = self.track.total_length
+        if length <= 0:
+            return False
+        if self._length != length:
+            self._length = length
+            count = max(1, round(length / self.bucket_length))
+            # stretch buckets slightly so they tile the lap exactly
+            self._step = length / count
+            self.buckets = [[] for _ in range(count)]
+            for slot in range(len(self.kind)):
+                self.z[slot] %= length
+                self._insert(slot)
+        return True
+
+    def move(self, slot: int, z: float) -> None:
+        """Set the position of *slot*, moving it to another bucket if needed."""
+        if not self._ensure_index():
+            return
+        z %= self._length
+        self.z[slot] = z
+        bucket = self._bucket_of(z)
+        old = self.slot_bucket[slot]
+        if bucket != old:
+            self.buckets[old].remove(slot)
+            self.buckets[bucket].append(slot)
+            self.slot_bucket[slot] = bucket
+
+    def advance(self, dt: float) -> None:
+        """Move every active moving item (shells) forward by *dt* seconds."""
+        active = self.active
+        for slot in self.moving:
+            if active[slot]:
+                self.move(slot, self.z[slot] + self.speed[slot] * dt)
+
+    def ahead(self, z: float, reach: float):
+        """Yield ``(dz, slot)`` for active items up to *reach* ahead of *z*.
+
+        Only the buckets overlapping ``[z, z + reach]`` are visited; results
+        are not sorted.
+        """
+        if not self.count or not self._ensure_index():
+            return
+        length = self._length
+        reach = min(reach, length)
+        z %= length
+        first = self._bucket_of(z)
+        last = int((z + reach) / self._step)
+        visits = min(last - int(z / self._step) + 1, len(self.buckets))
+        active, zs = self.active, self.z
+        for k in range(visits):
+            for slot in self.buckets[(first + k) % len(self.buckets)]:
+                if not active[slot]:
+                    continue
+                dz = zs[slot] - z
+                if dz < 0:
+                    dz += length
+                if dz <= reach:
+                    yield dz, slot
+
+    def slots(self):
+        """Yield the slot of every active item."""
+        return (slot for slot, flag in enumerate(self.active) if flag)
+
+    def type_name(self, slot: int) -> str:
+        return ITEM_TYPES[self.kind[slot]]
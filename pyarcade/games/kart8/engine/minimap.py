@@ -0,0 +1,65 @@
+"""Track minimap drawn as a persistent layer with incremental marker updates."""
+
+from __future__ import annotations
+
+import pygame
+
+from .track import POLYLINE_SAMPLES
+
+
+class Minimap:
+    """Outline of the lap plus position markers.
+
+    The outline is rendered once into ``template``.  ``surface`` keeps the
+    markers of the previous frame; :meth:`update` restores only the areas
+    those markers covered before drawing the new ones, and does nothing when
+    no marker has moved.
+    """
+
+    def __init__(self, track, size=(80, 60), margin=5):
+        w, h = size
+        pts = track.polyline or track.trace_polyline()
+        self.step = track.total_length / POLYLINE_SAMPLES
+        xs = [p[0] for p in pts]
+        ys = [p[1] for p in pts]
+        minx, maxx = min(xs), max(xs)
+        miny, maxy = min(ys), max(ys)
+        scale = min(
+            (w - 2 * margin) / (maxx - minx + 1e-6),
+            (h - 2 * margin) / (maxy - miny + 1e-6),
+        )
+        self.points = [
+            (int((px - minx) * scale) + margin, int((py - miny) * scale) + margin)
+            for px, py in pts
+        ]
+        surf = pygame.Surface(size)
+        if pygame.display.get_surface():
+            surf = surf.convert()
+        surf.fill((0, 0, 0))
+        pygame.draw.lines(surf, (100, 100, 100), False, self.points, 1)
+        self.template = surf
+        self.surface = surf.copy()
+        self._markers = []
+        self._dirty = []
+
+    def point_at(self, z):
+        """Return the minimap pixel for track distance *z*."""
+        return self.points[int(z / self.step) % len(self.points)]
+
+    def update(self, markers):
+        """Show *markers*, an iterable of ``(z, color, radius)`` drawn in order.
+
+        Returns the rects of ``surface`` that changed.
+        """
+        markers = [(self.point_at(z), color, r) for z, color, r in markers]
+        if markers == self._markers:
+            return []
+        changed = self._dirty
+        for rect in changed:
+            self.surface.blit(self.template, rect, rect)
+        self._dirty = [
+            pygame.draw.circle(self.surface, color, point, radius)
+            for point, color, radius in markers
+        ]
+        self._markers = markers
+        return changed + self._dirty
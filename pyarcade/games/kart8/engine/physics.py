@@ -1,5 +1,11 @@
 from dataclasses import dataclass
 
+# Sideways drift per second at full speed per unit of curvature; 0.5 per
+# frame at the 60 fps the push was first tuned for.
+CURVE_PUSH = 30.0
+# Top speed of a player's car, shared with the AI pack in ``field``.
+MAX_SPEED = 220.0
+
 
 @dataclass
 class Car:
@@ -10,7 +16,7 @@ class Car:
     color: tuple = (0, 0, 255)
     oil_timer: float = 0.0
 
-    max_speed: float = 220.0
+    max_speed: float = MAX_SPEED
     accel: float = 120.0
     brake: float = 160.0
     friction: float = 40.0
@@ -38,7 +44,7 @@ class Car:
         if controls.get("right"):
             self.x += 1.5 * dt * (self.speed / self.max_speed) * grip
         # push car to outside of curve
-        self.x -= curve * 0.5 * (self.speed / self.max_speed)
+        self.x -= curve * CURVE_PUSH * dt * (self.speed / self.max_speed)
         self.x = max(-3.0, min(self.x, 3.0))
 
         self.z = (self.z + self.speed * dt) % self.track.total_length
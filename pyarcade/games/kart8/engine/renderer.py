@@ -1,66 +1,140 @@
-from pathlib import Path
+import heapq
+import logging
+from operator import itemgetter
 
 import pygame
 
+from .sprites import SPRITES
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is optional
+    np = None
+
+# Available ``render_road`` implementations, selectable through the
+# ``road_renderer`` setting in ``kart8.json``.
+ROAD_RENDERERS = ("rects", "numpy")
+
+ITEM_SPRITES = {"boost": "boost.png", "oil": "oil.png", "shell": "shell.png"}
+ITEM_COLORS = {"boost": (255, 255, 0), "oil": (0, 0, 0), "shell": (255, 0, 0)}
+
+# Sprites further ahead than this are culled before projection.
+DRAW_DISTANCE = 300.0
+
+_depth = itemgetter(0)
+
+
+class RowTable:
+    """Per-row perspective values for one camera size.
+
+    ``rows`` lists ``(y, perspective, road_width)`` from the bottom of the
+    screen up to the horizon, the order the road is accumulated in.  With
+    NumPy the same columns are also kept as arrays for the vector backend,
+    along with ``edges``, its scratch space for the span edges of each row.
+    """
+
+    __slots__ = ("key", "horizon", "rows", "perspective", "road_w", "edges")
+
+    def __init__(self, width, height, cam_height, scale):
+        self.key = (width, height, cam_height, scale)
+        self.horizon = height // 2
+        self.rows = []
+        for y in range(height - 1, self.horizon, -1):
+            perspective = cam_height / (y - self.horizon)
+            self.rows.append((y, perspective, scale / perspective))
+        self.perspective = self.road_w = self.edges = None
+        if np is not None:
+            ys = np.arange(height - 1, self.horizon, -1)
+            self.perspective = cam_height / (ys - self.horizon)
+            self.road_w = scale / self.perspective
+            self.edges = np.zeros((len(self.rows), 6), dtype=np.int64)
+            self.edges[:, 5] = width
+
 
 class Renderer:
-    def __init__(self, track):
+    def __init__(self, track, road_renderer: str = "rects", sprites=None):
         self.track = track
+        self.sprites = sprites or SPRITES
         self.scale = 200.0  # scaling factor for width
         self.cam_height = 1.0
+        self.draw_distance = DRAW_DISTANCE
         self.screen = None
+        if road_renderer not in ROAD_RENDERERS:
+            logging.warning("Unknown road renderer %r; using rects", road_renderer)
+            road_renderer = "rects"
+        elif road_renderer == "numpy" and np is None:
+            logging.warning("NumPy not installed; using the rect road renderer")
+            road_renderer = "rects"
+        self.road_renderer = road_renderer
+        # Views may be rendered on worker threads, and Track.compile is not
+        # safe to run alongside them, so drawing only reads compiled tables.
+        if not track._compiled:
+            track.compile()
+        self._track_arrays = None
+        self._palette = None
+        self._row_table = None
+        # curvature under the camera, memoised per player position
+        self._curve_z = None
+        self._curve = 0.0
 
-        assets = Path(__file__).resolve().parents[1] / "assets" / "generated"
-        self.player_img = self._load_image(assets / "car_blue.png")
-        self.enemy_img = self._load_image(assets / "car_red.png")
-        self.item_imgs = {
-            "boost": self._load_image(assets / "boost.png"),
-            "oil": self._load_image(assets / "oil.png"),
-            "shell": self._load_image(assets / "shell.png"),
-        }
-        self.enemy_cache = {}
-        self.item_cache = {k: {} for k in self.item_imgs}
-
-    @staticmethod
-    def _load_image(path):
-        try:
-            return pygame.image.load(str(path)).convert_alpha()
-        except Exception:
-            return None
+    def row_table(self):
+        """Return the row table for the current surface, rebuilt on resize."""
+        width, height = self.screen.get_size()
+        key = (width, height, self.cam_height, self.scale)
+        if self._row_table is None or self._row_table.key != key:
+            self._row_table = RowTable(width, height, self.cam_height, self.scale)
+        return self._row_table
+
+    def camera_curve(self, player):
+        """Return the track curvature at *player*, computed once per position."""
+        if self._curve_z != player.z:
+            self._curve_z = player.z
+            self._curve = self.track.curvature_at(player.z)
+        return self._curve
 
     def project(self, obj_z, obj_x, player):
         dz = obj_z - player.z
         if dz < 0:
             dz += self.track.total_length
+        return self.project_depth(dz, obj_x, player)
+
+    def project_depth(self, dz, obj_x, player):
+        """Project a point *dz* ahead of *player*; None if not on screen."""
         if dz <= 1e-2:
             return None
         # depth to screen row
         y = int(self.cam_height / dz)
-        horizon = self.screen.get_height() // 2
-        screen_y = horizon + y
-        if screen_y >= self.screen.get_height():
+        table = self.row_table()
+        screen_y = table.horizon + y
+        if screen_y >= table.key[1]:
             return None
-        curve = self.track.curvature_at(player.z)
+        curve = self.camera_curve(player)
         center = self.screen.get_width() / 2 - curve * dz * dz
         scale = self.scale / dz
         screen_x = center + obj_x * scale
         return screen_x, screen_y, scale
 
     def render_road(self, player):
+        # pixels2d needs whole-word pixels; other formats use the rect path
+        if self.road_renderer == "numpy" and self.screen.get_bytesize() in (2, 4):
+            self.render_road_numpy(player)
+        else:
+            self.render_road_rects(player)
+
+    def render_road_rects(self, player):
+        """Draw the road as five one-pixel-high rects per screen row."""
         width, height = self.screen.get_size()
-        horizon = height // 2
-        self.screen.fill((50, 50, 50), (0, 0, width, horizon))
+        table = self.row_table()
+        self.screen.fill((50, 50, 50), (0, 0, width, table.horizon))
+        if not self.track.segments:
+            return
+        curvature_at = self.track.curvature_at
         x = 0.0
         dx = 0.0
-        for y in range(height - 1, horizon, -1):
-            perspective = self.cam_height / (y - horizon)
+        for y, perspective, road_w in table.rows:
             world_z = player.z + perspective
-            seg, _, _ = self.track.segment_at(world_z)
-            if not seg:
-                continue
-            dx += seg.curvature * perspective
+            dx += curvature_at(world_z) * perspective
             x += dx
-            road_w = self.scale / perspective
             center = width / 2 - x + player.x * road_w * 0.02
             left = int(center - road_w)
             right = int(center + road_w)
@@ -82,83 +156,206 @@ class Renderer:
                 self.screen, road_color, pygame.Rect(left + 2, y, right - left - 4, 1)
             )
 
-    def render_billboards(self, player):
-        for z, x, color in sorted(
-            self.track.billboards,
-            key=lambda b: -self.track.relative_distance(player.z, b[0]),
-        ):
-            res = self.project(z, x, player)
+    def render_road_numpy(self, player):
+        """Draw the road by computing every scanline at once with NumPy.
+
+        Produces the same pixels as :meth:`render_road_rects`: rows are
+        evaluated bottom-up so the curve accumulation matches, and each
+        span is painted only where the equivalent rect would be non-empty.
+        """
+        width, height = self.screen.get_size()
+        table = self.row_table()
+        horizon = table.horizon
+        self.screen.fill((50, 50, 50), (0, 0, width, horizon))
+        if not self.track.segments or not table.rows:
+            return
+        arrays = self._track_arrays
+        if arrays is None or arrays[0] is not self.track:
+            arrays = self._track_arrays = (
+                self.track,
+                np.asarray(self.track.cumulative),
+                np.asarray(self.track.curvatures),
+            )
+        _, cumulative, curvatures = arrays
+
+        perspective = table.perspective
+        world_z = player.z + perspective
+        index = np.searchsorted(
+            cumulative, np.mod(world_z, self.track.total_length), side="left"
+        )
+        curve = curvatures[np.minimum(index, len(curvatures) - 1)]
+        x = np.cumsum(np.cumsum(curve * perspective))
+        road_w = table.road_w
+        center = width / 2 - x + player.x * road_w * 0.02
+        left = np.trunc(center - road_w).astype(np.int64)
+        right = np.trunc(center + road_w).astype(np.int64)
+        visible = ~((right < 0) | (left > width))
+        if not visible.any():
+            return
+        odd = world_z.astype(np.int64) // 3 % 2
+        # flip to top-down order and keep only the rows that get painted
+        keep = np.flatnonzero(visible[::-1])
+        left, right, odd = left[::-1][keep], right[::-1][keep], odd[::-1][keep]
+
+        # Each row is five spans: grass, shoulder, road, shoulder, grass.  The
+        # two 2px shoulder rects cover [min(l, r - 2), max(l + 2, r)) and the
+        # road rect [l + 2, r - 2) paints over them where it is non-empty.
+        count = len(keep)
+        edges = table.edges[:count]
+        np.minimum(left, right - 2, out=edges[:, 1])
+        np.add(left, 2, out=edges[:, 2])
+        np.maximum(right - 2, edges[:, 2], out=edges[:, 3])
+        np.maximum(left + 2, right, out=edges[:, 4])
+        np.clip(edges[:, 1:5], 0, width, out=edges[:, 1:5])
+        spans = np.diff(edges, axis=1)
+        colors = self._road_palette()[odd]
+        painted = np.repeat(colors.ravel(), spans.ravel()).reshape(count, width)
+
+        pixels = pygame.surfarray.pixels2d(self.screen)
+        rows = pixels[:, horizon + 1 : height].T
+        if count == len(rows):
+            rows[:] = painted
+        else:
+            rows[keep] = painted
+        del pixels, rows
+
+    def _road_palette(self):
+        """Return the five span colours of even and odd stripes, mapped."""
+        key = (self.screen.get_bitsize(), self.screen.get_masks())
+        if self._palette is None or self._palette[0] != key:
+            spans = (
+                ((0, 170, 0), (16, 120, 16)),
+                ((220, 220, 220), (200, 200, 200)),
+                ((110, 110, 110), (100, 100, 100)),
+                ((220, 220, 220), (200, 200, 200)),
+                ((0, 170, 0), (16, 120, 16)),
+            )
+            colors = np.array(
+                [
+                    [self.screen.map_rgb(span[parity]) for span in spans]
+                    for parity in (0, 1)
+                ],
+                dtype=np.uint32,
+            )
+            self._palette = (key, colors)
+        return self._palette[1]
+
+    def billboard_sprites(self, player):
+        """Return ``(dz, surface, pos)`` for visible billboards, far first."""
+        sprites = []
+        solid = self.sprites.solid
+        for dz, x, color in self.track.billboards_ahead(player.z, self.draw_distance):
+            res = self.project_depth(dz, x, player)
+            if not res:
+                continue
+            sx, sy, scale = res
+            size = max(5, int(20 * scale / self.scale))
+            pos = (int(sx) - size // 2, int(sy) - size)
+            sprites.append((dz, solid(color, (size, size)), pos))
+        sprites.reverse()
+        return sprites
+
+    def item_sprites(self, player, items):
+        """Return ``(dz, surface, pos)`` for visible items, far first.
+
+        *items* is the track's :class:`~.items.ItemIndex`; only the buckets
+        within the draw distance are visited.
+        """
+        sprites = []
+        for dz, slot in items.ahead(player.z, self.draw_distance):
+            res = self.project_depth(dz, items.x[slot], player)
             if not res:
                 continue
             sx, sy, scale = res
             size = max(5, int(20 * scale / self.scale))
-            rect = pygame.Rect(int(sx) - size // 2, int(sy) - size, size, size)
-            pygame.draw.rect(self.screen, color, rect)
+            kind = items.type_name(slot)
+            img = self.sprites.scaled(ITEM_SPRITES[kind], (size, size))
+            if not img:
+                img = self.sprites.solid(ITEM_COLORS[kind], (size, size))
+            w, h = img.get_size()
+            sprites.append((dz, img, (int(sx) - w // 2, int(sy) - h)))
+        sprites.sort(key=_depth, reverse=True)
+        return sprites
 
-    def render_car(self, car, player):
-        res = self.project(car.z, car.x, player)
+    def _car_sprite(self, dz, x, color, player, alpha=None):
+        res = self.project_depth(dz, x, player)
         if not res:
-            return
+            return None
         sx, sy, scale = res
         w = int(20 * scale / self.scale)
         h = int(40 * scale / self.scale)
-        if self.enemy_img:
-            key = (w, h)
-            img = self.enemy_cache.get(key)
-            if img is None:
-                img = pygame.transform.scale(self.enemy_img, (w, h)).convert_alpha()
-                self.enemy_cache[key] = img
-            rect = img.get_rect(midbottom=(int(sx), int(sy)))
-            self.screen.blit(img, rect)
-        else:
-            rect = pygame.Rect(int(sx) - w // 2, int(sy) - h, w, h)
-            pygame.draw.rect(self.screen, car.color, rect)
+        if w <= 0 or h <= 0:
+            return None
+        img = self.sprites.scaled("car_red.png", (w, h), alpha)
+        if not img:
+            img = self.sprites.solid(color, (w, h), alpha)
+        w, h = img.get_size()
+        return dz, img, (int(sx) - w // 2, int(sy) - h)
+
+    def car_sprites(self, player, cars):
+        """Return ``(dz, surface, pos)`` for visible cars, far first.
+
+        Cars with an ``alpha`` attribute (replayed ghosts) are translucent.
+        """
+        sprites = []
+        for car in cars:
+            dz = self.track.relative_distance(player.z, car.z)
+            if dz > self.draw_distance:
+                continue
+            alpha = getattr(car, "alpha", None)
+            sprite = self._car_sprite(dz, car.x, car.color, player, alpha)
+            if sprite:
+                sprites.append(sprite)
+        sprites.sort(key=_depth, reverse=True)
+        return sprites
+
+    def field_sprites(self, player, field):
+        """Return ``(dz, surface, pos)`` for visible karts of a ``KartField``.
+
+        Culling and depth ordering are done on the field's arrays, so only
+        karts that can be on screen are projected.
+        """
+        dz = (field.draw_z - player.z) % self.track.total_length
+        near = np.flatnonzero((dz > 1e-2) & (dz <= self.draw_distance))
+        order = near[np.argsort(dz[near], kind="stable")[::-1]]
+        sprites = []
+        xs = field.draw_x
+        for i in order.tolist():
+            sprite = self._car_sprite(
+                float(dz[i]), float(xs[i]), field.colors[i], player
+            )
+            if sprite:
+                sprites.append(sprite)
+        return sprites
+
+    def render_sprites(self, player, others=None, items=None, field=None):
+        """Draw billboards, items and cars back to front in one ``blits`` call.
+
+        Each source list is already ordered far-to-near, so they are merged
+        rather than sorted together.
+        """
+        layers = [self.billboard_sprites(player)]
+        if items:
+            layers.append(self.item_sprites(player, items))
+        if others:
+            layers.append(self.car_sprites(player, others))
+        if field is not None:
+            layers.append(self.field_sprites(player, field))
+        merged = heapq.merge(*layers, key=_depth, reverse=True)
+        self.screen.blits(((img, pos) for _, img, pos in merged), doreturn=False)
 
     def render_player_car(self):
         width, height = self.screen.get_size()
-        if self.player_img:
-            rect = self.player_img.get_rect(midbottom=(width // 2, height))
-            self.screen.blit(self.player_img, rect)
+        img = self.sprites.image("car_blue.png")
+        if img:
+            rect = img.get_rect(midbottom=(width // 2, height))
+            self.screen.blit(img, rect)
         else:
             rect = pygame.Rect(width // 2 - 10, height - 40, 20, 40)
             pygame.draw.rect(self.screen, (0, 0, 255), rect)
 
-    def render_items(self, player, items):
-        colors = {
-            "boost": (255, 255, 0),
-            "oil": (0, 0, 0),
-            "shell": (255, 0, 0),
-        }
-        for item in items:
-            res = self.project(item["z"], item["x"], player)
-            if not res:
-                continue
-            sx, sy, scale = res
-            size = max(5, int(20 * scale / self.scale))
-            img = self.item_imgs.get(item["type"])
-            if img:
-                cache = self.item_cache[item["type"]]
-                scaled = cache.get(size)
-                if scaled is None:
-                    scaled = pygame.transform.scale(img, (size, size)).convert_alpha()
-                    cache[size] = scaled
-                rect = scaled.get_rect(midbottom=(int(sx), int(sy)))
-                self.screen.blit(scaled, rect)
-            else:
-                rect = pygame.Rect(int(sx) - size // 2, int(sy) - size, size, size)
-                pygame.draw.rect(
-                    self.screen, colors.get(item["type"], (255, 255, 255)), rect
-                )
-
-    def render(self, surface, player, others=None, items=None):
+    def render(self, surface, player, others=None, items=None, field=None):
         self.screen = surface
         self.render_road(player)
-        self.render_billboards(player)
-        if items:
-            self.render_items(player, items)
-        if others:
-            for obj in sorted(
-                others, key=lambda o: -self.track.relative_distance(player.z, o.z)
-            ):
-                self.render_car(obj, player)
+        self.render_sprites(player, others, items, field)
         self.render_player_car()
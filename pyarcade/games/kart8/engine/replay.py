@@ -0,0 +1,125 @@
+"""Recording laps as compact traces and replaying them as ghost karts.
+
+A lap file is a small header followed by ``(z, x, speed)`` samples stored
+as native float32 at :data:`SAMPLE_HZ`; a one-minute lap is about 21 KB.
+Replays read the file in chunks as playback advances instead of loading
+the whole trace up front.
+"""
+
+from __future__ import annotations
+
+import os
+import struct
+from array import array
+from pathlib import Path
+
+MAGIC = b"KGL1"
+# magic, sample rate, lap time, sample count
+HEADER = struct.Struct("=4sHfI")
+SAMPLE_HZ = 30
+FIELDS = 3  # z, x, speed
+CHUNK = 256  # samples read per disk access during playback
+
+
+class LapRecorder:
+    """Sample one kart at a fixed rate for the duration of a lap."""
+
+    def __init__(self, hz: int = SAMPLE_HZ):
+        self.hz = hz
+        self.reset()
+
+    def reset(self):
+        self.samples = array("f")
+        self.time = 0.0
+        self._next = 0.0
+
+    def add(self, dt, z, x, speed):
+        """Advance the lap clock by *dt*, sampling the kart when one is due."""
+        # tolerance keeps float drift from delaying a sample by one tick
+        while self._next <= self.time + 1e-9:
+            self.samples.extend((z, x, speed))
+            self._next += 1 / self.hz
+        self.time += dt
+
+    def save(self, path, lap_time):
+        """Write the trace to *path* atomically."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            f.write(HEADER.pack(MAGIC, self.hz, lap_time, len(self.samples) // FIELDS))
+            self.samples.tofile(f)
+        os.replace(tmp, path)
+
+
+class GhostReplay:
+    """Translucent kart that follows a recorded lap.
+
+    Has the ``z``/``x``/``color`` attributes the renderer and minimap expect
+    from opponents, plus ``alpha`` for translucency.
+    """
+
+    alpha = 110
+
+    def __init__(self, path, total_length, color=(180, 180, 255)):
+        self.file = open(path, "rb")
+        try:
+            magic, self.hz, self.lap_time, self.count = HEADER.unpack(
+                self.file.read(HEADER.size)
+            )
+            if magic != MAGIC or not self.count or not self.hz:
+                raise ValueError(f"{path} is not a kart8 lap trace")
+        except (ValueError, struct.error) as exc:
+            self.file.close()
+            raise ValueError(f"{path} is not a kart8 lap trace") from exc
+        self.total_length = total_length
+        self.color = color
+        self.z = self.x = self.speed = 0.0
+        self._chunk = array("f")
+        self._chunk_start = 0
+        self.restart()
+
+    def restart(self):
+        """Start the lap again from its first sample."""
+        self.time = 0.0
+        self.z, self.x, self.speed = self._sample(0)
+
+    def _sample(self, i):
+        offset = i - self._chunk_start
+        if not 0 <= offset < len(self._chunk) // FIELDS:
+            # start one sample early so interpolation pairs share a chunk
+            start = max(0, i - 1)
+            self._chunk = array("f")
+            self.file.seek(HEADER.size + start * FIELDS * self._chunk.itemsize)
+            try:
+                self._chunk.fromfile(self.file, min(CHUNK, self.count - start) * FIELDS)
+            except EOFError:
+                pass  # a truncated trace just ends early
+            self._chunk_start = start
+            offset = i - start
+            if offset >= len(self._chunk) // FIELDS:
+                self.count = max(1, start + len(self._chunk) // FIELDS)
+                return self.z, self.x, self.speed
+        base = offset * FIELDS
+        return tuple(self._chunk[base : base + FIELDS])
+
+    def update(self, dt):
+        """Advance playback by *dt*; the ghost parks at the end of the trace."""
+        self.time += dt
+        pos = min(self.time * self.hz, self.count - 1)
+        i = int(pos)
+        z0, x0, s0 = self._sample(i)
+        if i + 1 >= self.count:
+            self.z, self.x, self.speed = z0, x0, s0
+            return
+        z1, x1, s1 = self._sample(i + 1)
+        frac = pos - i
+        dz = z1 - z0
+        if dz < -self.total_length / 2:
+            dz += self.total_length
+        self.z = (z0 + dz * frac) % self.total_length
+        self.x = x0 + (x1 - x0) * frac
+        self.speed = s0 + (s1 - s0) * frac
+
+    def close(self):
+        self.file.close()
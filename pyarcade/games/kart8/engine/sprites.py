@@ -0,0 +1,166 @@
+"""Shared, memory-bounded cache of kart8 sprites.
+
+Every :class:`~.renderer.Renderer` draws through one :class:`SpriteCache` so
+each PNG is decoded once no matter how many split-screen views exist, and
+scaled copies are shared between them.  Requested sizes are quantised into
+buckets so sprites that differ by a pixel or two reuse the same surface, and
+the least recently used surfaces are evicted once ``max_bytes`` is exceeded.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import pygame
+
+ASSET_DIR = Path(__file__).resolve().parents[1] / "assets" / "generated"
+
+# Default upper bound for scaled surfaces held by the shared cache.
+DEFAULT_MAX_BYTES = 8 * 1024 * 1024
+
+
+def quantize(length: int) -> int:
+    """Round *length* to a size bucket.
+
+    Small sprites keep their exact size; larger ones snap to steps of about
+    1/16 of their size, which is below what the eye notices on a moving kart.
+    """
+    if length < 16:
+        return max(0, length)
+    step = 1 << (length.bit_length() - 4)
+    return (length + step // 2) // step * step
+
+
+class SpriteCache:
+    """Decode-once image store plus an LRU cache of scaled surfaces.
+
+    Renderers may run on worker threads (see ``parallel_render``), so cache
+    access is serialised with a lock.  Scaling and filling happen outside
+    it, letting threads build different sprites at once; if two threads
+    build the same one, the first to store it wins.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, asset_dir: Path = ASSET_DIR):
+        self.max_bytes = max_bytes
+        self.asset_dir = Path(asset_dir)
+        self._images: dict[Path, pygame.surface.Surface | None] = {}
+        self._scaled: OrderedDict[tuple, pygame.surface.Surface] = OrderedDict()
+        self._lock = threading.RLock()
+        self.bytes_held = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def image(self, name: str) -> pygame.surface.Surface | None:
+        """Return the decoded asset *name* (e.g. ``"car_red.png"``) or None."""
+        path = self.asset_dir / name
+        with self._lock:
+            if path in self._images:
+                return self._images[path]
+            try:
+                img = pygame.image.load(str(path)).convert_alpha()
+            except Exception:
+                if path.is_file():
+                    # the file exists but no display mode is set yet; retry later
+                    return None
+                img = None
+            self._images[path] = img
+            return img
+
+    def scaled(
+        self, name: str, size: tuple[int, int], alpha: int | None = None
+    ) -> pygame.surface.Surface | None:
+        """Return asset *name* scaled to the size bucket containing *size*.
+
+        *alpha* gives a translucent copy, cached separately.
+        """
+        w, h = quantize(size[0]), quantize(size[1])
+        key = (name, w, h, alpha)
+        with self._lock:
+            surf = self._lookup(key)
+        if surf is not None:
+            return surf
+        img = self.image(name)
+        if img is None:
+            return None
+        surf = pygame.transform.scale(img, (w, h)).convert_alpha()
+        if alpha is not None:
+            surf.set_alpha(alpha)
+        return self._insert(key, surf)
+
+    def solid(
+        self,
+        color: tuple[int, int, int],
+        size: tuple[int, int],
+        alpha: int | None = None,
+    ) -> pygame.surface.Surface:
+        """Return a surface of *size* filled with *color*.
+
+        Used for billboards and for sprites whose image is missing, so they
+        can be batched into the same ``blits`` call as textured sprites.
+        """
+        key = (tuple(color), size[0], size[1], alpha)
+        with self._lock:
+            surf = self._lookup(key)
+        if surf is not None:
+            return surf
+        surf = pygame.Surface(size)
+        if pygame.display.get_surface():
+            surf = surf.convert()
+        surf.fill(color)
+        if alpha is not None:
+            surf.set_alpha(alpha)
+        return self._insert(key, surf)
+
+    def _lookup(self, key: tuple) -> pygame.surface.Surface | None:
+        surf = self._scaled.get(key)
+        if surf is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._scaled.move_to_end(key)
+        return surf
+
+    def _insert(
+        self, key: tuple, surf: pygame.surface.Surface
+    ) -> pygame.surface.Surface:
+        """Store *surf* unless another thread stored *key* first."""
+        with self._lock:
+            existing = self._scaled.get(key)
+            if existing is not None:
+                return existing
+            self._store(key, surf)
+            return surf
+
+    def _store(self, key: tuple, surf: pygame.surface.Surface) -> None:
+        self._scaled[key] = surf
+        self.bytes_held += surf.get_bytesize() * surf.get_width() * surf.get_height()
+        while self.bytes_held > self.max_bytes and len(self._scaled) > 1:
+            _, old = self._scaled.popitem(last=False)
+            self.bytes_held -= old.get_bytesize() * old.get_width() * old.get_height()
+            self.evictions += 1
+
+    def stats(self) -> dict[str, int]:
+        """Return hit/miss/eviction counters and the memory currently held."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._scaled),
+                "bytes": self.bytes_held,
+                "images": sum(1 for img in self._images.values() if img),
+            }
+
+    def clear(self) -> None:
+        """Forget all decoded and scaled surfaces."""
+        with self._lock:
+            self._images.clear()
+            self._scaled.clear()
+            self.bytes_held = 0
+
+
+# Cache shared by every kart8 renderer.
+SPRITES = SpriteCache()
@@ -1,6 +1,17 @@
+import bisect
+import math
 import random
+from array import array
 from dataclasses import dataclass
 
+from .items import ItemIndex
+
+# Points in the minimap outline produced by ``Track.trace_polyline``.
+POLYLINE_SAMPLES = 200
+# Largest dense lookup table ``Track.compile`` builds; tracks that would need
+# more buckets (a very short segment on a long lap) bisect instead.
+LOOKUP_LIMIT = 1 << 16
+
 
 @dataclass
 class Segment:
@@ -17,31 +28,123 @@ class Track:
         self.segments = []
         self.cumulative = []
         self.total_length = 0.0
-        self.billboards = []  # list of (z, x, color)
-        self.items = []  # list of dicts with keys type,z,x,speed etc
+        self.billboards = []  # list of (z, x, color), sorted by z on compile
+        self.billboard_z = array("d")
+        self.items = ItemIndex(self)
+        # compiled lookup structures, rebuilt lazily after ``add``
+        self.curvatures = []
+        self.lookup = None  # bucket -> index of the segment at the bucket start
+        self.lookup_step = 0.0
+        self.polyline = []  # top-down outline of the lap in world units
+        self._compiled = False
 
     def add(self, seg: Segment):
         self.segments.append(seg)
         self.total_length += seg.length
         self.cumulative.append(self.total_length)
+        self._compiled = False
+
+    def compile(self):
+        """Build the per-segment curvature table and dense z lookup table.
+
+        Buckets of the lookup table are at most half the shortest segment
+        long, so each bucket contains at most one segment boundary and a
+        lookup needs only one comparison against ``cumulative`` to be exact.
+        If that would take more than ``LOOKUP_LIMIT`` buckets no table is
+        built and ``segment_index`` bisects ``cumulative`` instead.
+        """
+        # build everything aside and publish it at the end instead of
+        # clearing the old tables first
+        billboards = sorted(self.billboards, key=lambda b: b[0])
+        table = None
+        step = 0.0
+        shortest = min((seg.length for seg in self.segments), default=0.0)
+        if shortest > 0 and self.total_length / (shortest / 2) < LOOKUP_LIMIT:
+            step = shortest / 2
+            table = array("I")
+            index = 0
+            last = len(self.segments) - 1
+            for bucket in range(int(self.total_length / step) + 1):
+                z = bucket * step
+                while index < last and z > self.cumulative[index]:
+                    index += 1
+                table.append(index)
+        self.curvatures = [seg.curvature for seg in self.segments]
+        self.billboards = billboards
+        self.billboard_z = array("d", (b[0] for b in billboards))
+        self.lookup, self.lookup_step = table, step
+        self._compiled = True
+        self.polyline = self.trace_polyline()
+
+    def trace_polyline(self, samples=POLYLINE_SAMPLES):
+        """Integrate curvature around the lap into ``samples`` (x, y) points."""
+        if not self.segments or self.total_length <= 0:
+            return []
+        pts = []
+        x = y = 0.0
+        ang = 0.0
+        step = self.total_length / samples
+        z = 0.0
+        while z < self.total_length:
+            ang += self.curvature_at(z) * step * 40
+            x += math.cos(ang) * step
+            y += math.sin(ang) * step
+            pts.append((x, y))
+            z += step
+        return pts
+
+    def segment_index(self, z):
+        """Return the index of the segment containing distance *z*.
+
+        Segments own their end point, matching ``z <= cumulative[i]``.
+        """
+        if not self._compiled:
+            self.compile()
+        z = z % self.total_length
+        if self.lookup is not None:
+            index = self.lookup[int(z / self.lookup_step)]
+            if z > self.cumulative[index] and index < len(self.segments) - 1:
+                index += 1
+            return index
+        return min(bisect.bisect_left(self.cumulative, z), len(self.segments) - 1)
 
     def segment_at(self, z):
         """Return segment and its start position for distance *z*."""
         if not self.segments:
             return None, 0.0, 0.0
         z = z % self.total_length
-        prev_end = 0.0
-        for seg, end in zip(self.segments, self.cumulative):
-            if z <= end:
-                return seg, prev_end, (z - prev_end) / seg.length
-            prev_end = end
-        seg = self.segments[-1]
-        start = self.cumulative[-2] if len(self.cumulative) > 1 else 0.0
-        return seg, start, 1.0
+        index = self.segment_index(z)
+        seg = self.segments[index]
+        start = self.cumulative[index - 1] if index else 0.0
+        return seg, start, (z - start) / seg.length
 
     def curvature_at(self, z):
-        seg, _, _ = self.segment_at(z)
-        return seg.curvature if seg else 0.0
+        if not self.segments:
+            return 0.0
+        index = self.segment_index(z)
+        return self.curvatures[index]
+
+    def billboards_ahead(self, z, distance):
+        """Yield ``(dz, x, color)`` for billboards ahead of *z*, nearest first.
+
+        Billboards are kept sorted by z, so this is a bisect to the camera
+        position followed by a walk that stops at *distance*.
+        """
+        if not self._compiled or len(self.billboard_z) != len(self.billboards):
+            self.compile()
+        count = len(self.billboards)
+        if not count or not self.total_length:
+            return
+        z = z % self.total_length
+        start = bisect.bisect_right(self.billboard_z, z)
+        for k in range(count):
+            bz, x, color = self.billboards[(start + k) % count]
+            dz = bz - z
+            if dz <= 0:
+                dz += self.total_length
+            if dz > distance:
+                return
+            yield dz, x, color
 
     def relative_distance(self, z, target):
         diff = target - z
@@ -73,12 +176,9 @@ def create_demo_track():
         track.billboards.append((z, x, color))
 
     # place a few items along the track
-    track.items = []
     for i in range(3):
-        track.items.append({"type": "boost", "z": 30 + i * 80, "x": 0.0})
+        track.items.add("boost", 30 + i * 80, 0.0)
     for i in range(2):
-        track.items.append({"type": "oil", "z": 70 + i * 120, "x": 1.5})
-    track.items.append(
-        {"type": "shell", "z": 150, "x": -0.5, "speed": 90.0, "active": True}
-    )
+        track.items.add("oil", 70 + i * 120, 1.5)
+    track.items.add("shell", 150, -0.5, speed=90.0)
     return track
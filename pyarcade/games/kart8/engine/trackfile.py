@@ -0,0 +1,214 @@
+"""Loading kart8 tracks from JSON files through a compiled binary cache.
+
+A track file lists ``segments``, ``billboards`` and ``items``::
+
+    {
+      "name": "Demo Circuit",
+      "segments": [{"length": 100, "curvature": 0.002}, ...],
+      "billboards": [{"z": 25.0, "x": 2.0, "color": [0, 200, 0]}, ...],
+      "items": [{"type": "shell", "z": 150, "x": -0.5, "speed": 90.0}, ...]
+    }
+
+The first load builds a :class:`~.track.Track`, compiles its lookup tables and
+minimap outline and writes everything to ``kart8_tracks/`` in the save
+directory under a name derived from the file's hash.  Later loads map that
+file and copy the arrays straight out of it, so editing the JSON simply
+produces a new cache entry.  The name also covers :data:`VERSION` and the
+compile settings, so caches written by older code are never read.  Cache
+files use native byte order; they are rebuilt if the header does not match
+or the contents do not make sense.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+from array import array
+from pathlib import Path
+
+from ....utils.resources import save_path
+from .items import ITEM_TYPES
+from .track import LOOKUP_LIMIT, POLYLINE_SAMPLES, Segment, Track
+
+TRACK_DIR = Path(__file__).resolve().parents[1] / "tracks"
+
+MAGIC = b"KT8C"
+VERSION = 1
+# magic, version, segments, billboards, items, lookup entries, polyline
+# points, lookup step, total length
+HEADER = struct.Struct("=4sHIIIII2d")
+
+
+def track_path(name: str) -> Path:
+    """Return the JSON file for the bundled track *name*."""
+    return TRACK_DIR / f"{name}.json"
+
+
+def available_tracks() -> list[str]:
+    """Return the names of the bundled tracks."""
+    return sorted(p.stem for p in TRACK_DIR.glob("*.json"))
+
+
+def build_track(data: dict) -> Track:
+    """Create and compile a :class:`Track` from parsed track-file *data*."""
+    track = Track()
+    for seg in data["segments"]:
+        track.add(
+            Segment(
+                length=float(seg["length"]),
+                curvature=float(seg.get("curvature", 0.0)),
+                elevation=float(seg.get("elevation", 0.0)),
+                width=float(seg.get("width", 1.0)),
+            )
+        )
+    for bb in data.get("billboards", []):
+        track.billboards.append((float(bb["z"]), float(bb["x"]), tuple(bb["color"])))
+    for item in data.get("items", []):
+        track.items.add(
+            item["type"],
+            float(item["z"]),
+            float(item.get("x", 0.0)),
+            float(item.get("speed", 0.0)),
+        )
+    track.compile()
+    return track
+
+
+def _blob(track: Track) -> bytes:
+    """Serialise a compiled *track* into the cache format."""
+    segs = array("d")
+    for seg in track.segments:
+        segs.extend((seg.length, seg.curvature, seg.elevation, seg.width))
+    bb_pos = array("d")
+    bb_color = bytearray()
+    for z, x, color in track.billboards:
+        bb_pos.extend((z, x))
+        bb_color.extend(color)
+    items = track.items
+    item_pos = array("d")
+    for slot in items.slots():
+        item_pos.extend((items.z[slot], items.x[slot], items.speed[slot]))
+    kinds = bytes(items.kind[slot] for slot in items.slots())
+    lookup = track.lookup if track.lookup is not None else array("I")
+    poly = array("d")
+    for point in track.polyline:
+        poly.extend(point)
+    header = HEADER.pack(
+        MAGIC,
+        VERSION,
+        len(track.segments),
+        len(track.billboards),
+        len(kinds),
+        len(lookup),
+        len(track.polyline),
+        track.lookup_step,
+        track.total_length,
+    )
+    parts = [
+        header,
+        segs.tobytes(),
+        array("d", track.cumulative).tobytes(),
+        bb_pos.tobytes(),
+        bytes(bb_color),
+        kinds,
+        item_pos.tobytes(),
+        lookup.tobytes(),
+        poly.tobytes(),
+    ]
+    return b"".join(parts)
+
+
+def _read(buf) -> Track:
+    """Rebuild a :class:`Track` from a compiled cache buffer."""
+    magic, version, nseg, nbb, nitems, nlookup, npoly, step, total = HEADER.unpack_from(
+        buf
+    )
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("not a compiled kart8 track")
+    offset = HEADER.size
+
+    def take(view, typecode, count):
+        nonlocal offset
+        values = array(typecode)
+        end = offset + values.itemsize * count
+        if end > len(view):
+            raise ValueError("truncated compiled track")
+        values.frombytes(view[offset:end])
+        offset = end
+        return values
+
+    with memoryview(buf) as view:
+        segs = take(view, "d", nseg * 4)
+        cumulative = take(view, "d", nseg)
+        bb_pos = take(view, "d", nbb * 2)
+        bb_color = take(view, "B", nbb * 3)
+        kinds = take(view, "B", nitems)
+        item_pos = take(view, "d", nitems * 3)
+        lookup = take(view, "I", nlookup)
+        poly = take(view, "d", npoly * 2)
+    if any(kind >= len(ITEM_TYPES) for kind in kinds):
+        raise ValueError("unknown item kind in compiled track")
+
+    track = Track()
+    track.segments = [Segment(*segs[i : i + 4]) for i in range(0, len(segs), 4)]
+    track.cumulative = cumulative.tolist()
+    track.total_length = total
+    track.curvatures = [seg.curvature for seg in track.segments]
+    track.billboards = [
+        (bb_pos[2 * i], bb_pos[2 * i + 1], tuple(bb_color[3 * i : 3 * i + 3]))
+        for i in range(nbb)
+    ]
+    track.billboard_z = array("d", bb_pos[::2])
+    for i in range(nitems):
+        z, x, speed = item_pos[3 * i : 3 * i + 3]
+        track.items.add(ITEM_TYPES[kinds[i]], z, x, speed)
+    track.lookup = lookup if nlookup else None
+    track.lookup_step = step
+    track.polyline = list(zip(poly[::2], poly[1::2], strict=True))
+    track._compiled = True
+    return track
+
+
+def _write_atomic(path: Path, blob: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_bytes(blob)
+    os.replace(tmp, path)
+
+
+def _cache_key(raw: bytes) -> str:
+    """Hash a track file together with everything that shapes its cache."""
+    digest = hashlib.sha256(raw)
+    settings = f"{VERSION}:{POLYLINE_SAMPLES}:{LOOKUP_LIMIT}:{','.join(ITEM_TYPES)}"
+    digest.update(settings.encode("ascii"))
+    return digest.hexdigest()[:16]
+
+
+def load_track(path: str | Path, cache_dir: str | Path | None = None) -> Track:
+    """Load the track file at *path*, using the compiled cache when possible."""
+    path = Path(path)
+    raw = path.read_bytes()
+    digest = _cache_key(raw)
+    cache_dir = Path(cache_dir) if cache_dir else save_path("kart8_tracks")
+    cached = cache_dir / f"{path.stem}-{digest}.bin"
+    try:
+        with (
+            open(cached, "rb") as f,
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf,
+        ):
+            return _read(buf)
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError, struct.error):
+        logging.warning("Ignoring unreadable compiled track %s", cached)
+
+    track = build_track(json.loads(raw))
+    try:
+        _write_atomic(cached, _blob(track))
+    except OSError:
+        logging.warning("Could not cache compiled track %s", cached)
+    return track
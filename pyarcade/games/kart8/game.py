@@ -1,15 +1,22 @@
-import math
+import logging
+from concurrent.futures import ThreadPoolExecutor
 
 import pygame
 
 from ...state import State
 from ...utils.persistence import load_json, save_json
 from ...utils.resources import save_path
+from .engine.field import HAS_NUMPY, KartField
+from .engine.items import BOOST, OIL, SHELL
+from .engine.minimap import Minimap
 from .engine.physics import Car, Ghost
 from .engine.renderer import Renderer
+from .engine.replay import GhostReplay, LapRecorder
 from .engine.track import create_demo_track
+from .engine.trackfile import load_track, track_path
 
 SAVE_PATH = save_path("kart8.json")
+GHOST_DIR = save_path("kart8_ghosts")
 DEFAULT_DATA = {
     "settings": {
         "difficulty": 1.0,
@@ -17,6 +24,16 @@ DEFAULT_DATA = {
         "fps": 60,
         "volume": 1.0,
         "show_help": True,
+        # "rects" or "numpy" (vectorised scanlines, needs NumPy)
+        "road_renderer": "rects",
+        # render split-screen cameras on worker threads
+        "parallel_render": False,
+        # name of a file in kart8/tracks/
+        "track": "demo",
+        # AI karts in single-player races (needs NumPy; 0 races one ghost)
+        "opponents": 8,
+        # race against a replay of the best lap on this track
+        "ghost_replay": True,
     },
     "times": {
         "1p": {"last": [], "best": []},
@@ -26,8 +43,17 @@ DEFAULT_DATA = {
 
 NUM_LAPS = 2
 
+# How far ahead of a kart an item can be and still be hit.
+ITEM_REACH = 5.0
+
+SHELL_MARKER = (255, 255, 255)
+
 
 class KartGame(State):
+    # Physics runs at a fixed rate so slow frames cannot make karts skip
+    # past items; rendering interpolates between the last two steps.
+    sim_hz = 120
+
     def __init__(self, *, players: int = 1, **kwargs):
         super().__init__(**kwargs)
         self.players = 1 if players not in (1, 2) else players
@@ -35,88 +61,107 @@ class KartGame(State):
 
     def startup(self, screen, num_players: int = 1, items: bool = True, **opts):
         super().startup(screen, num_players, **opts)
-        self.track = create_demo_track()
-        if not items:
-            self.track.items = []
-        self.items_enabled = items
         self.data = load_json(SAVE_PATH, DEFAULT_DATA)
         settings = self.data.get("settings", {})
+        self.track_name = settings.get("track", "demo")
+        self.track = self.load_track(self.track_name)
+        if not items:
+            self.track.items.clear()
+        self.items_enabled = items
         self.difficulty = settings.get("difficulty", 1.0)
         self.layout = settings.get("layout", "vertical")
         self.fps_cap = settings.get("fps", 60)
         self.volume = settings.get("volume", 1.0)
         self.show_help = settings.get("show_help", True)
+        self.road_renderer = settings.get("road_renderer", "rects")
+        self.parallel_render = settings.get("parallel_render", False)
+        self.render_pool = None
         if pygame.mixer.get_init():
             pygame.mixer.music.set_volume(self.volume)
 
         self.karts = [Car(self.track)]
+        self.ghost = None
+        self.field = None
         if self.players > 1:
             self.karts.append(Car(self.track, color=(255, 255, 0)))
-            self.ghost = None
+        elif settings.get("opponents", 8) and HAS_NUMPY:
+            self.field = KartField(
+                self.track, settings.get("opponents", 8), self.difficulty
+            )
         else:
             self.ghost = Ghost(self.track, self.difficulty)
         self.laps = [0 for _ in self.karts]
+        # times each kart has reversed over the line without driving back
+        self.line_debt = [0 for _ in self.karts]
         self.lap_times = [[] for _ in self.karts]
         self.timers = [0.0 for _ in self.karts]
+        self.recorders = [LapRecorder() for _ in self.karts]
+        self.replay = None
+        if settings.get("ghost_replay", True):
+            self.replay = self.load_replay()
+        self.prev_positions = [(o.z, o.x) for o in self._movers()]
         self.font = pygame.font.SysFont("Courier", 20)
         self.hud_color = (0, 255, 0)
         self.create_help_surface()
+        # compile lookup tables up front so render threads never race on it
+        self.track.compile()
         self.create_cameras()
         self.build_minimap()
 
     # ---- setup helpers -------------------------------------------------
+    @property
+    def mode(self):
+        return "1p" if self.players == 1 else "2p"
+
+    def ghost_path(self):
+        return GHOST_DIR / f"{self.track_name}-{self.mode}.lap"
+
+    def load_replay(self):
+        """Open the best-lap trace for this track and mode, if there is one."""
+        path = self.ghost_path()
+        if not path.exists():
+            return None
+        try:
+            return GhostReplay(path, self.track.total_length)
+        except (OSError, ValueError):
+            logging.exception("Ignoring unreadable ghost lap %s", path)
+            return None
+
+    @staticmethod
+    def load_track(name):
+        """Load track *name*, falling back to the built-in demo track."""
+        try:
+            return load_track(track_path(name))
+        except (OSError, ValueError, KeyError, TypeError):
+            logging.exception("Could not load kart8 track %r; using demo", name)
+            return create_demo_track()
+
     def create_cameras(self):
+        """Create one camera surface and renderer per kart.
+
+        Two views are stacked or placed side by side depending on
+        ``layout``.
+        """
         w, h = self.screen.get_size()
+        views = len(self.karts)
+        if views == 1:
+            size, positions = (w, h), [(0, 0)]
+        elif self.layout == "vertical":
+            size, positions = (w, h // 2), [(0, 0), (0, h // 2)]
+        else:
+            size, positions = (w // 2, h), [(0, 0), (w // 2, 0)]
         self.renderers = []
         self.cameras = []
-        if self.players == 1:
-            surf = pygame.Surface((w, h))
+        self.camera_positions = positions
+        for _ in range(views):
+            surf = pygame.Surface(size)
             if pygame.display.get_surface():
                 surf = surf.convert()
             self.cameras.append(surf)
-            self.renderers.append(Renderer(self.track))
-        else:
-            if self.layout == "vertical":
-                size = (w, h // 2)
-            else:
-                size = (w // 2, h)
-            for _ in range(2):
-                surf = pygame.Surface(size)
-                if pygame.display.get_surface():
-                    surf = surf.convert()
-                self.cameras.append(surf)
-                self.renderers.append(Renderer(self.track))
+            self.renderers.append(Renderer(self.track, self.road_renderer))
 
     def build_minimap(self):
-        w, h = 80, 60
-        pts = []
-        x = y = 0.0
-        ang = 0.0
-        step = self.track.total_length / 200
-        z = 0.0
-        while z < self.track.total_length:
-            curve = self.track.curvature_at(z)
-            ang += curve * step * 40
-            x += math.cos(ang) * step
-            y += math.sin(ang) * step
-            pts.append((x, y))
-            z += step
-        xs = [p[0] for p in pts]
-        ys = [p[1] for p in pts]
-        minx, maxx = min(xs), max(xs)
-        miny, maxy = min(ys), max(ys)
-        scale = min((w - 10) / (maxx - minx + 1e-6), (h - 10) / (maxy - miny + 1e-6))
-        self.map_points = [
-            (int((px - minx) * scale) + 5, int((py - miny) * scale) + 5)
-            for px, py in pts
-        ]
-        surf = pygame.Surface((w, h))
-        if pygame.display.get_surface():
-            surf = surf.convert()
-        surf.fill((0, 0, 0))
-        pygame.draw.lines(surf, (100, 100, 100), False, self.map_points, 1)
-        self.minimap_template = surf
-        self.map_step = step
+        self.minimap = Minimap(self.track)
 
     def create_help_surface(self):
         lines = [
@@ -162,6 +207,8 @@ class KartGame(State):
                 self.difficulty = cycle[(idx + 1) % len(cycle)]
                 if self.ghost:
                     self.ghost.difficulty = self.difficulty
+                if self.field is not None:
+                    self.field.set_difficulty(self.difficulty)
                 self.data["settings"]["difficulty"] = self.difficulty
                 save_json(str(SAVE_PATH), self.data)
             elif event.key == pygame.K_MINUS:
@@ -178,7 +225,36 @@ class KartGame(State):
                 save_json(str(SAVE_PATH), self.data)
 
     # ---- game logic ----------------------------------------------------
+    def _movers(self):
+        """Return every object whose position is interpolated when drawing."""
+        movers = self.karts + ([self.ghost] if self.ghost else [])
+        return movers + ([self.replay] if self.replay else [])
+
+    def _interpolate(self, alpha):
+        """Move karts to their positions *alpha* of the way through a step.
+
+        Returns the simulated positions so they can be restored after drawing.
+        """
+        movers = self._movers()
+        current = [(o.z, o.x) for o in movers]
+        if alpha >= 1.0:
+            return current
+        total = self.track.total_length
+        for obj, (pz, px), (z, x) in zip(
+            movers, self.prev_positions, current, strict=True
+        ):
+            dz = z - pz
+            # unwrap lap crossings in either direction
+            if dz > total / 2:
+                dz -= total
+            elif dz < -total / 2:
+                dz += total
+            obj.z = (pz + dz * alpha) % total
+            obj.x = px + (x - px) * alpha
+        return current
+
     def update(self, dt):
+        self.prev_positions = [(o.z, o.x) for o in self._movers()]
         keys = pygame.key.get_pressed()
         # player 1 controls
         controls1 = {
@@ -191,12 +267,18 @@ class KartGame(State):
         prev_z1 = self.karts[0].z
         self.karts[0].update(dt, controls1, boost1)
         self.timers[0] += dt
-        if prev_z1 > self.karts[0].z:
+        if self._crossed_line(0, prev_z1):
             self.laps[0] += 1
             self.lap_times[0].append(self.timers[0])
+            self.finish_lap(0)
             self.timers[0] = 0.0
             if len(self.lap_times[0]) >= NUM_LAPS:
                 self.record_time(0)
+            if self.replay:
+                self.replay.restart()
+        self.recorders[0].add(dt, self.karts[0].z, self.karts[0].x, self.karts[0].speed)
+        if self.replay:
+            self.replay.update(dt)
 
         if self.players > 1:
             controls2 = {
@@ -209,37 +291,38 @@ class KartGame(State):
             prev_z2 = self.karts[1].z
             self.karts[1].update(dt, controls2, boost2)
             self.timers[1] += dt
-            if prev_z2 > self.karts[1].z:
+            if self._crossed_line(1, prev_z2):
                 self.laps[1] += 1
                 self.lap_times[1].append(self.timers[1])
+                self.finish_lap(1)
                 self.timers[1] = 0.0
                 if len(self.lap_times[1]) >= NUM_LAPS:
                     self.record_time(1)
+            k2 = self.karts[1]
+            self.recorders[1].add(dt, k2.z, k2.x, k2.speed)
         elif self.ghost:
             self.ghost.update(dt, self.karts[0].z)
+        elif self.field is not None:
+            self.field.update(
+                dt, self.karts[0].z, self.track.items if self.items_enabled else None
+            )
 
         # move shells and handle collisions
         if self.items_enabled:
-            for item in self.track.items:
-                if item.get("type") == "shell" and item.get("active", True):
-                    item["z"] = (
-                        item["z"] + item.get("speed", 0) * dt
-                    ) % self.track.total_length
+            items = self.track.items
+            items.advance(dt)
             for p in self.karts:
-                for item in self.track.items:
-                    if not item.get("active", True):
+                for dz, slot in items.ahead(p.z, ITEM_REACH):
+                    if dz >= ITEM_REACH or abs(p.x - items.x[slot]) >= 0.6:
                         continue
-                    dz = self.track.relative_distance(p.z, item["z"])
-                    if dz < 5 and abs(p.x - item["x"]) < 0.6:
-                        t = item["type"]
-                        if t == "boost":
-                            p.speed = min(p.speed + 80, p.max_speed * 1.2)
-                        elif t == "oil":
-                            p.oil_timer = 2.0
-                        elif t == "shell":
-                            p.speed *= 0.5
-                            item["active"] = False
-        self.track.items = [i for i in self.track.items if i.get("active", True)]
+                    kind = items.kind[slot]
+                    if kind == BOOST:
+                        p.speed = min(p.speed + 80, p.max_speed * 1.2)
+                    elif kind == OIL:
+                        p.oil_timer = 2.0
+                    elif kind == SHELL:
+                        p.speed *= 0.5
+                        items.deactivate(slot)
 
     # ---- drawing -------------------------------------------------------
     def draw_hud(self, surface, player, lap):
@@ -247,14 +330,77 @@ class KartGame(State):
         surface.blit(lap_text, (10, 10))
         speed_text = self.font.render(f"{int(player.speed)}", True, self.hud_color)
         surface.blit(speed_text, (10, 40))
-        if self.minimap_template:
-            m = self.minimap_template.copy()
-            idx = int(player.z / self.map_step) % len(self.map_points)
-            pygame.draw.circle(m, player.color, self.map_points[idx], 2)
-            surface.blit(m, (surface.get_width() - m.get_width() - 5, 5))
+        if self.field is not None:
+            place = self.field.place(lap, player.z)
+            place_text = self.font.render(
+                f"POS {place}/{self.field.count + 1}", True, self.hud_color
+            )
+            surface.blit(place_text, (10, 70))
+        m = self.minimap.surface
+        surface.blit(m, (surface.get_width() - m.get_width() - 5, 5))
+
+    def minimap_markers(self):
+        """Yield ``(z, color, radius)`` for shells, opponents and the karts."""
+        if self.items_enabled:
+            items = self.track.items
+            for slot in items.moving:
+                if items.active[slot]:
+                    yield items.z[slot], SHELL_MARKER, 1
+        if self.ghost:
+            yield self.ghost.z, self.ghost.color, 2
+        if self.replay:
+            yield self.replay.z, self.replay.color, 2
+        if self.field is not None:
+            for z, color in zip(
+                self.field.draw_z.tolist(), self.field.colors, strict=True
+            ):
+                yield z, color, 1
+        for kart in self.karts:
+            yield kart.z, kart.color, 2
+
+    def _crossed_line(self, index, prev_z):
+        """Return whether kart *index* finished a lap since it was at *prev_z*.
+
+        Only a forward wrap past the start counts.  Reversing over the line
+        is remembered, so driving forward across it again just undoes that.
+        """
+        z = self.karts[index].z
+        half = self.track.total_length / 2
+        if prev_z - z > half:
+            if self.line_debt[index]:
+                self.line_debt[index] -= 1
+                return False
+            return True
+        if z - prev_z > half:
+            self.line_debt[index] += 1
+        return False
+
+    def finish_lap(self, player_index: int):
+        """Keep the just-finished lap's trace if it is the best on this track."""
+        recorder = self.recorders[player_index]
+        lap = self.timers[player_index]
+        kart = self.karts[player_index]
+        # quicker than flat out on boost all the way round cannot be a lap
+        if lap < self.track.total_length / (kart.max_speed * 1.2):
+            recorder.reset()
+            return
+        times = self.data.setdefault("times", {}).setdefault(
+            self.mode, {"last": [], "best": []}
+        )
+        best = times.setdefault("best_lap", {})
+        previous = best.get(self.track_name)
+        if recorder.samples and (previous is None or lap < previous):
+            try:
+                recorder.save(self.ghost_path(), lap)
+            except OSError:
+                logging.exception("Could not save ghost lap")
+            else:
+                best[self.track_name] = lap
+                save_json(str(SAVE_PATH), self.data)
+        recorder.reset()
 
     def record_time(self, player_index: int):
-        mode = "1p" if self.players == 1 else "2p"
+        mode = self.mode
         times = self.data.setdefault("times", {}).setdefault(
             mode, {"last": [], "best": []}
         )
@@ -264,40 +410,81 @@ class KartGame(State):
         times["best"] = sorted(best)[:5]
         save_json(str(SAVE_PATH), self.data)
 
-    def draw(self):
-        self.screen.fill((0, 0, 0))
-        if self.players == 1:
-            self.renderers[0].render(
-                self.cameras[0],
-                self.karts[0],
-                [self.ghost] if self.ghost else None,
-                self.track.items if self.items_enabled else None,
-            )
-            self.draw_hud(self.cameras[0], self.karts[0], self.laps[0])
-            self.screen.blit(self.cameras[0], (0, 0))
-        else:
-            for i in range(2):
-                others = [self.karts[1 - i]]
-                self.renderers[i].render(
-                    self.cameras[i],
-                    self.karts[i],
-                    others,
-                    self.track.items if self.items_enabled else None,
+    def draw(self, alpha: float = 1.0):
+        simulated = self._interpolate(alpha)
+        if self.field is not None:
+            self.field.interpolate(alpha)
+        try:
+            self._draw_views()
+        finally:
+            for obj, (z, x) in zip(self._movers(), simulated, strict=True):
+                obj.z, obj.x = z, x
+
+    def _render_view(self, i):
+        others = [k for j, k in enumerate(self.karts) if j != i]
+        if self.ghost:
+            others.append(self.ghost)
+        if self.replay:
+            others.append(self.replay)
+        self.renderers[i].render(
+            self.cameras[i],
+            self.karts[i],
+            others or None,
+            self.track.items if self.items_enabled else None,
+            self.field,
+        )
+
+    def _parallel_safe(self):
+        """Return whether the camera views may be rendered concurrently.
+
+        Each view draws into its own software surface, and pygame releases
+        the GIL while filling and blitting those.  Hardware surfaces are
+        owned by the video driver and are always rendered serially.
+        """
+        if not self.parallel_render or len(self.cameras) < 2:
+            return False
+        return not any(cam.get_flags() & pygame.HWSURFACE for cam in self.cameras)
+
+    def _render_views(self):
+        views = range(len(self.cameras))
+        if self._parallel_safe():
+            if self.render_pool is None:
+                self.render_pool = ThreadPoolExecutor(
+                    max_workers=len(self.cameras), thread_name_prefix="kart8-render"
                 )
-                self.draw_hud(self.cameras[i], self.karts[i], self.laps[i])
-            if self.layout == "vertical":
-                h = self.screen.get_height() // 2
-                self.screen.blit(self.cameras[0], (0, 0))
-                self.screen.blit(self.cameras[1], (0, h))
-            else:
-                w = self.screen.get_width() // 2
-                self.screen.blit(self.cameras[0], (0, 0))
-                self.screen.blit(self.cameras[1], (w, 0))
+            try:
+                for future in [
+                    self.render_pool.submit(self._render_view, i) for i in views
+                ]:
+                    future.result()
+                return
+            except Exception:
+                logging.exception("Parallel kart8 render failed; rendering serially")
+                self.parallel_render = False
+        for i in views:
+            self._render_view(i)
+
+    def _draw_views(self):
+        self.screen.fill((0, 0, 0))
+        self._render_views()
+        # HUD text rendering stays on the main thread
+        self.minimap.update(self.minimap_markers())
+        for i, camera in enumerate(self.cameras):
+            self.draw_hud(camera, self.karts[i], self.laps[i])
+            self.screen.blit(camera, self.camera_positions[i])
 
         if self.show_help and self.help_surface:
             rect = self.help_surface.get_rect(center=self.screen.get_rect().center)
             self.screen.blit(self.help_surface, rect)
 
+    def cleanup(self):
+        if self.replay:
+            self.replay.close()
+            self.replay = None
+        if self.render_pool is not None:
+            self.render_pool.shutdown(wait=True)
+            self.render_pool = None
+
 
 # expose Game class for loader
 Game = KartGame
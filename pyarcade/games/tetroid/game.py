@@ -1,10 +1,10 @@
 import random
-import string
 from datetime import datetime
 
 import pygame
 
-from ...common.theme import ACCENT_COLOR, BG_COLOR, PRIMARY_COLOR, draw_text, get_font
+from ...common.rain import MatrixRain
+from ...common.theme import ACCENT_COLOR, BG_COLOR, PRIMARY_COLOR, draw_text
 from ...common.ui import PauseMenu, apply_pause_option
 from ...state import State
 from ...utils.persistence import load_json, save_json
@@ -69,11 +69,6 @@ class TetroidState(State):
 
     def startup(self, screen, num_players: int = 1):
         super().startup(screen, num_players)
-        self.rain_font = get_font(20)
-        self.rain_chars = string.ascii_letters + string.digits
-        self.rain_surfaces = {
-            ch: self.rain_font.render(ch, True, ACCENT_COLOR) for ch in self.rain_chars
-        }
         self.normal_color = ACCENT_COLOR
         self.highlight_color = PRIMARY_COLOR
         self.bg_color = BG_COLOR
@@ -116,13 +111,7 @@ class TetroidState(State):
         self.high_score = self.hs_data.get("highscore", 0)
         width, height = self.screen.get_size()
         max_glyphs = 80 if width >= 800 else 40
-        self.rain_glyphs = []
-        for _ in range(max_glyphs):
-            x = random.randrange(0, width)
-            y = random.randrange(-height, 0)
-            speed = random.uniform(50, 150)
-            char = random.choice(self.rain_chars)
-            self.rain_glyphs.append([x, y, speed, char])
+        self.rain = MatrixRain((width, height), max_glyphs, color=ACCENT_COLOR)
         self.overlay = pygame.Surface(self.screen.get_size(), pygame.SRCALPHA)
         # Initialize first pieces for the board(s)
         self.spawn_piece(self.board1)
@@ -360,14 +349,7 @@ class TetroidState(State):
             if self.state == "pause":
                 pygame.mixer.music.set_volume(self.settings.get("sound_volume", 1.0))
             return
-        width, height = self.screen.get_size()
-        for g in self.rain_glyphs:
-            g[1] += g[2] * dt
-            if g[1] > height:
-                g[0] = random.randrange(0, width)
-                g[1] = random.randrange(-height, 0)
-                g[2] = random.uniform(50, 150)
-                g[3] = random.choice(string.ascii_letters + string.digits)
+        self.rain.update(dt)
 
         boards = [self.board1]
         if self.board2:
@@ -407,9 +389,7 @@ class TetroidState(State):
     def draw(self):
         self.screen.fill(self.bg_color)
         width, height = self.screen.get_size()
-        for x, y, _, char in self.rain_glyphs:
-            glyph = self.rain_surfaces[char]
-            self.screen.blit(glyph, (x, y))
+        self.rain.draw(self.screen)
 
         boards = [self.board1]
         if self.board2:
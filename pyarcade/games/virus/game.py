@@ -1,10 +1,10 @@
 import random
-import string
 from datetime import datetime
 
 import pygame
 
-from ...common.theme import ACCENT_COLOR, BG_COLOR, PRIMARY_COLOR, draw_text, get_font
+from ...common.rain import MatrixRain
+from ...common.theme import ACCENT_COLOR, BG_COLOR, PRIMARY_COLOR, draw_text
 from ...common.ui import PauseMenu, apply_pause_option
 from ...state import State
 from ...utils.persistence import load_json, save_json
@@ -32,8 +32,6 @@ class VirusState(State):
 
     def startup(self, screen, num_players: int = 1):
         super().startup(screen, num_players)
-        # Initialize fonts (using a terminal-style font)
-        self.rain_font = get_font(20)
         # Color scheme (Matrix green on black)
         self.normal_color = ACCENT_COLOR
         self.highlight_color = PRIMARY_COLOR
@@ -91,14 +89,7 @@ class VirusState(State):
         )
         self.high_score = self.hs_data.get("highscore", 0)
         # Initialize Matrix-style falling code background
-        width, height = self.screen.get_size()
-        self.rain_glyphs = []
-        for _ in range(80):
-            x = random.randrange(0, width)
-            y = random.randrange(-height, 0)
-            speed = random.uniform(50, 150)
-            char = random.choice(string.ascii_letters + string.digits)
-            self.rain_glyphs.append([x, y, speed, char])
+        self.rain = MatrixRain(self.screen.get_size(), 80, color=self.normal_color)
         # Initialize list for score pop-up animations
         self.popups = []
         # Spawn the first piece(s) for each board
@@ -537,14 +528,7 @@ class VirusState(State):
                 pygame.mixer.music.set_volume(self.settings.get("sound_volume", 1.0))
             return
         # Update falling code background positions
-        width, height = self.screen.get_size()
-        for glyph in self.rain_glyphs:
-            glyph[1] += glyph[2] * dt
-            if glyph[1] > height:
-                glyph[0] = random.randrange(0, width)
-                glyph[1] = random.randrange(-height, 0)
-                glyph[2] = random.uniform(50, 150)
-                glyph[3] = random.choice(string.ascii_letters + string.digits)
+        self.rain.update(dt)
         # Game piece falling and locking
         boards = [self.board1]
         if self.board2:
@@ -595,9 +579,7 @@ class VirusState(State):
         self.screen.fill(self.bg_color)
         width, height = self.screen.get_size()
         # Draw falling "rain" glyphs in background
-        for x, y, _, char in self.rain_glyphs:
-            glyph_surface = self.rain_font.render(char, True, self.normal_color)
-            self.screen.blit(glyph_surface, (x, y))
+        self.rain.draw(self.screen)
         # Draw each playfield (one or two)
         boards = [self.board1] if not self.board2 else [self.board1, self.board2]
         for idx, board in enumerate(boards):
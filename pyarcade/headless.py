@@ -0,0 +1,459 @@
+"""Headless batch-simulation runner for arcade games.
+
+Games are discovered with :func:`pyarcade.main.load_games`, started against
+an off-screen surface and stepped as fast as the CPU allows while scripted or
+random key presses are fed in.  Rendering is skipped unless requested, so the
+reported numbers measure pure simulation throughput.
+
+Example::
+
+    python -m pyarcade.headless --games tetroid virus --runs 50 --frames 3600
+
+With ``--workers`` the runs are sharded across a process pool, one pygame
+instance per worker, and the scores, crash logs and frame-time statistics are
+merged back in the parent.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import traceback
+from collections import Counter
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from multiprocessing import get_context
+
+import pygame
+
+DEFAULT_SIZE = (800, 600)
+# Width of a frame-time histogram bucket in seconds.  Runs report histograms
+# rather than raw samples so thousands of them can be merged cheaply.
+FRAME_BUCKET = 0.00005
+
+# Keys the random input source may press.  Escape is left out so runs are not
+# spent sitting in pause menus, as are the function keys that rewrite settings.
+RANDOM_KEYS = (
+    pygame.K_UP,
+    pygame.K_DOWN,
+    pygame.K_LEFT,
+    pygame.K_RIGHT,
+    pygame.K_w,
+    pygame.K_a,
+    pygame.K_s,
+    pygame.K_d,
+    pygame.K_SPACE,
+    pygame.K_LSHIFT,
+    pygame.K_LCTRL,
+    pygame.K_RCTRL,
+    pygame.K_RETURN,
+    pygame.K_1,
+    pygame.K_2,
+    pygame.K_3,
+)
+
+# Key taps sent before random input starts, for games that open on a menu.
+OPENING_KEYS: dict[str, tuple[int, ...]] = {
+    # Bomberman opens on its settings screen; wrap up to "Start" and confirm.
+    "bomberman": (pygame.K_UP, pygame.K_UP, pygame.K_RETURN),
+}
+
+
+class HeldKeys:
+    """Stand-in for ``pygame.key.get_pressed()`` backed by a set of keys."""
+
+    def __init__(self) -> None:
+        self.down: set[int] = set()
+
+    def __getitem__(self, key: int) -> bool:
+        return key in self.down
+
+
+def _key_event(key: int, pressed: bool) -> pygame.event.Event:
+    kind = pygame.KEYDOWN if pressed else pygame.KEYUP
+    return pygame.event.Event(kind, key=key, mod=0, unicode="", scancode=0)
+
+
+class RandomInput:
+    """Tap the *opening* keys, then press and release random keys."""
+
+    def __init__(
+        self,
+        seed: int,
+        keys: Sequence[int] = RANDOM_KEYS,
+        opening: Sequence[int] = (),
+        change_chance: float = 0.1,
+    ) -> None:
+        self.rng = random.Random(seed)
+        self.keys = tuple(keys)
+        self.opening = tuple(opening)
+        self.change_chance = change_chance
+
+    def events(self, frame: int, held: HeldKeys) -> list[pygame.event.Event]:
+        """Return the events for *frame*, updating *held* to match."""
+        if frame < len(self.opening) * 2:
+            key = self.opening[frame // 2]
+            pressed = frame % 2 == 0
+        elif self.rng.random() < self.change_chance:
+            key = self.rng.choice(self.keys)
+            pressed = key not in held.down
+        else:
+            return []
+        if pressed:
+            held.down.add(key)
+        else:
+            held.down.discard(key)
+        return [_key_event(key, pressed)]
+
+
+class ScriptedInput:
+    """Replay a fixed list of ``(frame, key, pressed)`` key changes."""
+
+    def __init__(self, steps: Sequence[tuple[int, int, bool]]) -> None:
+        self.steps: dict[int, list[tuple[int, bool]]] = {}
+        for frame, key, pressed in steps:
+            self.steps.setdefault(frame, []).append((key, pressed))
+
+    @classmethod
+    def from_file(cls, path: str) -> ScriptedInput:
+        """Load a JSON list of ``[frame, key_name, "down" | "up"]`` entries."""
+        with open(path, encoding="utf-8") as f:
+            raw = json.load(f)
+        return cls(
+            [
+                (int(frame), pygame.key.key_code(name), action == "down")
+                for frame, name, action in raw
+            ]
+        )
+
+    def events(self, frame: int, held: HeldKeys) -> list[pygame.event.Event]:
+        """Return the events for *frame*, updating *held* to match."""
+        events = []
+        for key, pressed in self.steps.get(frame, ()):
+            if pressed:
+                held.down.add(key)
+            else:
+                held.down.discard(key)
+            events.append(_key_event(key, pressed))
+        return events
+
+
+@contextlib.contextmanager
+def patched_keyboard(held: HeldKeys) -> Iterator[None]:
+    """Route ``pygame.key.get_pressed()`` to *held* while active."""
+    original = pygame.key.get_pressed
+    pygame.key.get_pressed = lambda: held
+    try:
+        yield
+    finally:
+        pygame.key.get_pressed = original
+
+
+@dataclass
+class SimResult:
+    """Outcome of a single headless run."""
+
+    game: str
+    seed: int
+    players: int = 1
+    frames: int = 0
+    sim_time: float = 0.0
+    wall_time: float = 0.0
+    max_frame_time: float = 0.0
+    total_frame_time: float = 0.0
+    frame_hist: Counter = field(default_factory=Counter)
+    score: int | None = None
+    finished: bool = False
+    error: str | None = None
+
+    def add_frame(self, elapsed: float) -> None:
+        self.frames += 1
+        self.total_frame_time += elapsed
+        self.max_frame_time = max(self.max_frame_time, elapsed)
+        self.frame_hist[int(elapsed / FRAME_BUCKET)] += 1
+
+
+@dataclass(frozen=True)
+class SimJob:
+    """Picklable description of one run, handed to pool workers."""
+
+    game: str
+    seed: int
+    players: int = 1
+    frames: int = 3600
+    render: bool = False
+    script: str | None = None
+
+
+def percentile(hist: Counter, fraction: float) -> float:
+    """Return the frame time at *fraction* (0..1) of a merged histogram."""
+    total = sum(hist.values())
+    if not total:
+        return 0.0
+    target = fraction * total
+    seen = 0
+    for bucket in sorted(hist):
+        seen += hist[bucket]
+        if seen >= target:
+            return (bucket + 1) * FRAME_BUCKET
+    return (max(hist) + 1) * FRAME_BUCKET
+
+
+def game_score(state) -> int | None:
+    """Return the primary score of *state* if it exposes one."""
+    for attr in ("score", "score1"):
+        value = getattr(state, attr, None)
+        if isinstance(value, int | float):
+            return int(value)
+    return None
+
+
+def init_headless(size: tuple[int, int] = DEFAULT_SIZE) -> None:
+    """Initialise pygame without a real window or audio device."""
+    # assigned rather than defaulted so an inherited driver cannot open a
+    # real window or sound device
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+    pygame.init()
+    # A display mode is required for ``Surface.convert`` even though games
+    # render to an off-screen surface.
+    pygame.display.set_mode((1, 1))
+
+    from .ui.layout import init as layout_init
+
+    layout_init(size)
+
+
+def run_game(
+    name: str,
+    state_cls: type,
+    *,
+    players: int = 1,
+    frames: int = 3600,
+    seed: int = 0,
+    render: bool = False,
+    size: tuple[int, int] = DEFAULT_SIZE,
+    options: dict | None = None,
+    inputs: RandomInput | ScriptedInput | None = None,
+) -> SimResult:
+    """Simulate *frames* frames of *state_cls* and return the result.
+
+    :func:`init_headless` must have been called first.  Each frame advances
+    the game by ``1 / fps_cap`` seconds of simulated time.
+    """
+    from .main import draw_state, step_state
+
+    if inputs is None:
+        inputs = RandomInput(seed, opening=OPENING_KEYS.get(name, ()))
+    result = SimResult(game=name, seed=seed, players=players)
+    held = HeldKeys()
+    # games draw on the global random module, so seed it for repeatable runs
+    random.seed(seed)
+    state = state_cls(players=players)
+    surface = pygame.Surface(size).convert()
+    accumulator = 0.0
+    start = time.perf_counter()
+    try:
+        with patched_keyboard(held):
+            state.startup(surface, players, **(options or {}))
+            dt = 1.0 / getattr(state, "fps_cap", 60)
+            for frame in range(frames):
+                tick = time.perf_counter()
+                for event in inputs.events(frame, held):
+                    state.get_event(event)
+                accumulator, alpha = step_state(state, dt, accumulator)
+                if render:
+                    draw_state(state, alpha)
+                result.add_frame(time.perf_counter() - tick)
+                result.sim_time += dt
+                if state.done or state.quit:
+                    result.finished = True
+                    break
+    except Exception:
+        result.error = traceback.format_exc()
+    result.wall_time = time.perf_counter() - start
+    result.score = game_score(state)
+    with contextlib.suppress(Exception):
+        state.cleanup()
+    return result
+
+
+def discover_games(names: Sequence[str] | None = None) -> dict[str, type]:
+    """Return the game classes from ``load_games``, filtered by *names*."""
+    from .main import load_games
+
+    games = load_games()
+    if not names:
+        return games
+    missing = sorted(set(names) - set(games))
+    if missing:
+        raise SystemExit(f"Unknown game(s): {', '.join(missing)}")
+    return {name: games[name] for name in names}
+
+
+# Game classes of the current process, loaded once per pool worker.
+_worker_games: dict[str, type] = {}
+
+
+def _init_worker(save_dir: str) -> None:
+    os.environ["PYARCADE_SAVE_DIR"] = save_dir
+    init_headless()
+    _worker_games.update(discover_games())
+
+
+def run_job(job: SimJob) -> SimResult:
+    """Run *job* using the games loaded by the current process."""
+    if not _worker_games:
+        _worker_games.update(discover_games())
+    inputs = ScriptedInput.from_file(job.script) if job.script else None
+    return run_game(
+        job.game,
+        _worker_games[job.game],
+        players=job.players,
+        frames=job.frames,
+        seed=job.seed,
+        render=job.render,
+        inputs=inputs,
+    )
+
+
+def _failed(job: SimJob) -> SimResult:
+    """Report the exception being handled as a crashed run of *job*."""
+    return SimResult(
+        game=job.game,
+        seed=job.seed,
+        players=job.players,
+        error=traceback.format_exc(),
+    )
+
+
+def run_jobs(
+    jobs: Sequence[SimJob], workers: int, save_dir: str
+) -> Iterator[SimResult]:
+    """Yield results for *jobs*, fanning out to *workers* processes if > 1.
+
+    Workers are spawned rather than forked so each one owns a fresh pygame
+    instance with the dummy video driver.  A job that fails outside
+    :func:`run_game`, or whose worker dies, is reported as a crashed run
+    instead of ending the batch.
+    """
+    if workers <= 1:
+        _init_worker(save_dir)
+        for job in jobs:
+            try:
+                result = run_job(job)
+            except Exception:
+                result = _failed(job)
+            yield result
+        return
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(save_dir,),
+    ) as pool:
+        futures = {pool.submit(run_job, job): job for job in jobs}
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception:
+                result = _failed(futures[future])
+            yield result
+
+
+def summarise(results: Iterable[SimResult]) -> str:
+    """Format one throughput, frame-time and score line per game."""
+    lines = [
+        f"{'game':<12}{'runs':>6}{'frames':>10}{'crashes':>9}{'frames/s':>11}"
+        f"{'mean ms':>9}{'p95 ms':>8}{'max ms':>8}{'avg score':>11}"
+    ]
+    by_game: dict[str, list[SimResult]] = {}
+    for result in results:
+        by_game.setdefault(result.game, []).append(result)
+    for game, runs in sorted(by_game.items()):
+        frames = sum(r.frames for r in runs)
+        busy = sum(r.total_frame_time for r in runs)
+        hist: Counter = Counter()
+        for r in runs:
+            hist.update(r.frame_hist)
+        crashes = sum(1 for r in runs if r.error)
+        scores = [r.score for r in runs if r.score is not None]
+        avg_score = f"{sum(scores) / len(scores):.1f}" if scores else "-"
+        lines.append(
+            f"{game:<12}{len(runs):>6}{frames:>10}{crashes:>9}"
+            f"{frames / (busy or 1e-9):>11.0f}"
+            f"{busy / max(frames, 1) * 1000:>9.3f}"
+            f"{percentile(hist, 0.95) * 1000:>8.2f}"
+            f"{max(r.max_frame_time for r in runs) * 1000:>8.2f}"
+            f"{avg_score:>11}"
+        )
+    return "\n".join(lines)
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", nargs="*", help="games to run (default: all)")
+    parser.add_argument("--runs", type=int, default=1, help="runs per game")
+    parser.add_argument("--frames", type=int, default=3600, help="frames per run")
+    parser.add_argument("--players", type=int, choices=(1, 2), default=1)
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first run")
+    parser.add_argument("--render", action="store_true", help="also call draw()")
+    parser.add_argument(
+        "--script", help="JSON list of [frame, key name, 'down'|'up'] inputs"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="worker processes; 0 uses every core (default: 1, in-process)",
+    )
+    parser.add_argument("--crash-log", help="append crash tracebacks to this file")
+    parser.add_argument(
+        "--save-dir",
+        help="directory for save files (default: a fresh temporary directory)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = parse_args(argv)
+    # Redirect saves before any game module resolves its save paths.
+    save_dir = args.save_dir or tempfile.mkdtemp(prefix="pyarcade-headless-")
+    os.environ["PYARCADE_SAVE_DIR"] = save_dir
+    workers = args.workers or os.cpu_count() or 1
+    # the parent only needs the names, checked here so an unknown one stops
+    # the batch before any worker starts; workers load the classes themselves
+    names = list(discover_games(args.games))
+    jobs = [
+        SimJob(
+            name, args.seed + run, args.players, args.frames, args.render, args.script
+        )
+        for name in names
+        for run in range(args.runs)
+    ]
+    results = []
+    start = time.perf_counter()
+    for result in run_jobs(jobs, workers, save_dir):
+        if result.error:
+            report = f"{result.game} seed={result.seed} crashed:\n{result.error}"
+            print(report)
+            if args.crash_log:
+                with open(args.crash_log, "a", encoding="utf-8") as f:
+                    f.write(report + "\n")
+        results.append(result)
+    elapsed = time.perf_counter() - start
+    print(summarise(results))
+    print(f"{len(results)} runs on {workers} worker(s) in {elapsed:.1f}s")
+    pygame.quit()
+    return 1 if any(r.error for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
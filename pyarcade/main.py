@@ -27,6 +27,9 @@ DEFAULT_SETTINGS = {
     "sound_volume": 1.0,
     "keybindings": {},
 }
+# Upper bound on fixed simulation steps per rendered frame.  Time beyond this
+# is dropped so a long stall cannot snowball into ever slower frames.
+MAX_SIM_STEPS = 8
 
 
 def load_games():
@@ -59,6 +62,33 @@ def load_games():
     return games
 
 
+def step_state(state: State, dt: float, accumulator: float) -> tuple[float, float]:
+    """Advance *state* by *dt* seconds of wall-clock time.
+
+    Variable-timestep states receive *dt* directly.  States with ``sim_hz``
+    set are stepped in fixed ``1 / sim_hz`` increments using *accumulator*.
+    Returns the new accumulator and the interpolation alpha for ``draw``.
+    """
+    sim_hz = getattr(state, "sim_hz", None)
+    if not sim_hz:
+        state.update(dt)
+        return 0.0, 1.0
+    step = 1.0 / sim_hz
+    accumulator = min(accumulator + dt, step * MAX_SIM_STEPS)
+    while accumulator >= step and not state.done:
+        state.update(step)
+        accumulator -= step
+    return accumulator, accumulator / step
+
+
+def draw_state(state: State, alpha: float) -> None:
+    """Draw *state*, passing *alpha* only to fixed-timestep states."""
+    if getattr(state, "sim_hz", None):
+        state.draw(alpha)
+    else:
+        state.draw()
+
+
 def main():
     log_file = save_path("arcade.log")
     logging.basicConfig(
@@ -99,6 +129,7 @@ def main():
     current_state = menu
     current_state.startup(screen)
     players_selected: int | None = None
+    accumulator = 0.0
 
     running = True
     while running:
@@ -131,8 +162,8 @@ def main():
 
         had_error = False
         try:
-            current_state.update(dt)
-            current_state.draw()
+            accumulator, alpha = step_state(current_state, dt, accumulator)
+            draw_state(current_state, alpha)
         except Exception:
             logging.exception(
                 "Unhandled error in state '%s'", current_state.__class__.__name__
@@ -199,6 +230,7 @@ def main():
                     opts,
                 )
                 next_state.startup(screen, num_players, **opts)
+                accumulator = 0.0
                 current_state = next_state
                 current_state_name = next_name
                 if had_error and next_name == "menu":
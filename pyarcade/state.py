@@ -4,6 +4,12 @@ import pygame
 class State:
     """Base class for game states."""
 
+    # Fixed simulation rate in Hz.  ``None`` keeps the variable timestep where
+    # ``update`` receives the raw frame delta.  States that set this get
+    # ``update`` called with a constant ``1 / sim_hz`` and ``draw`` called with
+    # the interpolation alpha between the last two simulation steps.
+    sim_hz: int | None = None
+
     def __init__(self, **_):
         self.done = False
         self.quit = False
@@ -61,8 +67,12 @@ class State:
         """Update the state. *dt* is elapsed time in seconds."""
         pass
 
-    def draw(self):
-        """Draw everything to the screen."""
+    def draw(self, alpha: float = 1.0):
+        """Draw everything to the screen.
+
+        *alpha* is only passed to fixed-timestep states and is the fraction
+        (0..1) of a simulation step that has elapsed since the last update.
+        """
         pass
 
     def handle_keyboard(self, event):
@@ -2,15 +2,27 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable
+
 REFERENCE_RES = (1280, 720)
 _scale = 1.0
+_listeners: list[Callable[[float], None]] = []
 
 
 def init(size: tuple[int, int]) -> None:
-    """Initialise the scaling factor based on *size*."""
+    """Initialise the scaling factor based on *size*.
+
+    Listeners registered with :func:`on_scale_change` are notified when the
+    factor actually changes.
+    """
 
     global _scale
-    _scale = min(size[0] / REFERENCE_RES[0], size[1] / REFERENCE_RES[1])
+    new_scale = min(size[0] / REFERENCE_RES[0], size[1] / REFERENCE_RES[1])
+    if new_scale == _scale:
+        return
+    _scale = new_scale
+    for listener in list(_listeners):
+        listener(new_scale)
 
 
 def scale(value: int | float) -> int:
@@ -19,4 +31,16 @@ def scale(value: int | float) -> int:
     return int(value * _scale)
 
 
-__all__ = ["init", "scale"]
+def get_scale() -> float:
+    """Return the current scaling factor."""
+
+    return _scale
+
+
+def on_scale_change(listener: Callable[[float], None]) -> None:
+    """Call *listener* with the new factor whenever :func:`init` changes it."""
+
+    _listeners.append(listener)
+
+
+__all__ = ["get_scale", "init", "on_scale_change", "scale"]
@@ -17,8 +17,15 @@ def asset_path(*parts: str) -> Path:
 
 
 def _platform_base() -> Path:
-    """Return the OS-specific base directory for persistent data."""
+    """Return the OS-specific base directory for persistent data.
 
+    ``PYARCADE_SAVE_DIR`` overrides the location, which keeps headless and
+    test runs from touching the player's real saves.
+    """
+
+    override = os.getenv("PYARCADE_SAVE_DIR")
+    if override:
+        return Path(override)
     if sys.platform.startswith("win"):
         base = Path(os.getenv("APPDATA", Path.home() / "AppData" / "Roaming"))
     else:
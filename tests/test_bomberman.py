@@ -0,0 +1,645 @@
+import os
+import random
+import sys
+import tempfile
+from pathlib import Path
+
+import pygame
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYARCADE_SAVE_DIR", tempfile.mkdtemp(prefix="pyarcade-test-"))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from pyarcade import headless  # noqa: E402
+from pyarcade.games.bomberman.bomberman import BombermanGame  # noqa: E402
+
+MOVE_KEYS = (pygame.K_UP, pygame.K_DOWN, pygame.K_LEFT, pygame.K_RIGHT)
+
+
+def start_game(players=1, enemies=8):
+    headless.init_headless()
+    game = BombermanGame(players=players)
+    game.startup(pygame.display.get_surface())
+    game.config["enemy_count"] = enemies
+    game.config["max_bombs_per_player"] = 4
+    game._start_game()
+    return game
+
+
+def play(game, ticks, seed, check=None):
+    """Drive the game with random held keys and bomb taps."""
+    rng = random.Random(seed)
+    held = headless.HeldKeys()
+    with headless.patched_keyboard(held):
+        for _ in range(ticks):
+            if game.state != "play":
+                game._start_game()
+            if rng.random() < 0.2:
+                held.down = {rng.choice(MOVE_KEYS)}
+            if rng.random() < 0.1:
+                event = headless._key_event(pygame.K_SPACE, True)
+                game.get_event(event)
+            game.update(1 / 60)
+            if check:
+                check(game)
+
+
+def layer_contents(layer):
+    return sorted((key, id(e)) for key, es in layer.tiles.items() for e in es)
+
+
+def expected(entities, width):
+    return sorted((e.y * width + e.x, id(e)) for e in entities)
+
+
+def pool_tiles(pool):
+    return [(pool.xs[i], pool.ys[i], pool.timers[i]) for i in range(pool.size)]
+
+
+def check_occupancy(game):
+    occ, width = game.occupancy, game.level.width
+    assert layer_contents(occ.bombs) == expected(game.bombs, width)
+    assert game.explosions is occ.explosions
+    counts = [0] * (width * game.level.height)
+    for x, y, timer in pool_tiles(occ.explosions):
+        assert timer > 0
+        counts[y * width + x] += 1
+    assert list(occ.explosions.counts) == counts
+    assert layer_contents(occ.enemies) == expected(game.enemies, width)
+    assert layer_contents(occ.powerups) == expected(game.powerups, width)
+    assert layer_contents(occ.players) == expected(game.active_players, width)
+    for player in game.active_players:
+        owned = sum(1 for b in game.bombs if b.owner is player)
+        assert player.active_bombs == owned
+
+
+def test_occupancy_layers_follow_entities():
+    for seed in range(6):
+        random.seed(seed)
+        game = start_game(players=1 + seed % 2)
+        game.config["powerup_chance"] = 0.5
+        play(game, 1500, seed, check_occupancy)
+
+
+def test_level_generation_is_seeded_and_structured():
+    from pyarcade.games.bomberman.level import BRICK, EMPTY, WALL, Level
+
+    level = Level.generate_random(255, 255, seed=7)
+    assert len(level.cells) == 255 * 255
+    assert level.cells == Level.generate_random(255, 255, seed=7).cells
+    w, h = level.width, level.height
+    for x in range(w):
+        assert level.tile(x, 0) == level.tile(x, h - 1) == WALL
+    for y in range(h):
+        assert level.tile(0, y) == level.tile(w - 1, y) == WALL
+    for y in range(2, h - 1, 2):
+        for x in range(2, w - 2, 2):
+            expected = EMPTY if x == w - 2 else WALL
+            assert level.tile(x, y) == expected
+    for x, y in ((1, 1), (2, 1), (1, 2), (w - 2, h - 2), (w - 3, h - 2)):
+        assert not level.is_blocked(x, y)
+    assert level.is_blocked(-1, 5) and level.is_blocked(5, h)
+    bricks = level.cells.count(BRICK)
+    assert 0.6 < bricks / (w * h * 0.75 - 2 * (w + h)) < 0.8
+
+    x, y = next((x, y) for x in range(w) for y in range(h) if level.tile(x, y) == BRICK)
+    assert level.destroy(x, y) and level.tile(x, y) == EMPTY
+    assert not level.destroy(x, y) and not level.destroy(0, 0)
+
+
+def test_level_background_redraws_only_dirty_tiles():
+    from pyarcade.games.bomberman.level import BRICK, TILE_SIZE, Level
+
+    headless.init_headless()
+    level = Level.generate_random(17, 15, seed=3)
+    assets = {}
+    background = level.render(assets)
+    assert level.render(assets) is background
+    x, y = next(
+        (x, y)
+        for y in range(level.height)
+        for x in range(level.width)
+        if level.tile(x, y) == BRICK
+    )
+    level.destroy(x, y)
+    assert level.dirty == {y * level.stride + x}
+    assert level.render(assets) is background and not level.dirty
+    fresh = Level.generate_random(17, 15, seed=3)
+    fresh.destroy(x, y)
+    fresh.dirty.clear()
+    expected = fresh.render(assets)
+    assert pygame.image.tobytes(background, "RGB") == pygame.image.tobytes(
+        expected, "RGB"
+    )
+    assert background.get_at((x * TILE_SIZE + 5, y * TILE_SIZE + 5))[:3] == (0, 0, 0)
+
+
+def recursive_explode(bomb, level, bombs):
+    """The recursive chain resolution blasts used to go through.
+
+    Caught bombs are set off in their order in *bombs*; one already set off
+    deeper in the chain is skipped.
+    """
+    from pyarcade.games.bomberman.level import BRICK
+
+    tiles = [(bomb.x, bomb.y)]
+    destroyed = []
+    for dx, dy in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+        for i in range(1, bomb.radius + 1):
+            nx, ny = bomb.x + dx * i, bomb.y + dy * i
+            if level.is_blocked(nx, ny):
+                if level.tile(nx, ny) == BRICK:
+                    level.destroy(nx, ny)
+                    tiles.append((nx, ny))
+                    destroyed.append((nx, ny))
+                break
+            tiles.append((nx, ny))
+    triggered = []
+    caught = [b for b in list(bombs) if (b.x, b.y) in tiles and b is not bomb]
+    for other in caught:
+        if other not in bombs:
+            continue
+        bombs.remove(other)
+        triggered.append(other)
+        sub_tiles, sub_destroyed, sub_triggered = recursive_explode(other, level, bombs)
+        tiles.extend(sub_tiles)
+        destroyed.extend(sub_destroyed)
+        triggered.extend(sub_triggered)
+    return tiles, destroyed, triggered
+
+
+def test_chain_blast_matches_recursive_resolution():
+    from pyarcade.games.bomberman.bomb import Bomb
+    from pyarcade.games.bomberman.level import Level
+    from pyarcade.games.bomberman.occupancy import OccupancyGrid
+
+    for seed in range(400):
+        results = []
+        for use_occupancy in (False, True, None):
+            level = Level.generate_random(13, 11, seed=seed)
+            bomb_rng = random.Random(seed)
+            bombs = []
+            while len(bombs) < 20:
+                x = bomb_rng.randrange(1, level.width - 1)
+                y = bomb_rng.randrange(1, level.height - 1)
+                if not level.is_blocked(x, y) and all(
+                    (b.x, b.y) != (x, y) for b in bombs
+                ):
+                    bombs.append(Bomb(x, y, 1000, bomb_rng.randint(1, 4)))
+            first = bombs.pop(0)
+            if use_occupancy is None:
+                tiles, destroyed, triggered = recursive_explode(first, level, bombs)
+                results.append((list(dict.fromkeys(tiles)), destroyed, triggered))
+                continue
+            occupancy = None
+            if use_occupancy:
+                occupancy = OccupancyGrid(level.width, level.height)
+                for bomb in bombs:
+                    occupancy.bombs.add(bomb)
+            blast = first.detonate(level, bombs, occupancy)
+            assert all(b not in bombs for b in blast.triggered)
+            results.append((list(blast.tiles), blast.destroyed, blast.triggered))
+        key = [[(b.x, b.y) for b in r[2]] for r in results]
+        assert key[0] == key[1] == key[2]
+        assert [r[:2] for r in results[1:]] == [results[0][:2]] * 2
+
+
+def test_long_chain_does_not_recurse():
+    from pyarcade.games.bomberman.bomb import Bomb
+    from pyarcade.games.bomberman.level import Level
+
+    level = Level.generate_random(255, 255, seed=1)
+    level.cells[level.width : 2 * level.width - 1] = bytes(level.width - 1)
+    level.cells[level.width] = 1
+    bombs = [Bomb(x, 1, 1000, 1) for x in range(1, level.width - 1)]
+    first = bombs.pop(0)
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(100)
+    try:
+        blast = first.detonate(level, bombs)
+    finally:
+        sys.setrecursionlimit(limit)
+    assert not bombs and len(blast.triggered) == level.width - 3
+    assert (level.width - 2, 1) in blast.tiles
+
+
+def open_level(width, height):
+    from pyarcade.games.bomberman.level import Level
+
+    level = Level((width, height), random.Random(0))
+    level.generate(random.Random(0), density=0.0)
+    return level
+
+
+class Spot:
+    def __init__(self, x, y):
+        self.x, self.y = x, y
+
+
+def count_calls(monkeypatch, flow):
+    """Count the map rebuilds *flow* runs from here on."""
+    calls = dict.fromkeys(("_build_blocked", "_build_safety", "_search"), 0)
+    calls["rebuild"] = 0
+
+    def counting(name, method):
+        def counted(*args):
+            calls[name] += 1
+            return method(*args)
+
+        return counted
+
+    for name in calls:
+        obj = flow.danger if name == "rebuild" else flow
+        monkeypatch.setattr(obj, name, counting(name, getattr(obj, name)))
+    return calls
+
+
+def searched_tiles(flow):
+    """Tiles the player search reached, and the most any search may reach."""
+    from pyarcade.games.bomberman.flowfield import UNREACHABLE
+
+    reached = sum(1 for d in flow.to_players if d != UNREACHABLE)
+    diamond = 2 * flow.reach * (flow.reach + 1) + 1
+    return reached, len(flow._sources) * diamond
+
+
+def test_flow_field_steers_toward_players_and_out_of_blasts():
+    from pyarcade.games.bomberman.bomb import Bomb
+    from pyarcade.games.bomberman.flowfield import UNREACHABLE, FlowField
+    from pyarcade.games.bomberman.occupancy import OccupancyGrid
+
+    level = open_level(15, 13)
+    occupancy = OccupancyGrid(level.width, level.height)
+    flow = FlowField(level, reach=30)
+    player = Spot(1, 1)
+    flow.update(occupancy, [player], [])
+    x, y = 13, 11
+    while (x, y) != (1, 1):
+        before = flow.distance_to_player(x, y)
+        dx, dy = flow.toward(x, y)
+        x, y = x + dx, y + dy
+        assert not level.is_blocked(x, y)
+        assert flow.distance_to_player(x, y) == before - 1
+    assert flow.toward(1, 1) is None
+
+    bomb = Bomb(5, 5, 2000, 3)
+    occupancy.bombs.add(bomb)
+    flow.update(occupancy, [player], [bomb])
+    assert flow.is_threatened(5, 8) and not flow.is_threatened(5, 9)
+    assert flow.distance_to_player(5, 3) == UNREACHABLE
+    for start in ((5, 5), (5, 7), (8, 5), (3, 5)):
+        x, y = start
+        for _ in range(10):
+            step = flow.flee(x, y)
+            if step is None:
+                break
+            x, y = x + step[0], y + step[1]
+            assert not level.is_blocked(x, y)
+        assert not flow.is_threatened(x, y)
+
+    flow.to_players[0] = 7
+    flow.update(occupancy, [player], [bomb])
+    assert flow.to_players[0] == 7  # nothing changed, nothing recomputed
+
+
+def test_many_enemies_on_a_large_map(monkeypatch):
+    from pyarcade.games.bomberman.bomb import Bomb
+    from pyarcade.games.bomberman.enemy import Enemy
+    from pyarcade.games.bomberman.flowfield import FlowField
+    from pyarcade.games.bomberman.occupancy import OccupancyGrid
+
+    level = open_level(101, 101)
+    occupancy = OccupancyGrid(level.width, level.height)
+    flow = FlowField(level)
+    rng = random.Random(2)
+    free = [
+        (x, y)
+        for y in range(level.height)
+        for x in range(level.width)
+        if not level.is_blocked(x, y)
+    ]
+    players = [Spot(*rng.choice(free)) for _ in range(4)]
+    enemies = [Enemy(x, y, None, 0.1) for x, y in rng.sample(free, 120)]
+    for enemy in enemies:
+        occupancy.enemies.add(enemy)
+    bombs = []
+    for _ in range(20):
+        bomb = Bomb(*rng.choice(free), 2000, 3)
+        bombs.append(bomb)
+        occupancy.bombs.add(bomb)
+    calls = count_calls(monkeypatch, flow)
+    for _ in range(300):
+        for player in players:
+            player.x, player.y = rng.choice(free)
+        for bomb in bombs:
+            bomb.update(1 / 60)
+        flow.update(occupancy, players, bombs)
+        danger = flow.danger
+        for enemy in enemies:
+            before = danger.time_until(enemy.x, enemy.y)
+            assert enemy.update(1 / 60, level, occupancy, flow)
+            after = danger.time_until(enemy.x, enemy.y)
+            assert after >= before or after >= 2 * enemy.speed
+        reached, bound = searched_tiles(flow)
+        assert reached <= bound
+    # the bombs are only ever placed once, so after the first tick only the
+    # moving players are searched again
+    assert calls["_build_blocked"] == calls["_build_safety"] == 1
+    assert calls["rebuild"] == 0
+    assert calls["_search"] == 300
+    check = {(e.y * level.width + e.x, id(e)) for e in enemies}
+    assert check == {
+        (k, id(e)) for k, es in occupancy.enemies.tiles.items() for e in es
+    }
+
+
+def test_detonation_tick_rebuilds_each_map_once(monkeypatch):
+    from pyarcade.games.bomberman.bomb import Bomb
+    from pyarcade.games.bomberman.flowfield import UNREACHABLE, FlowField
+    from pyarcade.games.bomberman.level import Level
+    from pyarcade.games.bomberman.occupancy import OccupancyGrid
+
+    # the costliest tick rebuilds everything after a bomb goes off; a full
+    # party with every bomb out on a brick-filled map is the worst case
+    level = Level.generate_random(101, 101, seed=3)
+    occupancy = OccupancyGrid(level.width, level.height)
+    flow = FlowField(level)
+    rng = random.Random(4)
+    free = [
+        (x, y)
+        for y in range(level.height)
+        for x in range(level.width)
+        if not level.is_blocked(x, y)
+    ]
+    spots = rng.sample(free, 80)
+    players = [Spot(*spot) for spot in spots[:8]]
+    bombs = [Bomb(x, y, rng.randint(500, 5000), 5) for x, y in spots[8:]]
+    for bomb in bombs:
+        occupancy.bombs.add(bomb)
+    flow.update(occupancy, players, bombs)
+
+    # a detonation rebuilds each map once, and only within the remaining
+    # blasts and the players' reach; placing a bomb back adds to the danger
+    # map without rebuilding it, and a quiet tick does nothing
+    calls = count_calls(monkeypatch, flow)
+    for bomb in bombs[:20]:
+        bombs.remove(bomb)
+        occupancy.bombs.remove(bomb)
+        flow.update(occupancy, players, bombs)
+        assert calls == {
+            "_build_blocked": 1,
+            "_build_safety": 1,
+            "_search": 1,
+            "rebuild": 1,
+        }
+        threat = set(flow.danger.threat)
+        assert all(i in threat for i, steps in enumerate(flow.to_safety) if steps)
+        reached, bound = searched_tiles(flow)
+        assert reached <= bound
+        bombs.append(bomb)
+        occupancy.bombs.add(bomb)
+        flow.update(occupancy, players, bombs)
+        assert calls["rebuild"] == 1 and calls["_build_safety"] == 2
+        flow.update(occupancy, players, bombs)
+        assert calls["_build_safety"] == 2 and calls["_search"] == 2
+        calls.update(dict.fromkeys(calls, 0))
+
+    # every open tile in a blast still counts its steps to cover
+    stride, blocked, safety = level.stride, flow.blocked, flow.to_safety
+    threatened = flow.threatened
+    frontier = [
+        i
+        for i in range(len(blocked))
+        if not blocked[i]
+        and not threatened[i]
+        and any(
+            threatened[i + o] and not blocked[i + o] for o in (-1, 1, -stride, stride)
+        )
+    ]
+    steps = {}
+    step = 0
+    while frontier:
+        step += 1
+        following = []
+        for i in frontier:
+            for j in (i - 1, i + 1, i - stride, i + stride):
+                if threatened[j] and not blocked[j] and j not in steps:
+                    steps[j] = step
+                    following.append(j)
+        frontier = following
+    for i in flow.danger.threat:
+        if not blocked[i]:
+            assert safety[i] == steps.get(i, UNREACHABLE)
+
+
+def test_danger_map_follows_chains_and_placements():
+    import math
+
+    from pyarcade.games.bomberman.bomb import Bomb
+    from pyarcade.games.bomberman.danger import DangerMap
+
+    level = open_level(15, 13)
+    danger = DangerMap(level)
+    slow = Bomb(5, 1, 3000, 2)
+    danger.update([slow])
+    assert danger.time_until(7, 1) == 3.0 and danger.time_until(8, 1) == math.inf
+    assert not danger.is_threatened(5, 4)
+    fast = Bomb(5, 3, 1000, 2)  # its blast reaches the slow bomb
+    danger.update([slow, fast])
+    assert danger.detonation_time(slow) == 1.0
+    assert danger.time_until(7, 1) == danger.time_until(5, 5) == 1.0
+    for bomb in (slow, fast):
+        bomb.update(0.25)
+    assert danger.time_until(7, 1) == 0.75
+    danger.update([slow])
+    assert danger.time_until(7, 1) == 2.75 and danger.time_until(5, 5) == math.inf
+
+    rng = random.Random(4)
+    free = [(x, y) for y in range(13) for x in range(15) if not level.is_blocked(x, y)]
+    bombs = []
+    for _ in range(40):
+        if bombs and rng.random() < 0.3:
+            bombs.remove(rng.choice(bombs))
+        else:
+            x, y = rng.choice(free)
+            bombs.append(Bomb(x, y, rng.randrange(500, 4000), rng.randint(1, 4)))
+        danger.update(bombs)
+        fresh = DangerMap(level)
+        fresh.rebuild(bombs)
+        assert danger.threatened == fresh.threatened
+        assert [danger.time_until(x, y) == fresh.time_until(x, y) for x, y in free] == [
+            True
+        ] * len(free)
+
+
+def test_bot_players_bomb_and_dodge():
+    random.seed(5)
+    game = start_game(players=1, enemies=3)
+    game.config["bot_slots"] = [0]
+    game._start_game()
+    bot_player = game.p1
+    assert bot_player in game.bots
+    bricks = game.level.cells.count(2)
+    dropped = 0
+    for _ in range(1200):
+        if game.state != "play":
+            break
+        before = len(game.bombs)
+        game.update(1 / 60)
+        dropped += max(0, len(game.bombs) - before)
+        check_occupancy(game)
+    assert dropped and game.level.cells.count(2) < bricks
+
+
+def snapshot(game):
+    return (
+        game.state,
+        bytes(game.level.cells),
+        [(p.slot, p.x, p.y, p.radius, p.active_bombs) for p in game.active_players],
+        [(e.x, e.y, e.dir, e.move_timer) for e in game.enemies],
+        [(b.x, b.y, b.timer) for b in game.bombs],
+        pool_tiles(game.explosions),
+        [(p.x, p.y) for p in game.powerups],
+        game.rng.getstate(),
+    )
+
+
+def test_recorded_match_replays_exactly(tmp_path, monkeypatch):
+    from pyarcade.games.bomberman import replay as replay_module
+    from pyarcade.games.bomberman.replay import Replay
+
+    monkeypatch.setattr(replay_module, "REPLAY_DIR", tmp_path)
+    assert not start_game().record_replays
+    for players, bots, seed, party in ((1, [], 21, 0), (2, [1], 22, 0), (2, [], 23, 6)):
+        game = start_game(players=players, enemies=6)
+        game.config["bot_slots"] = bots
+        game.config["party_players"] = party
+        game.config["powerup_chance"] = 0.5
+        game.record_replays = True
+        game._start_game(players)
+        rng = random.Random(seed)
+        held = headless.HeldKeys()
+        with headless.patched_keyboard(held):
+            for _ in range(1500):
+                if game.state not in ("play", "cleared"):
+                    break
+                if rng.random() < 0.2:
+                    held.down = {rng.choice(MOVE_KEYS + (pygame.K_a, pygame.K_d))}
+                if rng.random() < 0.1:
+                    game.get_event(headless._key_event(pygame.K_SPACE, True))
+                game.update(1 / 60)
+        expected = snapshot(game)
+        path = game.recorder.path
+        ticks = game.recorder.ticks
+        game.cleanup()
+
+        replay = Replay(path)
+        assert replay.seed == game.seed and replay.ticks == ticks
+        assert path.stat().st_size < 4096
+        again = start_game(players=1, enemies=0)
+        assert again.run_replay(replay) == ticks
+        assert snapshot(again) == expected
+
+
+def test_replay_names_do_not_collide(tmp_path):
+    from pyarcade.games.bomberman.replay import ReplayWriter, new_replay_path
+
+    for _ in range(5):
+        ReplayWriter(new_replay_path(1, tmp_path), 1, 1, 60, {}).close()
+    assert len(list(tmp_path.glob("*.bmr"))) == 5
+
+
+def test_steady_state_play_does_not_grow_memory():
+    import tracemalloc
+
+    from pyarcade.games.bomberman.explosion import ExplosionPool
+
+    game = start_game(players=1, enemies=20)
+    game.record_replays = False
+    game._start_game(1)
+    only = [tracemalloc.Filter(True, "*bomberman*")]
+    held = headless.HeldKeys()
+    with headless.patched_keyboard(held):
+        for _ in range(300):
+            game.update(1 / 60)
+        tracemalloc.start()
+        try:
+            before = tracemalloc.take_snapshot().filter_traces(only)
+            for _ in range(1200):
+                game.update(1 / 60)
+            after = tracemalloc.take_snapshot().filter_traces(only)
+        finally:
+            tracemalloc.stop()
+    assert game.state == "play" and game.enemies
+    grown = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    # enemies moving between tiles resize the occupancy dict a little
+    assert grown < 4096
+
+    pool = ExplosionPool(15, 13)
+    rng = random.Random(3)
+    tracemalloc.start()
+    try:
+        for tick in range(2000):
+            if tick == 200:
+                start = tracemalloc.get_traced_memory()[0]
+            for _ in range(rng.randrange(4)):
+                pool.add(rng.randrange(1, 14), rng.randrange(1, 12))
+            pool.update(1 / 60)
+        grown = tracemalloc.get_traced_memory()[0] - start
+    finally:
+        tracemalloc.stop()
+    assert grown <= 0
+    assert sum(pool.counts) == len(pool)
+
+
+def test_party_match_scrolls_and_draws_only_the_visible_window():
+    from pyarcade.games.bomberman.level import TILE_SIZE
+
+    game = start_game(players=1, enemies=0)
+    game.screen = screen = pygame.Surface((640, 480))
+    game.config["map_size"] = [101, 101]
+    game.config["party_players"] = 8
+    game.config["powerup_chance"] = 0.5
+    # a match that keeps at least two players alive for the whole run
+    game.config["seed"] = 5
+    game._start_game(1)
+    players = list(game.active_players)
+    assert len(players) == 8 and len(game.bots) == 7
+    assert players[0] not in game.bots and not game.enemies
+    starts = {(p.x, p.y) for p in players}
+    assert len(starts) == 8
+    assert not any(game.level.is_blocked(x, y) for x, y in starts)
+    assert game.camera.offset == (0, 0)
+
+    def check(game):
+        assert game.state == "play"
+        check_occupancy(game)
+
+    play(game, 600, 5, check)
+    assert len(game.active_players) > 1
+    camera = game.camera
+    camera.center_on([(50, 50)])
+    assert camera.offset == (50 * TILE_SIZE + 16 - 320, 50 * TILE_SIZE + 16 - 240)
+    x0, y0, x1, y1 = camera.tile_window()
+    assert (x0, y0, x1, y1) == (40, 43, 61, 58)
+
+    # the culled view matches the whole map drawn naively and cropped, below
+    # the HUD in the top-left corner
+    for target in ((50, 50), (0, 0), (100, 100)):
+        camera.center_on([target])
+        game.draw()
+        world = game.level.render(game.assets).copy()
+        for powerup in game.powerups:
+            powerup.draw(world)
+        for bomb in game.bombs:
+            bomb.draw(world, game.assets["bomb"])
+        game.explosions.draw(world, game.assets["blast"])
+        for player in game.active_players:
+            player.draw(world)
+        left, top = camera.offset
+        below_hud = (0, 110, 640, 370)
+        view = world.subsurface((left, top, 640, 480)).subsurface(below_hud)
+        assert pygame.image.tobytes(screen.subsurface(below_hud), "RGB") == (
+            pygame.image.tobytes(view, "RGB")
+        )
@@ -0,0 +1,70 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pygame
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYARCADE_SAVE_DIR", tempfile.mkdtemp(prefix="pyarcade-test-"))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from pyarcade import headless  # noqa: E402
+
+
+def test_every_game_survives_random_input():
+    headless.init_headless()
+    games = headless.discover_games()
+    assert {"bomberman", "kart8", "tetroid", "virus", "wyrm"} <= set(games)
+    for players in (1, 2):
+        for name, state_cls in games.items():
+            result = headless.run_game(
+                name, state_cls, players=players, frames=300, seed=7, render=True
+            )
+            assert result.error is None, result.error
+            assert result.frames > 0
+
+
+def test_process_pool_merges_results():
+    jobs = [headless.SimJob("tetroid", seed, frames=200) for seed in range(4)]
+    results = list(
+        headless.run_jobs(jobs, workers=2, save_dir=os.environ["PYARCADE_SAVE_DIR"])
+    )
+    assert sorted(r.seed for r in results) == [0, 1, 2, 3]
+    assert all(r.error is None and r.frames == 200 for r in results)
+    assert "tetroid" in headless.summarise(results)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_failed_jobs_are_reported_as_crashes(tmp_path, workers):
+    missing = str(tmp_path / "missing.json")
+    jobs = [
+        headless.SimJob("tetroid", 0, frames=50),
+        headless.SimJob("tetroid", 1, frames=50, script=missing),
+        headless.SimJob("tetroid", 2, frames=50),
+    ]
+    results = list(
+        headless.run_jobs(jobs, workers, save_dir=os.environ["PYARCADE_SAVE_DIR"])
+    )
+    assert sorted(r.seed for r in results) == [0, 1, 2]
+    (failed,) = [r for r in results if r.error]
+    assert failed.seed == 1 and failed.frames == 0
+    assert "FileNotFoundError" in failed.error
+
+
+def test_init_headless_overrides_inherited_drivers(monkeypatch):
+    monkeypatch.setenv("SDL_VIDEODRIVER", "x11")
+    monkeypatch.setenv("SDL_AUDIODRIVER", "pulseaudio")
+    headless.init_headless()
+    assert os.environ["SDL_VIDEODRIVER"] == "dummy"
+    assert os.environ["SDL_AUDIODRIVER"] == "dummy"
+    assert pygame.display.get_driver() == "dummy"
+
+
+def test_unknown_game_names_stop_the_batch(tmp_path, monkeypatch):
+    # main points saves at --save-dir; restore the module's directory after
+    monkeypatch.setenv("PYARCADE_SAVE_DIR", str(tmp_path))
+    with pytest.raises(SystemExit, match="Unknown game"):
+        headless.main(["--games", "tetroid", "nope", "--save-dir", str(tmp_path)])
@@ -0,0 +1,80 @@
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+np = pytest.importorskip("numpy")
+
+from pyarcade.games.kart8.engine.field import (  # noqa: E402
+    BASE_SPEED,
+    ITEM_REACH,
+    KartField,
+)
+from pyarcade.games.kart8.engine.track import create_demo_track  # noqa: E402
+
+
+def test_item_hits_match_pairwise_check():
+    rng = random.Random(2)
+    track = create_demo_track()
+    track.items.clear()
+    for _ in range(200):
+        kind = rng.choice(("boost", "oil", "shell"))
+        track.items.add(kind, rng.uniform(0, track.total_length), rng.uniform(-2, 2))
+    field = KartField(track, 32, seed=4)
+    field.z = np.array([rng.uniform(0, track.total_length) for _ in range(32)])
+    field.z[0] = track.total_length - 1.0  # reach wraps past the finish line
+    field.x = np.array([rng.uniform(-2, 2) for _ in range(32)])
+    field.speed[:] = 100.0
+    items = track.items
+
+    expected = {"boost": set(), "oil": set(), "shell": set()}
+    shells = set()
+    for k in range(32):
+        for slot in items.slots():
+            dz = (items.z[slot] - field.z[k]) % track.total_length
+            if dz < ITEM_REACH and abs(field.x[k] - items.x[slot]) < 0.6:
+                expected[items.type_name(slot)].add(k)
+                if items.type_name(slot) == "shell":
+                    shells.add(slot)
+    assert any(expected.values())
+
+    field.hit_items(items)
+    bonus = [
+        (80.0 if k in expected["boost"] else 0.0)
+        - (50.0 if k in expected["shell"] else 0.0)
+        for k in range(32)
+    ]
+    assert field.bonus.tolist() == bonus
+    assert set(np.flatnonzero(field.oil).tolist()) == expected["oil"]
+    assert all(not items.active[slot] for slot in shells)
+
+
+def test_field_rubber_bands_to_player():
+    track = create_demo_track()
+    length = track.total_length
+    field = KartField(track, 16, seed=1)
+    player_z = 200.0
+    # half the pack starts 80 behind the player and half 80 ahead
+    start = np.where(np.arange(16) % 2, -80.0, 80.0)
+    field.z = (player_z + start) % length
+    field.prev_z = field.z.copy()
+
+    def gaps():
+        return (player_z - field.z + length / 2) % length - length / 2
+
+    before = gaps()
+    for tick in range(120 * 3):
+        player_z = (player_z + BASE_SPEED / 120) % length
+        # no items, so only the rubber band sets each kart's speed
+        field.update(1 / 120, player_z)
+        field.interpolate(0.5)
+        if tick == 0:
+            behind = before > 0
+            assert np.all(field.speed[behind] > BASE_SPEED)
+            assert np.all(field.speed[~behind] < BASE_SPEED)
+    assert np.all(np.abs(gaps()) < np.abs(before))
+    assert np.all(np.abs(field.x) <= 3.0)
+    assert 1 <= field.place(int(field.laps.max()), player_z) <= 17
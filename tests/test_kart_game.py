@@ -0,0 +1,96 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pygame
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYARCADE_SAVE_DIR", tempfile.mkdtemp(prefix="pyarcade-test-"))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from pyarcade import headless  # noqa: E402
+from pyarcade.games.kart8 import game as kart_game  # noqa: E402
+
+
+def start_race(tmp_path, monkeypatch, players=1):
+    monkeypatch.setattr(kart_game, "SAVE_PATH", tmp_path / "kart8.json")
+    monkeypatch.setattr(kart_game, "GHOST_DIR", tmp_path / "ghosts")
+    headless.init_headless()
+    game = kart_game.KartGame(players=players)
+    game.startup(pygame.Surface(headless.DEFAULT_SIZE), players)
+    return game
+
+
+def test_reversing_over_the_line_records_no_lap(tmp_path, monkeypatch):
+    game = start_race(tmp_path, monkeypatch)
+    held = headless.HeldKeys()
+    with headless.patched_keyboard(held):
+        held.down = {pygame.K_s}
+        for _ in range(240):
+            game.update(1 / game.sim_hz)
+        assert game.karts[0].speed < 0 and game.line_debt[0] == 1
+        # driving forward back over the line only makes up the lost ground
+        held.down = {pygame.K_w}
+        while game.line_debt[0]:
+            game.update(1 / game.sim_hz)
+            assert game.timers[0] < 30
+        for _ in range(60):
+            game.update(1 / game.sim_hz)
+    assert game.karts[0].z < game.track.total_length / 2
+    assert game.laps == [0] and game.lap_times == [[]]
+    assert not game.data["times"]["1p"].get("best_lap")
+    assert not game.ghost_path().exists()
+
+
+def test_full_lap_is_counted(tmp_path, monkeypatch):
+    game = start_race(tmp_path, monkeypatch)
+    held = headless.HeldKeys()
+    with headless.patched_keyboard(held):
+        held.down = {pygame.K_w}
+        while not game.laps[0]:
+            game.update(1 / game.sim_hz)
+            assert game.timers[0] < 120
+    assert game.lap_times[0][0] > game.track.total_length / game.karts[0].max_speed
+
+
+def test_implausibly_short_lap_is_not_saved(tmp_path, monkeypatch):
+    game = start_race(tmp_path, monkeypatch)
+    game.recorders[0].add(1 / 120, 1.0, 0.0, 100.0)
+    game.timers[0] = 1 / 120
+    game.finish_lap(0)
+    assert not game.data["times"]["1p"].get("best_lap")
+    assert not game.ghost_path().exists()
+
+
+@pytest.mark.parametrize("road", ["rects", "numpy"])
+def test_threaded_views_match_serial_rendering(tmp_path, monkeypatch, road):
+    from pyarcade.games.kart8.engine.sprites import SPRITES
+
+    if road == "numpy":
+        pytest.importorskip("numpy")
+    game = start_race(tmp_path, monkeypatch, players=2)
+    held = headless.HeldKeys()
+    with headless.patched_keyboard(held):
+        held.down = {pygame.K_w, pygame.K_UP, pygame.K_d}
+        for _ in range(90):
+            game.update(1 / game.sim_hz)
+
+    def compile_on_render_thread():
+        raise AssertionError("the track is compiled before rendering starts")
+
+    monkeypatch.setattr(game.track, "compile", compile_on_render_thread)
+    for renderer in game.renderers:
+        renderer.road_renderer = road
+    frames = []
+    for parallel in (False, True, True):
+        SPRITES.clear()
+        game.parallel_render = parallel
+        assert game._parallel_safe() == parallel
+        game.draw(0.5)
+        frames.append(pygame.image.tobytes(game.screen, "RGB"))
+    assert game.render_pool is not None and game.parallel_render
+    game.cleanup()
+    assert frames[1] == frames[0] and frames[2] == frames[0]
@@ -0,0 +1,50 @@
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from pyarcade.games.kart8.engine.items import ITEM_TYPES  # noqa: E402
+from pyarcade.games.kart8.engine.track import Segment, Track  # noqa: E402
+
+
+def brute_force(items, z, reach):
+    length = items.track.total_length
+    found = set()
+    for slot in items.slots():
+        dz = (items.z[slot] - z % length) % length
+        if dz <= reach:
+            found.add(slot)
+    return found
+
+
+def test_bucketed_lookup_matches_brute_force():
+    rng = random.Random(5)
+    track = Track()
+    track.add(Segment(length=123.4))
+    items = track.items
+    for _ in range(300):
+        items.add(rng.choice(ITEM_TYPES), rng.uniform(0, 123.4), 0.0)
+    track.add(Segment(length=77.7))  # buckets rebuild for the longer lap
+    for slot in rng.sample(range(300), 40):
+        items.deactivate(slot)
+    for _ in range(200):
+        slot = rng.randrange(300)
+        items.move(slot, items.z[slot] + rng.uniform(-50, 50))
+        z = rng.uniform(-10, 400)
+        reach = rng.choice((0.0, 5.0, 9.99, 37.0, 300.0))
+        got = [s for _, s in items.ahead(z, reach)]
+        assert len(got) == len(set(got))
+        assert set(got) == brute_force(items, z, reach)
+    assert len(items) == 260
+
+
+def test_shells_advance_between_buckets():
+    track = Track()
+    track.add(Segment(length=100))
+    shell = track.items.add("shell", 95.0, 0.0, speed=20.0)
+    track.items.advance(0.5)
+    assert track.items.z[shell] == 5.0
+    assert [s for _, s in track.items.ahead(0.0, 6.0)] == [shell]
+    track.items.deactivate(shell)
+    assert list(track.items.ahead(0.0, 100.0)) == []
@@ -0,0 +1,33 @@
+import os
+import sys
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import pygame  # noqa: E402
+
+from pyarcade.games.kart8.engine.minimap import Minimap  # noqa: E402
+from pyarcade.games.kart8.engine.track import create_demo_track  # noqa: E402
+
+
+def test_incremental_markers_match_full_redraw():
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    track = create_demo_track()
+    track.compile()
+    minimap = Minimap(track)
+    for step in range(60):
+        markers = [
+            (step * 7.3, (255, 255, 255), 1),
+            (step * 3.1 + 20, (255, 0, 0), 2),
+            (step * 5.0, (0, 0, 255), 2),
+        ]
+        minimap.update(markers)
+        expected = minimap.template.copy()
+        for z, color, radius in markers:
+            pygame.draw.circle(expected, color, minimap.point_at(z), radius)
+        assert pygame.image.tobytes(minimap.surface, "RGB") == pygame.image.tobytes(
+            expected, "RGB"
+        )
+    assert minimap.update(markers) == []
@@ -0,0 +1,128 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import pygame  # noqa: E402
+
+from pyarcade.games.kart8.engine.physics import Car  # noqa: E402
+from pyarcade.games.kart8.engine.renderer import Renderer, RowTable  # noqa: E402
+from pyarcade.games.kart8.engine.sprites import SpriteCache  # noqa: E402
+from pyarcade.games.kart8.engine.track import create_demo_track  # noqa: E402
+
+
+def test_numpy_road_matches_rect_road():
+    pytest.importorskip("numpy")
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    track = create_demo_track()
+    rects = Renderer(track, road_renderer="rects")
+    vector = Renderer(track, road_renderer="numpy")
+    for size in ((800, 600), (400, 300), (321, 177)):
+        a = pygame.Surface(size).convert()
+        b = pygame.Surface(size).convert()
+        for z in range(0, int(track.total_length), 23):
+            for x in (-3.0, -0.4, 0.0, 1.7, 3.0):
+                player = Car(track, z=z + 0.37, x=x)
+                # leave stale pixels in place: skipped rows must stay untouched
+                a.fill((1, 2, 3))
+                b.fill((1, 2, 3))
+                rects.screen = a
+                vector.screen = b
+                rects.render_road(player)
+                vector.render_road(player)
+                assert pygame.image.tobytes(a, "RGB") == pygame.image.tobytes(
+                    b, "RGB"
+                ), (size, z, x)
+
+
+def test_numpy_road_follows_track_changes():
+    pytest.importorskip("numpy")
+    from pyarcade.games.kart8.engine.track import Segment, Track
+
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    first = create_demo_track()
+    second = Track()
+    for curvature in (0.4, -0.3, 0.5, -0.6):
+        second.add(Segment(length=80.0, curvature=curvature))
+    second.compile()
+    vector = Renderer(first, road_renderer="numpy")
+    for track in (first, second):
+        vector.track = track
+        rects = Renderer(track, road_renderer="rects")
+        for depth in (16, 32):
+            a = pygame.Surface((320, 200), depth=depth)
+            b = pygame.Surface((320, 200), depth=depth)
+            for z in (10.5, 95.0, 230.0):
+                player = Car(track, z=z, x=0.8)
+                rects.screen = a
+                vector.screen = b
+                rects.render_road(player)
+                vector.render_road(player)
+                assert pygame.image.tobytes(a, "RGB") == pygame.image.tobytes(
+                    b, "RGB"
+                ), (depth, z)
+
+
+def test_row_table_matches_per_row_projection():
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    for width, height in ((800, 600), (321, 177), (40, 3), (40, 2)):
+        table = RowTable(width, height, 1.0, 200.0)
+        horizon = height // 2
+        assert table.horizon == horizon
+        expected = []
+        for y in range(height - 1, horizon, -1):
+            perspective = 1.0 / (y - horizon)
+            expected.append((y, perspective, 200.0 / perspective))
+        assert table.rows == expected
+        if table.perspective is not None:
+            assert table.perspective.tolist() == [p for _, p, _ in expected]
+            assert table.road_w.tolist() == [w for _, _, w in expected]
+
+    track = create_demo_track()
+    renderer = Renderer(track)
+    renderer.screen = pygame.Surface((321, 177))
+    table = renderer.row_table()
+    assert renderer.row_table() is table
+    renderer.cam_height = 2.0
+    assert renderer.row_table() is not table
+    renderer.cam_height = 1.0
+    for z in (0.0, 150.0, 333.3):
+        player = Car(track, z=z)
+        curve = track.curvature_at(z)
+        for ahead in (0.02, 0.5, 3.0, 40.0):
+            dz = (z + ahead) - z
+            for x in (-1.0, 0.0, 2.5):
+                screen_y = 177 // 2 + int(1.0 / dz)
+                expected = None
+                if screen_y < 177:
+                    center = 321 / 2 - curve * dz * dz
+                    expected = (center + x * (200.0 / dz), screen_y, 200.0 / dz)
+                assert renderer.project(z + ahead, x, player) == expected
+
+
+def test_sprite_pass_orders_items_and_cars_by_depth(tmp_path):
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    track = create_demo_track()
+    track.billboards = []
+    renderer = Renderer(track, sprites=SpriteCache(asset_dir=tmp_path))
+    surface = pygame.Surface((400, 300)).convert()
+    surface.fill((0, 0, 0))
+    renderer.screen = surface
+    player = Car(track, z=0.0)
+    far_car = Car(track, z=10.0, color=(0, 0, 255))
+    track.items.clear()
+    track.items.add("boost", 3.0, 0.0)
+    renderer.render_sprites(player, [far_car], track.items)
+    assert surface.get_at((200, 148))[:3] == (255, 255, 0)
+    renderer.draw_distance = 5.0
+    surface.fill((0, 0, 0))
+    renderer.render_sprites(player, [far_car], [])
+    assert surface.get_at((200, 148))[:3] == (0, 0, 0)
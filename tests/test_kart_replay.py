@@ -0,0 +1,44 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from pyarcade.games.kart8.engine import replay  # noqa: E402
+
+
+def test_recorded_lap_streams_back(tmp_path):
+    length = 500.0
+    recorder = replay.LapRecorder()
+    dt = 1 / 120
+    ticks = 120 * 60  # a slow one-minute lap
+    for tick in range(ticks):
+        t = tick * dt
+        recorder.add(dt, (t * length / 60) % length, t / 60, 100.0)
+    path = tmp_path / "demo-1p.lap"
+    recorder.save(path, ticks * dt)
+    assert path.stat().st_size < 100 * 1024
+
+    ghost = replay.GhostReplay(path, length)
+    assert ghost.count > replay.CHUNK * 4
+    assert ghost.lap_time == pytest.approx(60.0)
+    for tick in range(1, ticks):
+        ghost.update(dt)
+        t = tick * dt
+        if tick % 97 == 0:
+            assert ghost.z == pytest.approx(t * length / 60, abs=1e-3)
+            assert ghost.x == pytest.approx(t / 60, abs=1e-4)
+    for _ in range(240):
+        ghost.update(dt)  # parks on the last sample
+    assert ghost.z == pytest.approx(length * (ghost.count - 1) / ghost.count, abs=1e-3)
+    ghost.restart()
+    assert (ghost.z, ghost.x) == (0.0, 0.0)
+    ghost.close()
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "bad.lap"
+    path.write_bytes(b"nope")
+    with pytest.raises(ValueError):
+        replay.GhostReplay(path, 100.0)
@@ -0,0 +1,65 @@
+import os
+import sys
+
+import pygame
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from pyarcade.games.kart8.engine.sprites import SpriteCache, quantize  # noqa: E402
+
+
+def test_quantize_buckets():
+    assert [quantize(n) for n in (0, 5, 15)] == [0, 5, 15]
+    assert quantize(100) == quantize(102) == 104
+    assert all(abs(quantize(n) - n) <= n / 16 for n in range(16, 2000))
+
+
+def test_sprite_cache_shares_decodes_and_evicts(tmp_path):
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    img = pygame.Surface((8, 8), pygame.SRCALPHA)
+    img.fill((255, 0, 0, 255))
+    pygame.image.save(img, str(tmp_path / "car.png"))
+
+    cache = SpriteCache(max_bytes=64 * 64 * 4 * 2, asset_dir=tmp_path)
+    assert cache.image("missing.png") is None
+    first = cache.scaled("car.png", (40, 40))
+    assert cache.scaled("car.png", (40, 41)) is first
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["images"] == 1
+
+    for size in (64, 60, 56):
+        cache.scaled("car.png", (size, size))
+    stats = cache.stats()
+    assert stats["evictions"] > 0
+    assert stats["bytes"] <= cache.max_bytes
+    assert cache.scaled("car.png", (40, 40)) is not first
+    pygame.display.quit()
+
+
+def test_sprite_cache_threads_share_one_copy(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    img = pygame.Surface((8, 8), pygame.SRCALPHA)
+    img.fill((255, 0, 0, 255))
+    pygame.image.save(img, str(tmp_path / "car.png"))
+
+    cache = SpriteCache(asset_dir=tmp_path)
+    sizes = [(n, n) for n in range(16, 256, 8)] * 8
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        surfs = list(pool.map(lambda size: cache.scaled("car.png", size), sizes))
+        solids = list(pool.map(lambda size: cache.solid((0, 0, 255), size), sizes))
+    for size, surf, solid in zip(sizes, surfs, solids, strict=True):
+        assert surf is cache.scaled("car.png", size)
+        assert solid is cache.solid((0, 0, 255), size)
+    stats = cache.stats()
+    buckets = {(quantize(w), quantize(h)) for w, h in sizes}
+    assert stats["entries"] == len(buckets) + len(set(sizes))
+    assert stats["bytes"] == sum(
+        s.get_bytesize() * s.get_width() * s.get_height()
+        for s in {id(s): s for s in surfs + solids}.values()
+    )
+    pygame.display.quit()
@@ -0,0 +1,72 @@
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from pyarcade.games.kart8.engine.track import (  # noqa: E402
+    Segment,
+    Track,
+    create_demo_track,
+)
+
+
+def linear_segment_at(track, z):
+    """Reference implementation: walk every segment in order."""
+    z = z % track.total_length
+    prev_end = 0.0
+    for seg, end in zip(track.segments, track.cumulative, strict=True):
+        if z <= end:
+            return seg, prev_end, (z - prev_end) / seg.length
+        prev_end = end
+
+
+def test_indexed_lookup_matches_linear_walk():
+    rng = random.Random(3)
+    tracks = [create_demo_track()]
+    for _ in range(5):
+        track = Track()
+        for _ in range(rng.randint(1, 40)):
+            track.add(Segment(rng.uniform(0.5, 120), rng.uniform(-0.01, 0.01)))
+        tracks.append(track)
+    for track in tracks:
+        probes = [rng.uniform(-500, 3 * track.total_length) for _ in range(2000)]
+        probes += track.cumulative + [0.0, track.total_length]
+        for z in probes:
+            assert track.segment_at(z) == linear_segment_at(track, z)
+            assert track.curvature_at(z) == linear_segment_at(track, z)[0].curvature
+
+
+def test_adding_segments_rebuilds_index():
+    track = Track()
+    track.add(Segment(10, 0.1))
+    assert track.curvature_at(5) == 0.1
+    track.add(Segment(10, 0.2))
+    assert track.curvature_at(15) == 0.2
+
+
+def test_billboards_ahead_walks_nearest_first():
+    track = create_demo_track()
+    track.billboards.reverse()
+    for z in (0.0, 12.5, 250.0, track.total_length - 1):
+        ahead = list(track.billboards_ahead(z, 120.0))
+        expected = sorted(
+            (dz, x, color)
+            for bz, x, color in track.billboards
+            if 0 < (dz := (bz - z) % track.total_length or track.total_length) <= 120
+        )
+        assert [a[0] for a in ahead] == sorted(a[0] for a in ahead)
+        assert sorted(ahead) == expected
+
+
+def test_tiny_segment_falls_back_to_bisect():
+    track = Track()
+    for _ in range(100):
+        track.add(Segment(100.0, 0.1))
+    track.add(Segment(0.01, -0.2))
+    track.add(Segment(50.0, 0.3))
+    track.compile()
+    assert track.lookup is None
+    for z in track.cumulative + [0.0, 9999.995, 10000.005, 10020.0, -3.0]:
+        assert track.segment_at(z) == linear_segment_at(track, z)
+    assert track.curvature_at(10000.005) == -0.2
@@ -0,0 +1,70 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from pyarcade.games.kart8.engine import trackfile  # noqa: E402
+
+
+def snapshot(track):
+    items = track.items
+    return (
+        [(s.length, s.curvature, s.elevation, s.width) for s in track.segments],
+        list(track.cumulative),
+        track.total_length,
+        list(track.billboards),
+        [
+            (items.type_name(i), items.z[i], items.x[i], items.speed[i])
+            for i in items.slots()
+        ],
+        list(track.lookup),
+        track.lookup_step,
+        list(track.polyline),
+    )
+
+
+def test_compiled_track_round_trips(tmp_path):
+    path = trackfile.track_path("demo")
+    assert "demo" in trackfile.available_tracks()
+    first = trackfile.load_track(path, cache_dir=tmp_path)
+    cached = list(tmp_path.glob("demo-*.bin"))
+    assert len(cached) == 1
+    second = trackfile.load_track(path, cache_dir=tmp_path)
+    assert snapshot(second) == snapshot(first)
+    assert [second.segment_index(z) for z in range(0, 500, 7)] == [
+        first.segment_index(z) for z in range(0, 500, 7)
+    ]
+    assert len(second.polyline) >= 200
+
+    # a damaged cache entry is ignored and rewritten
+    cached[0].write_bytes(b"junk")
+    third = trackfile.load_track(path, cache_dir=tmp_path)
+    assert snapshot(third) == snapshot(first)
+    assert cached[0].read_bytes().startswith(trackfile.MAGIC)
+
+
+def test_corrupt_item_kinds_trigger_a_rebuild(tmp_path):
+    path = trackfile.track_path("demo")
+    first = trackfile.load_track(path, cache_dir=tmp_path)
+    assert len(first.items)
+    (cached,) = tmp_path.glob("demo-*.bin")
+    blob = bytearray(cached.read_bytes())
+    _, _, nseg, nbb, nitems, *_ = trackfile.HEADER.unpack_from(blob)
+    kinds = trackfile.HEADER.size + nseg * 5 * 8 + nbb * (2 * 8 + 3)
+    blob[kinds : kinds + nitems] = bytes([200]) * nitems
+    cached.write_bytes(bytes(blob))
+
+    again = trackfile.load_track(path, cache_dir=tmp_path)
+    assert snapshot(again) == snapshot(first)
+    assert cached.read_bytes()[kinds : kinds + nitems] != bytes([200]) * nitems
+
+
+def test_cache_name_follows_compile_settings(monkeypatch):
+    key = trackfile._cache_key(b"{}")
+    assert trackfile._cache_key(b"{}") == key
+    assert trackfile._cache_key(b"{ }") != key
+    monkeypatch.setattr(trackfile, "POLYLINE_SAMPLES", 64)
+    assert trackfile._cache_key(b"{}") != key
+    monkeypatch.undo()
+    monkeypatch.setattr(trackfile, "VERSION", trackfile.VERSION + 1)
+    assert trackfile._cache_key(b"{}") != key
@@ -0,0 +1,108 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from pyarcade.games.kart8.engine.physics import Car  # noqa: E402
+from pyarcade.games.kart8.engine.track import create_demo_track  # noqa: E402
+from pyarcade.main import MAX_SIM_STEPS, draw_state, step_state  # noqa: E402
+from pyarcade.state import State  # noqa: E402
+
+
+class Stepper(State):
+    """Fixed-step state that drives a kart round the demo track."""
+
+    sim_hz = 60
+
+    def __init__(self):
+        super().__init__()
+        self.car = Car(create_demo_track())
+        self.steps = []
+        self.alphas = []
+
+    def update(self, dt):
+        self.steps.append(dt)
+        self.car.update(dt, {"accelerate": True, "left": len(self.steps) % 3 == 0})
+
+    def draw(self, alpha=1.0):
+        self.alphas.append(alpha)
+
+
+class Variable(State):
+    def __init__(self):
+        super().__init__()
+        self.steps = []
+        self.drawn = 0
+
+    def update(self, dt):
+        self.steps.append(dt)
+
+    def draw(self):
+        self.drawn += 1
+
+
+def test_stall_is_capped_at_max_steps():
+    state = Stepper()
+    accumulator, alpha = step_state(state, 5.0, 0.0)
+    assert len(state.steps) == MAX_SIM_STEPS
+    assert state.steps == [1 / 60] * MAX_SIM_STEPS
+    assert accumulator == pytest.approx(0.0, abs=1e-9)
+    assert 0.0 <= alpha < 1.0
+
+
+def test_leftover_time_becomes_alpha():
+    state = Stepper()
+    accumulator, alpha = step_state(state, 1.5 / 60, 0.0)
+    assert len(state.steps) == 1
+    assert accumulator == pytest.approx(0.5 / 60)
+    assert alpha == pytest.approx(0.5)
+    draw_state(state, alpha)
+    assert state.alphas == [alpha]
+    accumulator, alpha = step_state(state, 0.75 / 60, accumulator)
+    assert len(state.steps) == 2 and alpha == pytest.approx(0.25)
+
+
+def test_variable_timestep_states_get_the_frame_delta():
+    state = Variable()
+    assert step_state(state, 0.037, 0.0) == (0.0, 1.0)
+    assert state.steps == [0.037]
+    draw_state(state, 1.0)
+    assert state.drawn == 1
+
+
+@pytest.mark.parametrize("frame_dt", [1 / 30, 1 / 75, 1 / 144, 0.0123])
+def test_simulation_does_not_depend_on_frame_rate(frame_dt):
+    reference = Stepper()
+    for _ in range(180):
+        reference.update(1 / 60)
+
+    state = Stepper()
+    accumulator = 0.0
+    while len(state.steps) < 180:
+        accumulator, _ = step_state(state, frame_dt, accumulator)
+    # frames may overshoot by a step or two; compare the same tick
+    ticks = len(state.steps)
+    for _ in range(ticks - 180):
+        reference.update(1 / 60)
+    assert (state.car.z, state.car.x, state.car.speed) == (
+        reference.car.z,
+        reference.car.x,
+        reference.car.speed,
+    )
+
+
+def test_curve_push_does_not_depend_on_tick_rate():
+    def drive(hz, seconds=2.0):
+        car = Car(create_demo_track())
+        for _ in range(int(hz * seconds)):
+            car.update(1 / hz, {"accelerate": True})
+        return car
+
+    # two seconds in, the demo track's first bend has pushed karts outward
+    slow, fast = drive(60), drive(120)
+    assert slow.x < -0.01
+    assert fast.x == pytest.approx(slow.x, rel=0.1)
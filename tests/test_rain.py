@@ -0,0 +1,33 @@
+import sys
+from pathlib import Path
+
+import pygame
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from pyarcade import headless  # noqa: E402
+from pyarcade.common import rain  # noqa: E402
+
+
+def run_rain(frames=300):
+    surface = pygame.Surface((320, 200))
+    field = rain.MatrixRain(surface.get_size(), 40, seed=5)
+    for _ in range(frames):
+        field.update(1 / 60)
+        field.draw(surface)
+    columns = [list(map(float, values)) for values in (field.x, field.y, field.speed)]
+    return columns + [list(map(int, field.glyph))], pygame.image.tobytes(surface, "RGB")
+
+
+def test_numpy_and_fallback_rain_match(monkeypatch):
+    pytest.importorskip("numpy")
+    headless.init_headless()
+    vectorised, drawn = run_rain()
+    monkeypatch.setattr(rain, "np", None)
+    plain, plain_drawn = run_rain()
+    assert isinstance(rain.MatrixRain((10, 10), 1).x, list)
+    assert plain == vectorised
+    assert plain_drawn == drawn
+    # glyphs fell off the bottom and were scattered again
+    assert max(plain[1]) < 200 and min(plain[1]) < 0
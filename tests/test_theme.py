@@ -0,0 +1,44 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from pyarcade import headless  # noqa: E402
+from pyarcade.common import theme  # noqa: E402
+from pyarcade.ui import layout  # noqa: E402
+
+
+def test_rendered_text_is_reused_until_evicted():
+    headless.init_headless()
+    theme.clear_caches()
+    first = theme.render_text("HELLO", 20)
+    info = theme.cache_info()
+    assert theme.render_text("HELLO", 20) is first
+    assert theme.cache_info()["text_hits"] == info["text_hits"] + 1
+    assert theme.render_text("HELLO", 20, (255, 0, 0)) is not first
+
+    # touching "HELLO" keeps it while older entries are evicted
+    for n in range(theme.TEXT_CACHE_SIZE - 1):
+        theme.render_text(str(n), 20)
+        assert theme.render_text("HELLO", 20) is first
+    assert theme.cache_info()["texts"] == theme.TEXT_CACHE_SIZE
+    theme.render_text("one more", 20)
+    assert theme.cache_info()["texts"] == theme.TEXT_CACHE_SIZE
+    assert theme.render_text("HELLO", 20) is first
+    misses = theme.cache_info()["text_misses"]
+    theme.render_text("HELLO", 20, (255, 0, 0))
+    assert theme.cache_info()["text_misses"] == misses + 1
+
+
+def test_scale_change_clears_fonts_and_text():
+    headless.init_headless()
+    theme.render_text("HELLO", 20)
+    font = theme.get_font(20)
+    assert theme.cache_info()["fonts"] and theme.cache_info()["texts"]
+    try:
+        layout.init((640, 360))
+        info = theme.cache_info()
+        assert info["fonts"] == info["texts"] == 0
+        assert theme.get_font(20) is not font
+    finally:
+        headless.init_headless()